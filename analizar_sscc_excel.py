@@ -3,6 +3,7 @@ Script para analizar la hoja CPI_ del archivo 1_CUADROS_PAGO_SSCC.
 Muestra estructura, columnas, valores únicos de Deudor y busca coincidencias.
 Uso: python analizar_sscc_excel.py [ruta_archivo_o_carpeta_bd]
 """
+import logging
 import sys
 from pathlib import Path
 
@@ -117,6 +118,8 @@ def _parse(val):
         return None
 
 if __name__ == "__main__":
+    # Mensajes de los buscadores de core.leer_excel con el mismo prefijo [NIVEL] que los print
+    logging.basicConfig(level=logging.INFO, format="[%(levelname)s] %(message)s", stream=sys.stdout)
     ruta = None
     if len(sys.argv) > 1:
         ruta = Path(sys.argv[1])
@@ -1,6 +1,9 @@
+import logging
+import sys
 import threading
 import tkinter as tk
 from datetime import datetime
+from functools import partial
 from pathlib import Path
 from tkinter import messagebox, ttk
 
@@ -8,6 +11,7 @@ from core.descargar_archivos import (
     buscar_archivo_existente_tipo,
     descargar_y_descomprimir_zip_tipo,
     meses,
+    MESES_LISTA,
     TIPOS_ARCHIVO,
 )
 
@@ -24,6 +28,7 @@ class InterfazDescarga:
         self.mes_var = tk.IntVar(value=datetime.now().month)
         self.mes_combo = None  # Se asignará en create_widgets
         self.descargando = False
+        self._verificacion_pendiente = None  # id de root.after de la verificación diferida
 
         # Variables para tipos de archivo (por defecto solo Resultados)
         self.tipo_vars = {
@@ -72,10 +77,10 @@ class InterfazDescarga:
             textvariable=self.anyo_var,
             font=("Arial", 11),
             width=10,
-            command=self.verificar_archivo_existente,
+            command=self._programar_verificacion,
         )
         año_spinbox.grid(row=1, column=0, sticky="w", pady=(0, 20))
-        año_spinbox.bind("<KeyRelease>", lambda e: self.verificar_archivo_existente())
+        año_spinbox.bind("<KeyRelease>", lambda e: self._programar_verificacion())
 
         # Mes
         mes_label = tk.Label(
@@ -88,10 +93,9 @@ class InterfazDescarga:
         mes_label.grid(row=0, column=1, sticky="w", padx=(30, 0), pady=(0, 10))
 
         # Combobox para mes
-        meses_lista = [f"{i:02d} - {meses[i]}" for i in range(1, 13)]
         self.mes_combo = ttk.Combobox(
             selection_frame,
-            values=meses_lista,
+            values=MESES_LISTA,
             state="readonly",
             font=("Arial", 11),
             width=15,
@@ -202,19 +206,30 @@ class InterfazDescarga:
         """Retorna la lista de tipos de archivo que el usuario tiene marcados."""
         return [k for k, v in self.tipo_vars.items() if v.get()]
 
+    def _programar_verificacion(self) -> None:
+        """Verificación diferida 150 ms: al escribir rápido en el año solo se busca una vez."""
+        if self._verificacion_pendiente is not None:
+            self.root.after_cancel(self._verificacion_pendiente)
+        self._verificacion_pendiente = self.root.after(150, self._verificar_diferido)
+
+    def _verificar_diferido(self) -> None:
+        self._verificacion_pendiente = None
+        self.verificar_archivo_existente()
+
     def verificar_archivo_existente(self) -> None:
         """Verifica si los archivos ya existen y actualiza la información."""
         try:
             anyo = self.anyo_var.get()
-            valor_mes = self.mes_combo.get()
+            # Las opciones son MESES_LISTA en orden: el índice seleccionado da el mes (-1 = sin selección)
+            indice_mes = self.mes_combo.current()
 
-            if not valor_mes:
+            if indice_mes < 0:
                 self.info_label.config(
                     text="Seleccione el año y mes a descargar", fg="#666666"
                 )
                 return
 
-            mes = int(valor_mes.split(" - ")[0])
+            mes = indice_mes + 1
             nombre_mes = meses[mes]
             tipos_seleccionados = self._obtener_tipos_seleccionados()
 
@@ -260,16 +275,11 @@ class InterfazDescarga:
         anyo = self.anyo_var.get()
 
         # Obtener el mes del combobox
-        valor_mes = self.mes_combo.get()
-        if not valor_mes:
+        indice_mes = self.mes_combo.current()
+        if indice_mes < 0:
             messagebox.showerror("Error", "Por favor seleccione un mes.")
             return
-
-        try:
-            mes = int(valor_mes.split(" - ")[0])
-        except (ValueError, IndexError):
-            messagebox.showerror("Error", "Error al obtener el mes seleccionado.")
-            return
+        mes = indice_mes + 1
 
         # Validar
         if mes < 1 or mes > 12:
@@ -301,6 +311,35 @@ class InterfazDescarga:
         )
         thread.start()
 
+    def _actualizar_gui(self, progreso=None, texto=None, info=None, info_fg=None) -> None:
+        """Aplica en un solo callback de Tk los cambios indicados (los None no se tocan)."""
+        if progreso is not None:
+            self.progress_var.set(progreso)
+        if texto is not None:
+            self.progress_label.config(text=texto)
+        if info is not None:
+            if info_fg is not None:
+                self.info_label.config(text=info, fg=info_fg)
+            else:
+                self.info_label.config(text=info)
+
+    def _callback_progreso(self, inicio: float, ancho: float):
+        """
+        progreso_cb para la descarga: lleva los bytes a la franja [inicio, inicio + ancho] de la
+        barra. Solo agenda en Tk cuando cambia el porcentaje entero (se llama desde el hilo).
+        """
+        ultimo = [-1]
+
+        def progreso_cb(descargados: int, total: int) -> None:
+            if not total:
+                return
+            porcentaje = int(inicio + ancho * min(descargados, total) / total)
+            if porcentaje != ultimo[0]:
+                ultimo[0] = porcentaje
+                self.root.after(0, lambda p=porcentaje: self.progress_var.set(p))
+
+        return progreso_cb
+
     def descargar_archivo_thread(
         self,
         anyo: int,
@@ -316,16 +355,17 @@ class InterfazDescarga:
             for idx, tipo in enumerate(tipos_seleccionados):
                 progreso = int(10 + (idx / total_tipos) * 85)
                 desc = TIPOS_ARCHIVO.get(tipo, tipo)
-                self.root.after(0, lambda p=progreso: self.progress_var.set(p))
                 self.root.after(
-                    0,
-                    lambda d=desc: self.progress_label.config(
-                        text=f"Descargando {d}..."
-                    ),
+                    0, partial(self._actualizar_gui, progreso=progreso, texto=f"Descargando {desc}...")
                 )
 
                 ruta_zip, ruta_des, codigo_error = descargar_y_descomprimir_zip_tipo(
-                    anyo, mes, tipo, descomprimir=True, mostrar_progreso=False
+                    anyo,
+                    mes,
+                    tipo,
+                    descomprimir=True,
+                    mostrar_progreso=False,
+                    progreso_cb=self._callback_progreso(progreso, 85 / total_tipos),
                 )
                 resultados.append((tipo, ruta_zip, ruta_des, codigo_error))
 
@@ -334,15 +374,6 @@ class InterfazDescarga:
             fallidos = [(t, e) for t, z, d, e in resultados if not z]
 
             if exitosos:
-                # Actualizar progreso
-                self.root.after(0, lambda: self.progress_var.set(100))
-                self.root.after(
-                    0,
-                    lambda: self.progress_label.config(
-                        text="[OK] Descarga y descompresión completadas"
-                    ),
-                )
-
                 # Construir mensaje con todos los archivos descargados
                 lineas_info = [f"[OK] Archivos disponibles: {nombre_mes} {anyo}"]
                 lineas_final = []
@@ -354,11 +385,15 @@ class InterfazDescarga:
                     if ruta_des:
                         lineas_final.append(f"  Descomprimido: {Path(ruta_des).name}")
 
+                # Progreso, estado e información en un solo callback
                 self.root.after(
                     0,
-                    lambda li=lineas_info: self.info_label.config(
-                        text="\n".join(li),
-                        fg="#28a745",
+                    partial(
+                        self._actualizar_gui,
+                        progreso=100,
+                        texto="[OK] Descarga y descompresión completadas",
+                        info="\n".join(lineas_info),
+                        info_fg="#28a745",
                     ),
                 )
 
@@ -382,26 +417,22 @@ class InterfazDescarga:
                 self.root.after(0, self.verificar_archivo_existente)
             else:
                 # Todos fallaron
-                self.root.after(0, lambda: self.progress_var.set(0))
                 hay_403 = any(e == 403 for _, e in fallidos)
 
                 if hay_403:
                     # Error 403: Contenido no disponible
                     self.root.after(
                         0,
-                        lambda: self.progress_label.config(
-                            text="✗ Contenido no disponible"
-                        ),
-                    )
-                    self.root.after(
-                        0,
-                        lambda: self.info_label.config(
-                            text=(
+                        partial(
+                            self._actualizar_gui,
+                            progreso=0,
+                            texto="✗ Contenido no disponible",
+                            info=(
                                 f"✗ Contenido no disponible: {nombre_mes} {anyo}\n"
                                 "El archivo no está disponible en el servidor.\n"
                                 "Puede que aún no se haya publicado para este período."
                             ),
-                            fg="#dc3545",
+                            info_fg="#dc3545",
                         ),
                     )
                     self.root.after(
@@ -423,19 +454,16 @@ class InterfazDescarga:
                     # Otro tipo de error
                     self.root.after(
                         0,
-                        lambda: self.progress_label.config(
-                            text="✗ Error en la descarga"
-                        ),
-                    )
-                    self.root.after(
-                        0,
-                        lambda: self.info_label.config(
-                            text=(
+                        partial(
+                            self._actualizar_gui,
+                            progreso=0,
+                            texto="✗ Error en la descarga",
+                            info=(
                                 f"✗ Error al descargar: {nombre_mes} {anyo}\n"
                                 "No se pudo descargar el archivo.\n"
                                 "Verifique su conexión a internet."
                             ),
-                            fg="#dc3545",
+                            info_fg="#dc3545",
                         ),
                     )
                     self.root.after(
@@ -453,11 +481,7 @@ class InterfazDescarga:
                     )
 
         except Exception as e:
-            self.root.after(0, lambda: self.progress_var.set(0))
-            self.root.after(
-                0,
-                lambda: self.progress_label.config(text=f"✗ Error: {str(e)}"),
-            )
+            self.root.after(0, partial(self._actualizar_gui, progreso=0, texto=f"✗ Error: {str(e)}"))
             messagebox.showerror(
                 "Error", f"Ocurrió un error durante la descarga:\n{str(e)}"
             )
@@ -475,6 +499,8 @@ class InterfazDescarga:
 
 
 def main() -> None:
+    # Mensajes de logging (core.leer_excel) con el mismo formato que los print del resto
+    logging.basicConfig(level=logging.INFO, format="[%(levelname)s] %(message)s", stream=sys.stdout)
     root = tk.Tk()
     app = InterfazDescarga(root)
     root.mainloop()
@@ -1,4 +1,5 @@
 import json
+import logging
 import os
 import sys
 import threading
@@ -43,15 +44,15 @@ from core.descargar_archivos import (
     buscar_archivo_existente_tipo,
     descargar_y_descomprimir_zip_tipo,
     meses,
+    MESES_LISTA,
     TIPOS_ARCHIVO,
 )
 from core.leer_excel import (
     LectorBalance,
     leer_compra_venta_energia_gm_holdings,
-    leer_ingresos_por_it,
-    leer_ingresos_por_potencia,
-    leer_total_ingresos_potencia_firme,
+    leer_resumen_potencia,
     leer_total_ingresos_sscc,
+    limpiar_caches_excel,
 )
 from core.plantilla_cliente import escribir_todos_en_resultado
 
@@ -253,8 +254,6 @@ class InterfazInforme:
         seleccion_frame = tk.Frame(periodo_frame, bg=COLORS["bg_card"])
         seleccion_frame.grid(row=1, column=0, padx=0, pady=0, sticky="ew")
 
-        meses_lista = [f"{i:02d} - {meses[i]}" for i in range(1, 13)]
-
         año_label = tk.Label(
             seleccion_frame,
             text="Año",
@@ -290,7 +289,7 @@ class InterfazInforme:
 
         self.mes_combo = ttk.Combobox(
             seleccion_frame,
-            values=meses_lista,
+            values=MESES_LISTA,
             state="readonly",
             font=("Segoe UI", 10),
             width=20,
@@ -557,23 +556,13 @@ class InterfazInforme:
 
         # Validar año y mes
         anyo = self.anyo_var.get()
-        valor_mes = self.mes_combo.get()
+        # Las opciones son MESES_LISTA en orden: el índice seleccionado da el mes (-1 = sin selección)
+        indice_mes = self.mes_combo.current()
 
-        if not valor_mes:
+        if indice_mes < 0:
             messagebox.showerror("Error", "Por favor seleccione un mes.")
             return
-
-        try:
-            mes = int(valor_mes.split(" - ")[0])
-            if mes < 1 or mes > 12:
-                messagebox.showerror(
-                    "Error",
-                    f"Mes inválido: {mes}. Debe estar entre 1 y 12.",
-                )
-                return
-        except (ValueError, IndexError) as e:
-            messagebox.showerror("Error", f"Error al obtener el mes: {e}")
-            return
+        mes = indice_mes + 1
 
         if anyo < 2020 or anyo > 2030:
             messagebox.showerror(
@@ -811,7 +800,8 @@ class InterfazInforme:
                 ruta_zip, ruta_descomprimida, codigo_error = descargar_y_descomprimir_zip_tipo(
                     anyo, mes, tipo,
                     carpeta_zip=str(carpeta_bd),
-                    descomprimir=True, mostrar_progreso=False
+                    descomprimir=True, mostrar_progreso=False,
+                    archivo_existente=archivo_existente,
                 )
 
                 if tipo == "energia_resultados":
@@ -907,7 +897,12 @@ class InterfazInforme:
             )
 
             # Dejar que detecte automáticamente la fila de encabezados
-            df_balance = lector.leer_balance_valorizado(header=None)
+            try:
+                df_balance = lector.leer_balance_valorizado(header=None)
+            finally:
+                lector.cerrar()
+                # Libros y hojas .xlsb en caché del mes: no retenerlos (ni bloquear archivos) entre meses
+                limpiar_caches_excel()
 
             self.root.after(0, lambda: self.progress_var.set(calcular_progreso(55)))
             self.root.after(
@@ -1052,12 +1047,14 @@ class InterfazInforme:
                 cf = empresa_config.get("POTENCIA_FIRME")
                 if cf is not None:
                     concepto_filtro = cf if isinstance(cf, (list, tuple)) else [cf]
-            total_monetario = leer_total_ingresos_potencia_firme(
+            # Las tres lecturas de potencia (BDef/Anexo 02.b) se hacen en paralelo
+            resumen_potencia = leer_resumen_potencia(
                 anyo, mes,
                 nombre_empresa=nombre_empresa,
                 carpeta_base=str(carpeta_bd),
                 concepto_filtro=concepto_filtro,
             )
+            total_monetario = resumen_potencia["TOTAL INGRESOS POR POTENCIA FIRME CLP"]
             if total_monetario is None:
                 # Fallback: usar suma monetario del Balance Valorizado
                 if columna_monetario is None:
@@ -1076,15 +1073,11 @@ class InterfazInforme:
             datos_encontrados["TOTAL INGRESOS POR POTENCIA FIRME CLP"] = total_monetario
 
             # INGRESOS POR IT POTENCIA: Anexo 02.b Potencia, hoja 02.IT POTENCIA {Mes}-{YY} def
-            total_it = leer_ingresos_por_it(
-                anyo, mes, nombre_empresa=nombre_empresa, carpeta_base=str(carpeta_bd)
-            )
+            total_it = resumen_potencia["INGRESOS POR IT POTENCIA"]
             datos_encontrados["INGRESOS POR IT POTENCIA"] = total_it
 
             # INGRESOS POR POTENCIA: Anexo 02.b Potencia, hoja 01.BALANCE POTENCIA {Mes}-{YY} def
-            total_potencia = leer_ingresos_por_potencia(
-                anyo, mes, nombre_empresa=nombre_empresa, carpeta_base=str(carpeta_bd)
-            )
+            total_potencia = resumen_potencia["INGRESOS POR POTENCIA"]
             datos_encontrados["INGRESOS POR POTENCIA"] = total_potencia
 
             # TOTAL INGRESOS POR ENERGIA CLP: Balance Valorizado, columna monetario
@@ -1118,6 +1111,8 @@ class InterfazInforme:
                 carpeta_base=str(carpeta_bd),
             )
             datos_encontrados["Compra Venta Energia GM Holdings CLP"] = total_gm_holdings
+            # Última lectura de Excel del mes: liberar libros y hojas .xlsb en caché (potencia, SSCC)
+            limpiar_caches_excel()
 
             # Calcular IMPORTACION MWh desde columna fisico_kwh (valor positivo, kWh -> MWh: /1000)
             # Usa filtro medidor de config (IMPORTACION_MWh)
@@ -1234,6 +1229,8 @@ class InterfazInforme:
 
 
 def main() -> None:
+    # Los buscadores de core.leer_excel usan logging; mismo formato que los print del resto
+    logging.basicConfig(level=logging.INFO, format="[%(levelname)s] %(message)s", stream=sys.stdout)
     root = tk.Tk()
     app = InterfazInforme(root)
     root.mainloop()
@@ -1,40 +1,71 @@
-import requests
-import zipfile
+import functools
+import os
+import queue
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from tqdm import tqdm
 from urllib.parse import quote
 
-
-meses = {
-    1: "Enero",
-    2: "Febrero",
-    3: "Marzo",
-    4: "Abril",
-    5: "Mayo",
-    6: "Junio",
-    7: "Julio",
-    8: "Agosto",
-    9: "Septiembre",
-    10: "Octubre",
-    11: "Noviembre",
-    12: "Diciembre",
-}
-
-# Mes abreviado para patrones de URL (ej: dic, ene, feb)
-meses_abrev = {
-    1: "ene",
-    2: "feb",
-    3: "mar",
-    4: "abr",
-    5: "may",
-    6: "jun",
-    7: "jul",
-    8: "ago",
-    9: "sep",
-    10: "oct",
-    11: "nov",
-    12: "dic",
-}
+# requests, tqdm y zipfile se importan dentro de las funciones que descargan o descomprimen:
+# este módulo se carga al abrir la GUI (y desde leer_excel por meses) y no debe pagar su import.
+
+
+# Nombre del mes por número (índice 0 vacío): meses[12] == "Diciembre"
+meses = (
+    "",
+    "Enero",
+    "Febrero",
+    "Marzo",
+    "Abril",
+    "Mayo",
+    "Junio",
+    "Julio",
+    "Agosto",
+    "Septiembre",
+    "Octubre",
+    "Noviembre",
+    "Diciembre",
+)
+
+# Opciones de los combobox de mes en las interfaces ("01 - Enero", ...)
+MESES_LISTA = tuple(f"{i:02d} - {meses[i]}" for i in range(1, 13))
+
+# Mes abreviado para patrones de URL (índice 0 vacío): meses_abrev[12] == "dic"
+meses_abrev = (
+    "",
+    "ene",
+    "feb",
+    "mar",
+    "abr",
+    "may",
+    "jun",
+    "jul",
+    "ago",
+    "sep",
+    "oct",
+    "nov",
+    "dic",
+)
+
+# Descarga: tamaño de bloque de lectura y descarga por rangos en paralelo (S3 acepta Range)
+TAM_CHUNK_DESCARGA = 1024 * 1024
+SEGMENTOS_DESCARGA = 8
+# Por debajo de este tamaño no compensa abrir varias conexiones
+TAM_MINIMO_DESCARGA_PARALELA = 32 * 1024 * 1024
+# Bloques en cola entre la red y el disco (acota la memoria a ~16 MiB)
+BLOQUES_EN_COLA_ESCRITURA = 16
+# Hilos para descomprimir miembros del ZIP en paralelo (zlib libera el GIL)
+HILOS_DESCOMPRESION = min(8, os.cpu_count() or 1)
+# Meses que se descargan a la vez en descargar_rango
+MESES_EN_PARALELO = 4
+# Segundos durante los que se recuerda que una URL respondió 403/404 (reintentos seguidos no consultan S3)
+TTL_NO_DISPONIBLE = 60
+# Revalidación de ZIPs existentes por ETag: timeouts (conexión, lectura) cortos y, tras un fallo de
+# red, no se vuelve a intentar durante estos segundos (sin conexión el ZIP local se usa al instante)
+TIMEOUT_REVALIDACION = (3, 5)
+PAUSA_REVALIDACION_SIN_RED = 300
 
 # Tipos de archivo PLABACOM (clave interna, descripción)
 TIPOS_ARCHIVO = {
@@ -45,6 +76,7 @@ TIPOS_ARCHIVO = {
 }
 
 
+@functools.lru_cache(maxsize=256)
 def construir_url(anyo, mes, version="01", tipo="Resultados"):
     """
     Construye la URL del archivo ZIP según el año y mes.
@@ -86,6 +118,7 @@ def construir_url(anyo, mes, version="01", tipo="Resultados"):
     return url_completa, nombre_local
 
 
+@functools.lru_cache(maxsize=256)
 def construir_url_tipo(anyo, mes, tipo):
     """
     Construye la URL del archivo ZIP según el año, mes y tipo de archivo.
@@ -139,40 +172,359 @@ def construir_url_tipo(anyo, mes, tipo):
     raise ValueError(f"Tipo de archivo no soportado: {tipo}")
 
 
-def descargar_archivo(url, ruta_destino, mostrar_progreso=True):
+@functools.lru_cache(maxsize=1)
+def _sesion_http():
     """
-    Descarga un archivo desde una URL con barra de progreso.
+    Sesión HTTP compartida (keep-alive): las descargas sucesivas y los tramos en paralelo
+    reutilizan conexiones TLS con S3. Reintenta errores 5xx y de conexión con espera creciente.
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    reintentos = Retry(
+        total=3,
+        backoff_factor=0.5,
+        status_forcelist=(500, 502, 503, 504),
+        raise_on_status=False,  # agotados los reintentos, raise_for_status informa el código
+    )
+    adaptador = HTTPAdapter(
+        pool_connections=SEGMENTOS_DESCARGA,
+        pool_maxsize=SEGMENTOS_DESCARGA * MESES_EN_PARALELO,
+        max_retries=reintentos,
+    )
+    sesion = requests.Session()
+    sesion.mount("https://", adaptador)
+    sesion.mount("http://", adaptador)
+    return sesion
 
-    Returns:
-        tuple: (exitoso: bool, codigo_error: int o None, mensaje: str)
+
+class _RangoNoSoportado(Exception):
+    """El servidor respondió 200 (archivo completo) a una petición con Range."""
+
+
+# url -> (instante, código) de las URLs que respondieron 403/404 en el HEAD
+_no_disponibles = {}
+_candado_no_disponibles = threading.Lock()
+
+
+def _no_disponible_reciente(url):
+    """Código 403/404 si la URL respondió así hace menos de TTL_NO_DISPONIBLE segundos; si no, None."""
+    with _candado_no_disponibles:
+        registro = _no_disponibles.get(url)
+        if registro is None:
+            return None
+        instante, codigo = registro
+        if time.monotonic() - instante < TTL_NO_DISPONIBLE:
+            return codigo
+        del _no_disponibles[url]
+        return None
+
+
+def _consultar_cabecera(url):
+    """
+    HEAD al archivo. Devuelve (tamaño, etag): tamaño es Content-Length si el servidor acepta
+    Range (Accept-Ranges: bytes) y None si no lo acepta o si el HEAD falla (en ese caso se
+    usa la descarga secuencial); etag es el ETag informado o None.
+    Con 403/404 lanza HTTPError sin abrir ningún GET y lo recuerda TTL_NO_DISPONIBLE segundos.
+    """
+    import requests
+
+    try:
+        respuesta = _sesion_http().head(url, allow_redirects=True, timeout=30)
+    except requests.exceptions.RequestException:
+        return None, None
+    if respuesta.status_code in (403, 404):
+        with _candado_no_disponibles:
+            _no_disponibles[url] = (time.monotonic(), respuesta.status_code)
+        respuesta.raise_for_status()
+    if respuesta.status_code != 200:
+        return None, None
+    etag = respuesta.headers.get("ETag")
+    if respuesta.headers.get("accept-ranges", "").lower() != "bytes":
+        return None, etag
+    try:
+        return int(respuesta.headers.get("content-length", 0)) or None, etag
+    except ValueError:
+        return None, etag
+
+
+def _escribir_vectorizado(fd, bloques):
+    """os.writev de todos los bloques en una llamada, repitiendo si el sistema escribe parcialmente."""
+    bloques = [memoryview(b) for b in bloques]
+    while bloques:
+        escritos = os.writev(fd, bloques)
+        while bloques and escritos >= len(bloques[0]):
+            escritos -= len(bloques[0])
+            bloques.pop(0)
+        if escritos:
+            bloques[0] = bloques[0][escritos:]
+
+
+def _aconsejar_cache(fd, consejo):
     """
+    posix_fadvise sobre todo el archivo (POSIX_FADV_*). No existe en Windows/macOS; ahí y ante
+    cualquier error es un no-op, porque solo es una pista para la caché de páginas del kernel.
+    """
+    if hasattr(os, "posix_fadvise"):
+        try:
+            os.posix_fadvise(fd, 0, 0, consejo)
+        except OSError:
+            pass
+
+
+def _liberar_cache_archivo(ruta):
+    """Pide al kernel descartar de la caché las páginas de un archivo que no se volverá a leer."""
+    if not hasattr(os, "posix_fadvise"):
+        return
     try:
-        # Realizar petición con stream para archivos grandes
-        # Timeout más largo para archivos grandes (>1GB)
-        response = requests.get(url, stream=True, timeout=300)
+        fd = os.open(ruta, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        _aconsejar_cache(fd, os.POSIX_FADV_DONTNEED)
+    finally:
+        os.close(fd)
+
+
+class _EscritorEnSegundoPlano:
+    """
+    Escribe bloques en un archivo desde un hilo propio, para que la recepción por red no
+    espere al disco. La cola es acotada; un error de escritura se relanza en escribir()/cerrar().
+    Donde existe os.writev (no en Windows) los bloques en cola se escriben juntos en una
+    sola llamada, sin pasar por el buffer de Python.
+    """
+
+    _FIN = object()
+
+    def __init__(self, ruta):
+        self._fd = None
+        self._archivo = None
+        if hasattr(os, "writev"):
+            self._fd = os.open(ruta, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        else:
+            self._archivo = open(ruta, "wb")
+        if hasattr(os, "posix_fadvise"):
+            _aconsejar_cache(self._fd if self._fd is not None else self._archivo.fileno(),
+                             os.POSIX_FADV_SEQUENTIAL)
+        self._cola = queue.Queue(maxsize=BLOQUES_EN_COLA_ESCRITURA)
+        self._error = None
+        self._hilo = threading.Thread(target=self._vaciar, daemon=True)
+        self._hilo.start()
+
+    def _siguientes_bloques(self):
+        """Espera un bloque y junta los que ya estén en cola. Devuelve (bloques, terminar)."""
+        bloques = []
+        bloque = self._cola.get()
+        while bloque is not self._FIN:
+            bloques.append(bloque)
+            if len(bloques) >= BLOQUES_EN_COLA_ESCRITURA:
+                return bloques, False
+            try:
+                bloque = self._cola.get_nowait()
+            except queue.Empty:
+                return bloques, False
+        return bloques, True
+
+    def _vaciar(self):
+        while True:
+            bloques, terminar = self._siguientes_bloques()
+            if bloques and self._error is None:
+                try:
+                    if self._fd is not None:
+                        _escribir_vectorizado(self._fd, bloques)
+                    else:
+                        for bloque in bloques:
+                            self._archivo.write(bloque)
+                except BaseException as e:
+                    self._error = e
+            if terminar:
+                return
+
+    def escribir(self, bloque):
+        if self._error is not None:
+            raise self._error
+        self._cola.put(bloque)
+
+    def cerrar(self):
+        self._cola.put(self._FIN)
+        self._hilo.join()
+        if self._fd is not None:
+            os.close(self._fd)
+        else:
+            self._archivo.close()
+        if self._error is not None:
+            raise self._error
+
+
+def _bloques_respuesta(respuesta):
+    """
+    Bloques de TAM_CHUNK_DESCARGA leídos directo de urllib3 (respuesta.raw), sin la capa de
+    re-troceo de iter_content. urllib3 no entrega bloques vacíos.
+    """
+    return respuesta.raw.stream(TAM_CHUNK_DESCARGA, decode_content=True)
+
+
+class _Avance:
+    """
+    Progreso de una descarga: barra tqdm (solo si mostrar_progreso, uso por consola) y/o
+    progreso_cb(descargados, total) llamado como mucho una vez por TAM_CHUNK_DESCARGA.
+    Seguro entre hilos; sin barra ni callback, sumar() no hace nada.
+    """
+
+    def __init__(self, total, mostrar_progreso, progreso_cb=None):
+        self._barra = None
+        if mostrar_progreso:
+            from tqdm import tqdm
+
+            self._barra = tqdm(total=total, unit="B", unit_scale=True, desc="Descargando")
+        self._cb = progreso_cb
+        self._total = total
+        self._descargados = 0
+        self._ultimo_aviso = 0
+        self._candado = threading.Lock()
+
+    def sumar(self, n):
+        if self._barra is None and self._cb is None:
+            return
+        with self._candado:
+            if self._barra is not None:
+                self._barra.update(n)
+            self._descargados += n
+            if self._cb is None or self._descargados - self._ultimo_aviso < TAM_CHUNK_DESCARGA:
+                return
+            self._ultimo_aviso = descargados = self._descargados
+        self._cb(descargados, self._total)
+
+    def cerrar(self):
+        if self._barra is not None:
+            self._barra.close()
+        if self._cb is not None and self._descargados != self._ultimo_aviso:
+            self._cb(self._descargados, self._total)
+
+
+def _descargar_secuencial(url, ruta_destino, mostrar_progreso, progreso_cb=None):
+    """Descarga en una sola conexión; la escritura a disco va en un hilo aparte. Devuelve el ETag."""
+    # Timeout más largo para archivos grandes (>1GB)
+    with _sesion_http().get(url, stream=True, timeout=300) as response:
         response.raise_for_status()
 
         # Obtener tamaño total del archivo
         total_size = int(response.headers.get("content-length", 0))
 
-        # Crear barra de progreso
-        if mostrar_progreso:
-            barra = tqdm(total=total_size, unit="B", unit_scale=True, desc="Descargando")
+        avance = _Avance(total_size, mostrar_progreso, progreso_cb)
+        escritor = _EscritorEnSegundoPlano(ruta_destino)
+        try:
+            for chunk in _bloques_respuesta(response):
+                escritor.escribir(chunk)
+                avance.sumar(len(chunk))
+        finally:
+            escritor.cerrar()
+            avance.cerrar()
+        return response.headers.get("ETag")
 
-        # Descargar archivo en chunks
-        with open(ruta_destino, "wb") as archivo:
-            for chunk in response.iter_content(chunk_size=8192):
-                if chunk:
-                    archivo.write(chunk)
-                    if mostrar_progreso:
-                        barra.update(len(chunk))
 
-        if mostrar_progreso:
-            barra.close()
+def _descargar_segmento(url, ruta_destino, inicio, fin, avance, detener, etag=None):
+    """
+    Descarga los bytes [inicio, fin] con una petición Range y los escribe en su posición del archivo.
+    Con etag se envía If-Range: si el archivo cambió en el servidor responde 200 y no se mezclan versiones.
+    """
+    import requests
+
+    cabeceras = {"Range": f"bytes={inicio}-{fin}"}
+    if etag:
+        cabeceras["If-Range"] = etag
+    with _sesion_http().get(url, headers=cabeceras, stream=True, timeout=300) as respuesta:
+        respuesta.raise_for_status()
+        if respuesta.status_code != 206:
+            raise _RangoNoSoportado()
+        escritos = 0
+        with open(ruta_destino, "r+b") as archivo:
+            archivo.seek(inicio)
+            for chunk in _bloques_respuesta(respuesta):
+                if detener.is_set():
+                    return
+                archivo.write(chunk)
+                escritos += len(chunk)
+                avance(len(chunk))
+    if escritos != fin - inicio + 1:
+        raise requests.exceptions.ChunkedEncodingError(
+            f"Segmento incompleto: {escritos} de {fin - inicio + 1} bytes (desde {inicio})"
+        )
+
+
+def _descargar_por_rangos(url, ruta_destino, total_size, mostrar_progreso, etag=None, progreso_cb=None):
+    """
+    Descarga en SEGMENTOS_DESCARGA conexiones paralelas (peticiones Range) sobre un archivo
+    preasignado; cada hilo escribe su tramo con seek + write. Si algo falla se borra el
+    archivo parcial para que no se tome como descarga completa.
+    """
+    tam_segmento = -(-total_size // SEGMENTOS_DESCARGA)
+    rangos = [
+        (inicio, min(inicio + tam_segmento, total_size) - 1)
+        for inicio in range(0, total_size, tam_segmento)
+    ]
+
+    with open(ruta_destino, "wb") as archivo:
+        archivo.truncate(total_size)
+
+    avance = _Avance(total_size, mostrar_progreso, progreso_cb)
+    detener = threading.Event()
+
+    try:
+        with ThreadPoolExecutor(max_workers=len(rangos)) as pool:
+            futuros = [
+                pool.submit(_descargar_segmento, url, ruta_destino, inicio, fin, avance.sumar, detener, etag)
+                for inicio, fin in rangos
+            ]
+            try:
+                for futuro in futuros:
+                    futuro.result()
+            except BaseException:
+                detener.set()
+                raise
+    except BaseException:
+        Path(ruta_destino).unlink(missing_ok=True)
+        raise
+    finally:
+        avance.cerrar()
+
+
+def descargar_archivo(url, ruta_destino, mostrar_progreso=True, progreso_cb=None):
+    """
+    Descarga un archivo desde una URL con barra de progreso.
+    Si el servidor acepta Range y el archivo es grande, lo descarga por tramos en paralelo;
+    si no, en una sola conexión.
+    progreso_cb(descargados, total) recibe el avance cada ~1 MiB (para la GUI, sin tqdm);
+    total es 0 si el servidor no informa el tamaño.
+
+    Returns:
+        tuple: (exitoso: bool, codigo_error: int o None, mensaje: str)
+    """
+    import requests
+    import urllib3
 
+    codigo_reciente = _no_disponible_reciente(url)
+    if codigo_reciente is not None:
+        mensaje = f"El contenido no está disponible ({codigo_reciente}, consultado hace menos de {TTL_NO_DISPONIBLE} s)"
+        print(f"Error {codigo_reciente}: {mensaje}")
+        return False, codigo_reciente, mensaje
+
+    try:
+        total_size, etag = _consultar_cabecera(url)
+        if total_size and total_size >= TAM_MINIMO_DESCARGA_PARALELA:
+            try:
+                _descargar_por_rangos(url, ruta_destino, total_size, mostrar_progreso, etag, progreso_cb)
+            except _RangoNoSoportado:
+                print("[INFO] El servidor no respetó Range; descargando en una sola conexión")
+                etag = _descargar_secuencial(url, ruta_destino, mostrar_progreso, progreso_cb)
+        else:
+            etag = _descargar_secuencial(url, ruta_destino, mostrar_progreso, progreso_cb) or etag
+
+        _guardar_etag(ruta_destino, etag)
         return True, None, "Descarga completada"
     except requests.exceptions.HTTPError as e:
-        codigo_error = e.response.status_code if e.response else None
+        codigo_error = e.response.status_code if e.response is not None else None
         if codigo_error == 403:
             mensaje = "El contenido no está disponible (403 Forbidden)"
             print(f"Error 403: {mensaje}")
@@ -181,11 +533,106 @@ def descargar_archivo(url, ruta_destino, mostrar_progreso=True):
             mensaje = f"Error HTTP {codigo_error}: {e}"
             print(f"Error al descargar: {mensaje}")
             return False, codigo_error, mensaje
-    except requests.exceptions.RequestException as e:
+    except (requests.exceptions.RequestException, urllib3.exceptions.HTTPError) as e:
+        # urllib3.exceptions.HTTPError: errores de red al leer respuesta.raw (sin envolver por requests)
         print(f"Error al descargar: {e}")
         return False, None, str(e)
 
 
+def _ruta_etag(ruta_zip):
+    """Archivo junto al ZIP con el ETag de S3 de la versión descargada."""
+    return Path(f"{ruta_zip}.etag")
+
+
+def _guardar_etag(ruta_zip, etag):
+    if not etag:
+        return
+    try:
+        _ruta_etag(ruta_zip).write_text(etag, encoding="utf-8")
+    except OSError:
+        pass
+
+
+@functools.lru_cache(maxsize=1)
+def _sesion_revalidacion():
+    """Sesión para el HEAD de revalidación: sin reintentos, un fallo de red se informa de inmediato."""
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    adaptador = HTTPAdapter(max_retries=0)
+    sesion = requests.Session()
+    sesion.mount("https://", adaptador)
+    sesion.mount("http://", adaptador)
+    return sesion
+
+
+# Instante (time.monotonic) del último fallo de red al revalidar; None si no hubo
+_ultimo_fallo_revalidacion = None
+
+
+def _zip_vigente(url, ruta_zip):
+    """
+    True si el ZIP local sigue siendo la versión del servidor: HEAD con If-None-Match y el ETag
+    guardado (304 = sin cambios). Sin ETag guardado, o si no hay conexión, se da por vigente;
+    tras un fallo de red no se revalida durante PAUSA_REVALIDACION_SIN_RED segundos.
+    """
+    global _ultimo_fallo_revalidacion
+    import requests
+
+    try:
+        etag = _ruta_etag(ruta_zip).read_text(encoding="utf-8").strip()
+    except OSError:
+        return True
+    if not etag:
+        return True
+    fallo = _ultimo_fallo_revalidacion
+    if fallo is not None and time.monotonic() - fallo < PAUSA_REVALIDACION_SIN_RED:
+        return True
+    try:
+        respuesta = _sesion_revalidacion().head(
+            url, headers={"If-None-Match": etag}, allow_redirects=True, timeout=TIMEOUT_REVALIDACION
+        )
+    except requests.exceptions.RequestException:
+        _ultimo_fallo_revalidacion = time.monotonic()
+        print("[WARNING] Sin conexión con el servidor: se usan los ZIP locales sin revalidar")
+        return True
+    _ultimo_fallo_revalidacion = None
+    if respuesta.status_code == 200:
+        return respuesta.headers.get("ETag") in (None, etag)
+    return True
+
+
+def _reservar_destino(ruta):
+    """
+    Crea el archivo destino vacío solo si no existe (O_EXCL): una sola llamada que comprueba y
+    reserva el nombre a la vez. Devuelve False si ya existía.
+    """
+    try:
+        os.close(os.open(ruta, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644))
+    except FileExistsError:
+        return False
+    return True
+
+
+def _descargar_reemplazando(url, ruta_zip, mostrar_progreso=True, progreso_cb=None):
+    """
+    Vuelve a descargar un ZIP que cambió en el servidor: baja a un .part y solo si termina bien
+    reemplaza el archivo (y su ETag). Si falla, el ZIP anterior queda intacto.
+    """
+    ruta_zip = Path(ruta_zip)
+    ruta_parcial = ruta_zip.with_name(ruta_zip.name + ".part")
+    exito, codigo_error, mensaje = descargar_archivo(
+        url, ruta_parcial, mostrar_progreso=mostrar_progreso, progreso_cb=progreso_cb
+    )
+    if exito:
+        os.replace(ruta_parcial, ruta_zip)
+        if _ruta_etag(ruta_parcial).exists():
+            os.replace(_ruta_etag(ruta_parcial), _ruta_etag(ruta_zip))
+    else:
+        ruta_parcial.unlink(missing_ok=True)
+    return exito, codigo_error, mensaje
+
+
 def buscar_archivo_existente(anyo, mes, carpeta_zip="bd_data"):
     """
     Busca si existe un archivo ZIP para el año y mes especificados,
@@ -215,10 +662,24 @@ def buscar_archivo_existente_tipo(anyo, mes, tipo, carpeta_zip="bd_data"):
     Returns:
         Path: Ruta del archivo encontrado, None si no existe
     """
-    carpeta = Path(carpeta_zip)
-    if not carpeta.exists():
+    try:
+        mtime_ns = os.stat(carpeta_zip).st_mtime_ns
+    except OSError:
         return None
+    archivo = _buscar_zip_cacheado(str(Path(carpeta_zip).resolve()), mtime_ns, anyo, mes, tipo)
+    # Por si el archivo desapareció sin cambiar la fecha de la carpeta (p. ej. carpetas de red)
+    if archivo is not None and not archivo.exists():
+        _buscar_zip_cacheado.cache_clear()
+        return None
+    return archivo
+
 
+@functools.lru_cache(maxsize=128)
+def _buscar_zip_cacheado(carpeta_zip, mtime_ns, anyo, mes, tipo):
+    """
+    Búsqueda real de buscar_archivo_existente_tipo. mtime_ns forma parte de la clave de
+    caché: al añadir, borrar o renombrar un ZIP cambia la fecha de la carpeta y se vuelve a buscar.
+    """
     # Patrón base: PLABACOM_AÑO_MES_NombreMes
     patron_base = f"PLABACOM_{anyo}_{mes}_{meses[mes]}"
 
@@ -234,13 +695,147 @@ def buscar_archivo_existente_tipo(anyo, mes, tipo, carpeta_zip="bd_data"):
     else:
         return None
 
-    for archivo in carpeta.glob("*.zip"):
-        if patron_base in archivo.name and patron_extra in archivo.name:
-            return archivo
+    # Una sola lectura del directorio, sin crear un Path por entrada
+    try:
+        with os.scandir(carpeta_zip) as entradas:
+            for entrada in entradas:
+                nombre = entrada.name
+                if nombre.lower().endswith(".zip") and patron_base in nombre and patron_extra in nombre:
+                    return Path(entrada.path)
+    except OSError:
+        return None
 
     return None
 
 
+def _invalidar_busquedas_leer_excel():
+    """
+    Limpia la caché de búsquedas de core.leer_excel tras extraer archivos nuevos.
+    Solo actúa si el módulo ya fue importado (evita import circular y no carga pandas).
+    """
+    leer_excel = sys.modules.get("core.leer_excel")
+    if leer_excel is not None:
+        leer_excel.limpiar_cache_busquedas()
+
+
+_CARACTERES_INVALIDOS_WINDOWS = str.maketrans(':<>|"?*', "_______")
+
+
+def _ruta_relativa_miembro(nombre):
+    """Ruta relativa segura de un miembro del ZIP (misma limpieza que ZipFile.extract: sin '..', '.' ni unidad)."""
+    nombre = nombre.replace("/", os.sep)
+    if os.altsep:
+        nombre = nombre.replace(os.altsep, os.sep)
+    partes = os.path.splitdrive(nombre)[1].split(os.sep)
+    if os.sep == "\\":
+        # Caracteres no válidos en Windows y puntos finales, igual que ZipFile._sanitize_windows_name
+        partes = [p.translate(_CARACTERES_INVALIDOS_WINDOWS).rstrip(".") for p in partes]
+    return [p for p in partes if p not in ("", os.path.curdir, os.path.pardir)]
+
+
+def _crear_carpetas_miembros(carpeta_destino, infos):
+    """Crea de una vez todas las carpetas que necesitan los miembros (evita carreras de mkdir entre hilos)."""
+    carpetas = set()
+    for info in infos:
+        partes = _ruta_relativa_miembro(info.filename)
+        if not info.is_dir():
+            partes = partes[:-1]
+        if partes:
+            carpetas.add(os.path.join(carpeta_destino, *partes))
+    for carpeta in sorted(carpetas):
+        os.makedirs(carpeta, exist_ok=True)
+
+
+def _extraer_en_paralelo(ruta_zip, carpeta_destino, infos, avance):
+    """
+    Extrae los miembros con HILOS_DESCOMPRESION hilos; cada hilo abre su propio ZipFile
+    (un ZipFile no se puede leer desde varios hilos a la vez). avance(info) se llama por miembro.
+    Las carpetas ya existen (_crear_carpetas_miembros), así que cada archivo se copia directo
+    con zf.open + copyfileobj, sin el makedirs que ZipFile.extract hace por miembro.
+    """
+    import shutil
+    import zipfile
+
+    locales = threading.local()
+    abiertos = []
+    candado = threading.Lock()
+
+    def extraer(info):
+        zf = getattr(locales, "zip", None)
+        if zf is None:
+            archivo = open(ruta_zip, "rb")
+            with candado:
+                abiertos.append(archivo)
+            if hasattr(os, "posix_fadvise"):
+                _aconsejar_cache(archivo.fileno(), os.POSIX_FADV_SEQUENTIAL)
+            zf = locales.zip = zipfile.ZipFile(archivo, "r")
+            with candado:
+                abiertos.append(zf)
+        partes = _ruta_relativa_miembro(info.filename)
+        if partes and not info.is_dir():
+            with zf.open(info) as origen, open(os.path.join(carpeta_destino, *partes), "wb") as salida:
+                shutil.copyfileobj(origen, salida, TAM_CHUNK_DESCARGA)
+        return info
+
+    try:
+        with ThreadPoolExecutor(max_workers=HILOS_DESCOMPRESION) as pool:
+            for info in pool.map(extraer, infos):
+                avance(info)
+    finally:
+        # ZipFile no cierra un archivo recibido abierto: se cierran ambos, ZipFile primero
+        for objeto in reversed(abiertos):
+            objeto.close()
+
+
+# Archivo dentro de cada carpeta descomprimida con la firma (tamaño y mtime) del ZIP extraído
+_MARCA_EXTRACCION = ".origen_zip"
+
+
+def _firma_zip(ruta_zip):
+    estado = os.stat(ruta_zip)
+    return f"{estado.st_size}:{estado.st_mtime_ns}"
+
+
+def _extraccion_vigente(ruta_zip, carpeta_destino):
+    """
+    True si carpeta_destino tiene contenido extraído de este mismo ZIP. Se compara la firma
+    guardada en _MARCA_EXTRACCION; las carpetas de antes de la marca valen si no son más
+    antiguas que el ZIP.
+    """
+    try:
+        with os.scandir(carpeta_destino) as entradas:
+            if next(entradas, None) is None:
+                return False
+        try:
+            marca = (carpeta_destino / _MARCA_EXTRACCION).read_text(encoding="utf-8").strip()
+        except FileNotFoundError:
+            return ruta_zip.stat().st_mtime_ns <= carpeta_destino.stat().st_mtime_ns
+        return marca == _firma_zip(ruta_zip)
+    except OSError:
+        return False
+
+
+def _reemplazar_carpeta(carpeta_nueva, carpeta_destino):
+    """
+    Pone carpeta_nueva en lugar de carpeta_destino: la anterior se aparta con un rename y se
+    borra solo después, así nunca queda una carpeta a medio extraer ni archivos de un ZIP anterior.
+    Si la anterior no se puede apartar (p. ej. un libro abierto en Windows) se conserva intacta.
+    """
+    import shutil
+
+    carpeta_vieja = carpeta_destino.with_name(f".{carpeta_destino.name}.old")
+    shutil.rmtree(carpeta_vieja, ignore_errors=True)
+    if carpeta_destino.exists():
+        os.replace(carpeta_destino, carpeta_vieja)
+    try:
+        os.replace(carpeta_nueva, carpeta_destino)
+    except OSError:
+        if carpeta_vieja.exists():
+            os.replace(carpeta_vieja, carpeta_destino)
+        raise
+    shutil.rmtree(carpeta_vieja, ignore_errors=True)
+
+
 def descomprimir_zip(ruta_zip, carpeta_destino=None, nombre_carpeta=None, mostrar_progreso=True):
     """
     Descomprime un archivo ZIP en una carpeta específica.
@@ -254,6 +849,10 @@ def descomprimir_zip(ruta_zip, carpeta_destino=None, nombre_carpeta=None, mostra
     Returns:
         str: Ruta de la carpeta descomprimida, None si hay error
     """
+    import shutil
+    import zipfile
+    from tqdm import tqdm
+
     try:
         ruta_zip = Path(ruta_zip)
         if not ruta_zip.exists():
@@ -272,45 +871,59 @@ def descomprimir_zip(ruta_zip, carpeta_destino=None, nombre_carpeta=None, mostra
             # El nombre es: PLABACOM_2025_12_Diciembre_Energia_Definitivo_v_1_01 Resultados_2512_BD01.zip
             # Necesitamos: 01 Resultados_2512_BD01
             nombre_completo = ruta_zip.stem
-            # Buscar el patrón "_v_1_" y tomar todo lo que viene después
-            if "_v_1_" in nombre_completo:
-                nombre_carpeta = nombre_completo.split("_v_1_")[-1]
-            else:
-                # Si no encuentra el patrón, usar el nombre completo sin extensión
-                nombre_carpeta = nombre_completo
+            # Tomar todo lo que viene después del último "_v_1_"; si no está, el nombre completo sin extensión
+            _, separador, final = nombre_completo.rpartition("_v_1_")
+            nombre_carpeta = final if separador else nombre_completo
 
         carpeta_destino = carpeta_base / nombre_carpeta
 
-        # Verificar si ya está descomprimido
-        if carpeta_destino.exists() and carpeta_destino.is_dir():
-            # Verificar si tiene contenido
-            contenido = list(carpeta_destino.iterdir())
-            if contenido:
-                print(f"[OK] El archivo ya está descomprimido: {carpeta_destino}")
-                return str(carpeta_destino)
+        # Verificar si ya está descomprimido desde este mismo ZIP (uno re-descargado por cambio de ETag se vuelve a extraer)
+        if _extraccion_vigente(ruta_zip, carpeta_destino):
+            print(f"[OK] El archivo ya está descomprimido: {carpeta_destino}")
+            return str(carpeta_destino)
 
-        # Crear carpeta destino
-        carpeta_destino.mkdir(parents=True, exist_ok=True)
+        # Se extrae en una carpeta hermana temporal y luego se reemplaza la definitiva
+        carpeta_temporal = carpeta_destino.with_name(f".{carpeta_destino.name}.tmp")
+        shutil.rmtree(carpeta_temporal, ignore_errors=True)
+        carpeta_temporal.mkdir(parents=True)
 
-        # Descomprimir con barra de progreso
+        # Leer el directorio central del ZIP
         with zipfile.ZipFile(ruta_zip, "r") as zip_ref:
-            # Obtener lista de archivos
-            archivos = zip_ref.namelist()
+            # Obtener lista de archivos (el tamaño descomprimido ya está en el directorio central)
+            archivos = zip_ref.infolist()
             total_archivos = len(archivos)
+            total_bytes = sum(info.file_size for info in archivos)
 
-            if mostrar_progreso:
-                barra = tqdm(total=total_archivos, unit="archivos", desc="Descomprimiendo")
-
-            # Extraer archivos
-            for archivo in archivos:
-                zip_ref.extract(archivo, carpeta_destino)
-                if mostrar_progreso:
-                    barra.update(1)
+        # Descomprimir con barra de progreso (una actualización por miembro, en bytes)
+        barra = (
+            tqdm(total=total_bytes, unit="B", unit_scale=True, desc="Descomprimiendo")
+            if mostrar_progreso
+            else None
+        )
 
-            if mostrar_progreso:
+        def avance(info):
+            if barra is not None:
+                barra.update(info.file_size)
+
+        try:
+            # Extraer archivos: carpetas primero y luego los miembros en paralelo
+            _crear_carpetas_miembros(carpeta_temporal, archivos)
+            _extraer_en_paralelo(ruta_zip, carpeta_temporal, archivos, avance)
+            (carpeta_temporal / _MARCA_EXTRACCION).write_text(_firma_zip(ruta_zip), encoding="utf-8")
+            _reemplazar_carpeta(carpeta_temporal, carpeta_destino)
+        except BaseException:
+            shutil.rmtree(carpeta_temporal, ignore_errors=True)
+            raise
+        finally:
+            if barra is not None:
                 barra.close()
 
+        # El ZIP ya no se vuelve a leer: que no desplace de la caché los datos del análisis
+        _liberar_cache_archivo(ruta_zip)
+
         print(f"[OK] Descompresión completada: {carpeta_destino}")
+        print(f"  {total_archivos} archivos, {total_bytes / (1024 * 1024):.2f} MB")
+        _invalidar_busquedas_leer_excel()
         return str(carpeta_destino)
 
     except zipfile.BadZipFile:
@@ -322,7 +935,7 @@ def descomprimir_zip(ruta_zip, carpeta_destino=None, nombre_carpeta=None, mostra
 
 
 def descargar_y_descomprimir_zip(
-    anyo, mes, carpeta_zip="bd_data", carpeta_descomprimidos=None, descomprimir=True
+    anyo, mes, carpeta_zip="bd_data", carpeta_descomprimidos=None, descomprimir=True, archivo_existente=None
 ):
     """
     Descarga el archivo ZIP si no existe y opcionalmente lo descomprime.
@@ -333,12 +946,13 @@ def descargar_y_descomprimir_zip(
         carpeta_zip: Nombre de la carpeta donde guardar los ZIPs
         carpeta_descomprimidos: Carpeta donde descomprimir (si None, usa carpeta_zip/descomprimidos)
         descomprimir: Si descomprimir automáticamente después de descargar
+        archivo_existente: ZIP ya encontrado por el llamador (evita volver a buscarlo)
 
     Returns:
         tuple: (ruta_zip: str o None, ruta_descomprimida: str o None, codigo_error: int o None)
     """
     # Descargar el ZIP
-    ruta_zip, codigo_error = descargar_zip_si_no_existe(anyo, mes, carpeta_zip)
+    ruta_zip, codigo_error = descargar_zip_si_no_existe(anyo, mes, carpeta_zip, archivo_existente)
 
     if not ruta_zip:
         return None, None, codigo_error
@@ -355,19 +969,16 @@ def descargar_y_descomprimir_zip(
         mes_str = str(mes).zfill(2)
         # Obtener versión y tipo del nombre del archivo
         nombre_zip = Path(ruta_zip).stem
-        # Extraer la parte final: "01 Resultados_2512_BD01"
-        if "_v_1_" in nombre_zip:
-            nombre_carpeta_descomprimida = nombre_zip.split("_v_1_")[-1]
-        else:
-            # Fallback: construir desde los parámetros
-            nombre_carpeta_descomprimida = f"01 Resultados_{anyo_abrev}{mes_str}_BD01"
+        # Extraer la parte final: "01 Resultados_2512_BD01"; si no está, construirla desde los parámetros
+        _, separador, final = nombre_zip.rpartition("_v_1_")
+        nombre_carpeta_descomprimida = final if separador else f"01 Resultados_{anyo_abrev}{mes_str}_BD01"
 
         ruta_descomprimida = descomprimir_zip(ruta_zip, carpeta_descomprimidos, nombre_carpeta_descomprimida)
 
     return ruta_zip, ruta_descomprimida, None
 
 
-def descargar_zip_si_no_existe(anyo, mes, carpeta_zip="bd_data"):
+def descargar_zip_si_no_existe(anyo, mes, carpeta_zip="bd_data", archivo_existente=None):
     """
     Descarga el archivo ZIP si no existe en la carpeta especificada.
 
@@ -375,6 +986,7 @@ def descargar_zip_si_no_existe(anyo, mes, carpeta_zip="bd_data"):
         anyo: Año del archivo a descargar
         mes: Mes del archivo a descargar (1-12)
         carpeta_zip: Nombre de la carpeta donde guardar los ZIPs
+        archivo_existente: ZIP ya encontrado por el llamador; si se indica no se vuelve a buscar
 
     Returns:
         tuple: (ruta: str o None, codigo_error: int o None)
@@ -384,30 +996,41 @@ def descargar_zip_si_no_existe(anyo, mes, carpeta_zip="bd_data"):
     carpeta.mkdir(exist_ok=True)
 
     # Primero buscar si existe algún archivo con ese año y mes (sin importar versión)
-    archivo_existente = buscar_archivo_existente(anyo, mes, carpeta_zip)
-
-    if archivo_existente:
-        tamaño = archivo_existente.stat().st_size / (1024 * 1024)  # Tamaño en MB
-        print(f"[OK] El archivo ya existe: {archivo_existente}")
-        print(f"  Tamaño: {tamaño:.2f} MB")
-        return str(archivo_existente), None
+    if archivo_existente is None:
+        archivo_existente = buscar_archivo_existente(anyo, mes, carpeta_zip)
 
     # Construir URL y nombre de archivo
     url, nombre_archivo = construir_url(anyo, mes)
-    ruta_archivo = carpeta / nombre_archivo
 
-    # Verificar también el nombre exacto (por si acaso)
-    if ruta_archivo.exists():
-        tamaño = ruta_archivo.stat().st_size / (1024 * 1024)  # Tamaño en MB
-        print(f"[OK] El archivo ya existe: {ruta_archivo}")
-        print(f"  Tamaño: {tamaño:.2f} MB")
-        return str(ruta_archivo), None
+    if archivo_existente:
+        # Con ETag guardado, un HEAD condicional confirma que no cambió en el servidor
+        if _zip_vigente(url, archivo_existente):
+            tamaño = archivo_existente.stat().st_size / (1024 * 1024)  # Tamaño en MB
+            print(f"[OK] El archivo ya existe: {archivo_existente}")
+            print(f"  Tamaño: {tamaño:.2f} MB")
+            return str(archivo_existente), None
+
+        print(f"[INFO] El archivo cambió en el servidor, se descarga de nuevo: {archivo_existente.name}")
+        ruta_archivo = archivo_existente
+        exito, codigo_error, mensaje = _descargar_reemplazando(url, ruta_archivo)
+    else:
+        ruta_archivo = carpeta / nombre_archivo
+
+        # Verificar también el nombre exacto (por si acaso) reservándolo al mismo tiempo
+        if not _reservar_destino(ruta_archivo):
+            tamaño = ruta_archivo.stat().st_size / (1024 * 1024)  # Tamaño en MB
+            print(f"[OK] El archivo ya existe: {ruta_archivo}")
+            print(f"  Tamaño: {tamaño:.2f} MB")
+            return str(ruta_archivo), None
 
-    # Si no existe, descargarlo
-    print(f"Descargando archivo: {nombre_archivo}")
-    print(f"URL: {url}")
+        # Si no existe, descargarlo
+        print(f"Descargando archivo: {nombre_archivo}")
+        print(f"URL: {url}")
 
-    exito, codigo_error, mensaje = descargar_archivo(url, ruta_archivo)
+        exito, codigo_error, mensaje = descargar_archivo(url, ruta_archivo)
+        if not exito:
+            # Que el archivo reservado (vacío o a medias) no se tome luego como descargado
+            ruta_archivo.unlink(missing_ok=True)
 
     if exito:
         tamaño = ruta_archivo.stat().st_size / (1024 * 1024)  # Tamaño en MB
@@ -422,7 +1045,9 @@ def descargar_zip_si_no_existe(anyo, mes, carpeta_zip="bd_data"):
         return None, codigo_error
 
 
-def descargar_zip_tipo_si_no_existe(anyo, mes, tipo, carpeta_zip="bd_data", mostrar_progreso=True):
+def descargar_zip_tipo_si_no_existe(
+    anyo, mes, tipo, carpeta_zip="bd_data", mostrar_progreso=True, archivo_existente=None, progreso_cb=None
+):
     """
     Descarga el archivo ZIP del tipo indicado si no existe en la carpeta.
 
@@ -432,6 +1057,8 @@ def descargar_zip_tipo_si_no_existe(anyo, mes, tipo, carpeta_zip="bd_data", most
         tipo: Una de las claves en TIPOS_ARCHIVO
         carpeta_zip: Carpeta donde guardar los ZIPs
         mostrar_progreso: Si mostrar barra de progreso en la descarga
+        archivo_existente: ZIP ya encontrado por el llamador; si se indica no se vuelve a buscar
+        progreso_cb: progreso_cb(descargados, total) durante la descarga (ver descargar_archivo)
 
     Returns:
         tuple: (ruta: str o None, codigo_error: int o None)
@@ -439,25 +1066,40 @@ def descargar_zip_tipo_si_no_existe(anyo, mes, tipo, carpeta_zip="bd_data", most
     carpeta = Path(carpeta_zip)
     carpeta.mkdir(exist_ok=True)
 
-    archivo_existente = buscar_archivo_existente_tipo(anyo, mes, tipo, carpeta_zip)
-
-    if archivo_existente:
-        tamaño = archivo_existente.stat().st_size / (1024 * 1024)  # MB
-        print(f"[OK] El archivo ya existe ({TIPOS_ARCHIVO.get(tipo, tipo)}): {archivo_existente.name}")
-        print(f"  Tamaño: {tamaño:.2f} MB")
-        return str(archivo_existente), None
+    if archivo_existente is None:
+        archivo_existente = buscar_archivo_existente_tipo(anyo, mes, tipo, carpeta_zip)
 
     url, nombre_archivo = construir_url_tipo(anyo, mes, tipo)
-    ruta_archivo = carpeta / nombre_archivo
 
-    if ruta_archivo.exists():
-        tamaño = ruta_archivo.stat().st_size / (1024 * 1024)
-        print(f"[OK] El archivo ya existe: {ruta_archivo}")
-        print(f"  Tamaño: {tamaño:.2f} MB")
-        return str(ruta_archivo), None
+    if archivo_existente:
+        # Con ETag guardado, un HEAD condicional confirma que no cambió en el servidor
+        if _zip_vigente(url, archivo_existente):
+            tamaño = archivo_existente.stat().st_size / (1024 * 1024)  # MB
+            print(f"[OK] El archivo ya existe ({TIPOS_ARCHIVO.get(tipo, tipo)}): {archivo_existente.name}")
+            print(f"  Tamaño: {tamaño:.2f} MB")
+            return str(archivo_existente), None
+
+        print(f"[INFO] El archivo cambió en el servidor, se descarga de nuevo: {archivo_existente.name}")
+        ruta_archivo = archivo_existente
+        exito, codigo_error, mensaje = _descargar_reemplazando(
+            url, ruta_archivo, mostrar_progreso=mostrar_progreso, progreso_cb=progreso_cb
+        )
+    else:
+        ruta_archivo = carpeta / nombre_archivo
+
+        if not _reservar_destino(ruta_archivo):
+            tamaño = ruta_archivo.stat().st_size / (1024 * 1024)
+            print(f"[OK] El archivo ya existe: {ruta_archivo}")
+            print(f"  Tamaño: {tamaño:.2f} MB")
+            return str(ruta_archivo), None
 
-    print(f"Descargando {TIPOS_ARCHIVO.get(tipo, tipo)}: {nombre_archivo}")
-    exito, codigo_error, mensaje = descargar_archivo(url, ruta_archivo, mostrar_progreso=mostrar_progreso)
+        print(f"Descargando {TIPOS_ARCHIVO.get(tipo, tipo)}: {nombre_archivo}")
+        exito, codigo_error, mensaje = descargar_archivo(
+            url, ruta_archivo, mostrar_progreso=mostrar_progreso, progreso_cb=progreso_cb
+        )
+        if not exito:
+            # Que el archivo reservado (vacío o a medias) no se tome luego como descargado
+            ruta_archivo.unlink(missing_ok=True)
 
     if exito:
         tamaño = ruta_archivo.stat().st_size / (1024 * 1024)
@@ -480,6 +1122,8 @@ def descargar_y_descomprimir_zip_tipo(
     carpeta_descomprimidos=None,
     descomprimir=True,
     mostrar_progreso=True,
+    archivo_existente=None,
+    progreso_cb=None,
 ):
     """
     Descarga el archivo ZIP del tipo indicado si no existe y opcionalmente lo descomprime.
@@ -492,12 +1136,20 @@ def descargar_y_descomprimir_zip_tipo(
         carpeta_descomprimidos: Carpeta donde descomprimir (si None, usa carpeta_zip/descomprimidos)
         descomprimir: Si descomprimir automáticamente después de descargar
         mostrar_progreso: Si mostrar barras de progreso
+        archivo_existente: ZIP ya encontrado por el llamador (evita volver a buscarlo)
+        progreso_cb: progreso_cb(descargados, total) durante la descarga (ver descargar_archivo)
 
     Returns:
         tuple: (ruta_zip: str o None, ruta_descomprimida: str o None, codigo_error: int o None)
     """
     ruta_zip, codigo_error = descargar_zip_tipo_si_no_existe(
-        anyo, mes, tipo, carpeta_zip, mostrar_progreso=mostrar_progreso
+        anyo,
+        mes,
+        tipo,
+        carpeta_zip,
+        mostrar_progreso=mostrar_progreso,
+        archivo_existente=archivo_existente,
+        progreso_cb=progreso_cb,
     )
 
     if not ruta_zip:
@@ -515,6 +1167,67 @@ def descargar_y_descomprimir_zip_tipo(
     return ruta_zip, ruta_descomprimida, None
 
 
+def descargar_rango(pares, tipo="energia_resultados", carpeta_zip="bd_data", max_hilos=MESES_EN_PARALELO):
+    """
+    Descarga los ZIP de varios meses a la vez (sin descomprimir). Cada mes es independiente, así
+    que se solapan conexiones y escrituras en disco; los que ya existen se omiten como siempre.
+
+    Args:
+        pares: Iterable de (anyo, mes)
+        tipo: Clave de TIPOS_ARCHIVO
+        carpeta_zip: Carpeta donde guardar los ZIPs
+        max_hilos: Meses descargándose simultáneamente
+
+    Returns:
+        dict: {(anyo, mes): (ruta: str o None, codigo_error: int o None)} en el orden recibido
+    """
+    pares = list(dict.fromkeys((int(anyo), int(mes)) for anyo, mes in pares))
+    if not pares:
+        return {}
+
+    Path(carpeta_zip).mkdir(exist_ok=True)
+    print(f"[INFO] Descargando {len(pares)} meses ({TIPOS_ARCHIVO.get(tipo, tipo)})...")
+    # Sin barras de progreso: varias tqdm simultáneas se pisarían en la consola
+    with ThreadPoolExecutor(max_workers=max(1, min(max_hilos, len(pares)))) as pool:
+        futuros = {
+            par: pool.submit(
+                descargar_zip_tipo_si_no_existe, par[0], par[1], tipo, carpeta_zip, False
+            )
+            for par in pares
+        }
+        resultados = {par: futuro.result() for par, futuro in futuros.items()}
+
+    correctos = sum(1 for ruta, _ in resultados.values() if ruta)
+    print(f"[OK] {correctos}/{len(pares)} meses disponibles")
+    return resultados
+
+
+__all__ = [
+    "meses",
+    "meses_abrev",
+    "MESES_LISTA",
+    "TAM_CHUNK_DESCARGA",
+    "SEGMENTOS_DESCARGA",
+    "TAM_MINIMO_DESCARGA_PARALELA",
+    "BLOQUES_EN_COLA_ESCRITURA",
+    "HILOS_DESCOMPRESION",
+    "MESES_EN_PARALELO",
+    "TTL_NO_DISPONIBLE",
+    "TIPOS_ARCHIVO",
+    "construir_url",
+    "construir_url_tipo",
+    "descargar_archivo",
+    "buscar_archivo_existente",
+    "buscar_archivo_existente_tipo",
+    "descomprimir_zip",
+    "descargar_y_descomprimir_zip",
+    "descargar_zip_si_no_existe",
+    "descargar_zip_tipo_si_no_existe",
+    "descargar_y_descomprimir_zip_tipo",
+    "descargar_rango",
+]
+
+
 if __name__ == "__main__":
     # Ejemplo de uso simple
     anyo = 2025
@@ -531,4 +1244,3 @@ if __name__ == "__main__":
             print("\nEl contenido no está disponible para este año/mes (403)")
         else:
             print("\nNo se pudo descargar el archivo")
-
@@ -1,19 +1,191 @@
 """
 Módulo para leer y acceder a datos de archivos Excel de PLABACOM.
 """
+import fnmatch
+import functools
+import html
+import importlib.util
+import logging
+import os
+import re
 import unicodedata
+import zipfile
+from collections import OrderedDict, deque
 
+import numpy as np
 import pandas as pd
 import openpyxl
 from openpyxl import load_workbook
-from openpyxl.utils.dataframe import dataframe_to_rows
+from openpyxl.styles import Font, PatternFill
+from openpyxl.utils import get_column_letter
 from pathlib import Path
-from typing import Optional, Dict, List, Union
+from itertools import chain, islice
+from typing import Iterator, NamedTuple, Optional, Dict, List, Union
 from datetime import datetime, date
 
 from core.descargar_archivos import meses, meses_abrev
 
+logger = logging.getLogger(__name__)
 
+# python-calamine (lector en Rust) es opcional: si está instalado se usa como engine de pandas
+_EXCEL_ENGINE = "calamine" if importlib.util.find_spec("python_calamine") else None
+
+# xlsxwriter es opcional: si está instalado escribe las plantillas nuevas en modo constant_memory
+_HAY_XLSXWRITER = importlib.util.find_spec("xlsxwriter") is not None
+
+# Estilo de la fila de encabezados en las tablas volcadas a la plantilla
+_HEADER_FILL = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
+_HEADER_FONT = Font(bold=True, color="FFFFFF")
+
+
+def _motor_excel(ruta: Path, por_defecto: Optional[str] = None) -> Optional[str]:
+    """Engine para pd.read_excel: calamine si está instalado; si no, pyxlsb para .xlsb o por_defecto."""
+    if _EXCEL_ENGINE:
+        return _EXCEL_ENGINE
+    if Path(ruta).suffix.lower() == ".xlsb":
+        return "pyxlsb"
+    return por_defecto
+
+
+class _Entrada(NamedTuple):
+    """Archivo de descomprimidos con los campos que usan los buscadores ya normalizados."""
+
+    ruta: Path
+    nombre_upper: str
+    sufijo: str
+    carpeta_raiz: str  # carpeta de primer nivel bajo descomprimidos ("" si está en la raíz)
+
+
+@functools.lru_cache(maxsize=8)
+def _escanear_descomprimidos(carpeta: str, mtime_ns: int) -> tuple:
+    """
+    Recorre una sola vez la carpeta de descomprimidos (os.walk, sin stat por archivo)
+    y devuelve todas sus entradas. Los buscadores filtran esta lista en memoria.
+
+    mtime_ns forma parte de la clave de caché: al extraer un ZIP nuevo cambia la
+    fecha de modificación de la carpeta y el recorrido se repite.
+    """
+    entradas = []
+    for raiz, dirs, nombres in os.walk(carpeta, followlinks=False):
+        # Carpetas ocultas: extracciones en curso o restos de un reemplazo (.<nombre>.tmp / .old)
+        dirs[:] = [d for d in dirs if not d.startswith(".")]
+        relativa = os.path.relpath(raiz, carpeta)
+        carpeta_raiz = "" if relativa == "." else relativa.split(os.sep, 1)[0]
+        for nombre in nombres:
+            entradas.append(
+                _Entrada(
+                    Path(raiz) / nombre,
+                    nombre.upper(),
+                    os.path.splitext(nombre)[1].lower(),
+                    carpeta_raiz,
+                )
+            )
+    return tuple(entradas)
+
+
+@functools.lru_cache(maxsize=8)
+def _indice_descomprimidos(carpeta: str, mtime_ns: int) -> Dict[str, List[Path]]:
+    """Índice {nombre_archivo_en_minúsculas: [rutas]} construido sobre _escanear_descomprimidos."""
+    indice: Dict[str, List[Path]] = {}
+    for entrada in _escanear_descomprimidos(carpeta, mtime_ns):
+        indice.setdefault(entrada.ruta.name.lower(), []).append(entrada.ruta)
+    return indice
+
+
+def _entradas_descomprimidos(carpeta_descomprimidos: Path) -> tuple:
+    """Entradas cacheadas de la carpeta de descomprimidos (tupla vacía si no existe)."""
+    try:
+        mtime_ns = carpeta_descomprimidos.stat().st_mtime_ns
+    except OSError:
+        return ()
+    return _escanear_descomprimidos(str(carpeta_descomprimidos), mtime_ns)
+
+
+def _buscar_en_indice(carpeta_descomprimidos: Path, nombres: List[str]) -> Optional[Path]:
+    """Busca por nombre exacto (sin distinguir mayúsculas) en el índice cacheado de descomprimidos."""
+    try:
+        mtime_ns = carpeta_descomprimidos.stat().st_mtime_ns
+    except OSError:
+        return None
+    indice = _indice_descomprimidos(str(carpeta_descomprimidos), mtime_ns)
+    for nombre in nombres:
+        for ruta in indice.get(nombre.lower(), ()):
+            if ruta.is_file():
+                return ruta
+    return None
+
+
+def _buscar_por_nombre(raiz: Path, nombre: str, profundidad_max: Optional[int] = None) -> Optional[Path]:
+    """
+    Busca un archivo por nombre exacto (sin distinguir mayúsculas) bajo raiz, en anchura,
+    con os.scandir. Compara cadenas y solo construye Path para el archivo encontrado.
+    """
+    objetivo = nombre.lower()
+    pendientes = deque([(str(raiz), 0)])
+    while pendientes:
+        carpeta, nivel = pendientes.popleft()
+        try:
+            with os.scandir(carpeta) as entradas:
+                for entrada in entradas:
+                    if entrada.name.lower() == objetivo and entrada.is_file():
+                        return Path(entrada.path)
+                    if entrada.is_dir(follow_symlinks=False) and (
+                        profundidad_max is None or nivel < profundidad_max
+                    ):
+                        pendientes.append((entrada.path, nivel + 1))
+        except OSError:
+            continue
+    return None
+
+
+class _SinResultado(Exception):
+    """Señal interna para que lru_cache no memorice búsquedas sin resultado."""
+
+
+def _memoizar_hallazgos(buscar):
+    """
+    Memoiza un buscador de archivos por (anyo, mes, carpeta_base).
+
+    Solo se guardan hallazgos positivos: si el archivo aún no existe (p. ej. falta
+    descargar el ZIP) la siguiente llamada vuelve a buscar. Si la ruta cacheada
+    desaparece del disco se limpia la caché y se busca de nuevo. La versión sin
+    caché queda disponible en __wrapped__ y la caché se limpia con cache_clear().
+    """
+
+    @functools.lru_cache(maxsize=256)
+    def _buscar_cacheado(anyo: int, mes: int, carpeta_base: str) -> Path:
+        archivo = buscar(anyo, mes, carpeta_base)
+        if archivo is None:
+            raise _SinResultado
+        return archivo
+
+    @functools.wraps(buscar)
+    def encontrar(anyo: int, mes: int, carpeta_base: str = "bd_data") -> Optional[Path]:
+        clave = (int(anyo), int(mes), str(carpeta_base))
+        try:
+            archivo = _buscar_cacheado(*clave)
+            if not archivo.exists():
+                _buscar_cacheado.cache_clear()
+                archivo = _buscar_cacheado(*clave)
+        except _SinResultado:
+            return None
+        return archivo
+
+    encontrar.cache_clear = _buscar_cacheado.cache_clear
+    encontrar.cache_info = _buscar_cacheado.cache_info
+    return encontrar
+
+
+def limpiar_cache_busquedas() -> None:
+    """Invalida las búsquedas de archivos memorizadas (llamar tras descomprimir un ZIP)."""
+    encontrar_archivo_balance.cache_clear()
+    encontrar_archivo_anexo_potencia.cache_clear()
+    encontrar_archivo_cuadros_pago_sscc.cache_clear()
+    _escanear_descomprimidos.cache_clear()
+    _indice_descomprimidos.cache_clear()
+
+
+@_memoizar_hallazgos
 def encontrar_archivo_balance(anyo: int, mes: int, carpeta_base: str = "bd_data") -> Optional[Path]:
     """
     Encuentra el archivo Balance_XXYYD.xlsm basado en el año y mes.
@@ -32,7 +204,7 @@ def encontrar_archivo_balance(anyo: int, mes: int, carpeta_base: str = "bd_data"
 
     # Validar rango del mes
     if mes < 1 or mes > 12:
-        print(f"[ERROR] Mes inválido: {mes}. Debe estar entre 1 y 12.")
+        logger.error("Mes inválido: %s. Debe estar entre 1 y 12.", mes)
         return None
 
     anyo_abrev = str(anyo)[-2:]
@@ -42,73 +214,69 @@ def encontrar_archivo_balance(anyo: int, mes: int, carpeta_base: str = "bd_data"
     nombre_base = f"Balance_{anyo_abrev}{mes_str}D"
     nombres_archivo = [f"{nombre_base}.xlsm", f"{nombre_base}.xlsx"]
 
-    print(f"[INFO] Buscando archivo Balance para {mes}/{anyo}")
-    print(f"  Nombres esperados: {', '.join(nombres_archivo)}")
-    print(f"  Año abreviado: {anyo_abrev}, Mes: {mes_str}")
+    logger.debug("Buscando archivo Balance para %s/%s (nombres esperados: %s)", mes, anyo, nombres_archivo)
 
     # Buscar en la carpeta descomprimidos
     carpeta_descomprimidos = Path(carpeta_base) / "descomprimidos"
 
     if not carpeta_descomprimidos.exists():
-        print(f"[ERROR] La carpeta no existe: {carpeta_descomprimidos.absolute()}")
+        logger.error("La carpeta no existe: %s", carpeta_descomprimidos)
         return None
 
+    archivo_balance = _buscar_en_indice(carpeta_descomprimidos, nombres_archivo)
+    if archivo_balance is not None:
+        logger.info("Archivo Balance encontrado: %s", archivo_balance)
+        return archivo_balance
+
     # Buscar en todas las carpetas que coincidan con el patrón
     # El patrón es: "01 Resultados_2512_BD01"
     patron_carpeta = f"*Resultados_{anyo_abrev}{mes_str}_BD01"
-    print(f"  Patrón de carpeta: {patron_carpeta}")
-
     carpetas_encontradas = list(carpeta_descomprimidos.glob(patron_carpeta))
-    print(f"  Carpetas encontradas con el patrón: {len(carpetas_encontradas)}")
+    logger.debug("Carpetas con el patrón %s: %d", patron_carpeta, len(carpetas_encontradas))
 
     for carpeta in carpetas_encontradas:
         for nombre_archivo in nombres_archivo:
             archivo_balance = carpeta / nombre_archivo
             if archivo_balance.exists():
-                print(f"[OK] Archivo Balance encontrado: {archivo_balance}")
-                print(f"  Ruta completa: {archivo_balance.absolute()}")
+                logger.info("Archivo Balance encontrado: %s", archivo_balance)
                 return archivo_balance
         # Buscar también en subcarpetas (por si hay estructura anidada)
-        for subcarpeta in carpeta.rglob("*"):
-            if subcarpeta.is_dir():
-                for nombre_archivo in nombres_archivo:
-                    archivo_balance = subcarpeta / nombre_archivo
-                    if archivo_balance.exists():
-                        print(f"[OK] Archivo Balance encontrado en subcarpeta: {archivo_balance}")
-                        print(f"  Ruta completa: {archivo_balance.absolute()}")
-                        return archivo_balance
+        for nombre_archivo in nombres_archivo:
+            archivo_balance = _buscar_por_nombre(carpeta, nombre_archivo)
+            if archivo_balance is not None:
+                logger.info("Archivo Balance encontrado en subcarpeta: %s", archivo_balance)
+                return archivo_balance
 
     # Si no se encuentra, buscar en cualquier subcarpeta (búsqueda más amplia)
-    print(f"  Realizando búsqueda amplia en todas las carpetas...")
+    logger.debug("Realizando búsqueda amplia en todas las carpetas...")
     for carpeta in carpeta_descomprimidos.iterdir():
         if carpeta.is_dir():
             for nombre_archivo in nombres_archivo:
                 archivo_balance = carpeta / nombre_archivo
                 if archivo_balance.exists():
-                    print(f"[OK] Archivo Balance encontrado: {archivo_balance}")
-                    print(f"  Ruta completa: {archivo_balance.absolute()}")
+                    logger.info("Archivo Balance encontrado: %s", archivo_balance)
                     return archivo_balance
 
             # Buscar en subcarpetas
             for nombre_archivo in nombres_archivo:
-                for archivo in carpeta.rglob(nombre_archivo):
-                    if archivo.is_file():
-                        print(f"[OK] Archivo Balance encontrado: {archivo}")
-                        print(f"  Ruta completa: {archivo.absolute()}")
-                        return archivo
-
-    # Listar archivos Balance disponibles para ayudar al usuario
-    print(f"[ERROR] No se encontró el archivo Balance: {nombre_base}.xlsm ni .xlsx")
-    print(f"  Buscado en: {carpeta_descomprimidos.absolute()}")
-
-    # Mostrar archivos Balance disponibles
-    archivos_balance = list(carpeta_descomprimidos.rglob("Balance_*.xlsm")) + list(
-        carpeta_descomprimidos.rglob("Balance_*.xlsx")
+                archivo = _buscar_por_nombre(carpeta, nombre_archivo)
+                if archivo is not None:
+                    logger.info("Archivo Balance encontrado: %s", archivo)
+                    return archivo
+
+    logger.error(
+        "No se encontró el archivo Balance: %s.xlsm ni .xlsx (buscado en %s)",
+        nombre_base,
+        carpeta_descomprimidos,
     )
-    if archivos_balance:
-        print(f"  Archivos Balance disponibles:")
+
+    # Listar archivos Balance disponibles para ayudar al usuario (recorrido extra: solo en modo info)
+    if logger.isEnabledFor(logging.INFO):
+        archivos_balance = list(carpeta_descomprimidos.rglob("Balance_*.xlsm")) + list(
+            carpeta_descomprimidos.rglob("Balance_*.xlsx")
+        )
         for archivo in archivos_balance[:5]:  # Mostrar máximo 5
-            print(f"    - {archivo.name} (en {archivo.parent.name})")
+            logger.info("Archivo Balance disponible: %s (en %s)", archivo.name, archivo.parent.name)
 
     return None
 
@@ -198,7 +366,7 @@ def encontrar_archivo_bdef_detalle(
 
         archivo = _buscar_bdef_en_carpeta(carpeta)
         if archivo is not None:
-            print(f"[OK] Archivo BDef Detalle encontrado: {archivo}")
+            logger.info("Archivo BDef Detalle encontrado: %s", archivo)
             return archivo
 
     # Fallback: búsqueda recursiva en todo descomprimidos
@@ -217,6 +385,7 @@ def encontrar_archivo_bdef_detalle(
     return None
 
 
+@_memoizar_hallazgos
 def encontrar_archivo_anexo_potencia(
     anyo: int,
     mes: int,
@@ -256,36 +425,93 @@ def encontrar_archivo_anexo_potencia(
     if not carpeta_descomprimidos.exists():
         return None
 
-    # Buscar en carpetas que contengan "Potencia" Y el periodo (ej: 2512 para dic)
+    archivo = _buscar_en_indice(carpeta_descomprimidos, nombres_posibles)
+    if archivo is not None:
+        return archivo
+
+    # Anexos con el periodo en el nombre dentro de carpetas "Potencia" (filtro en memoria)
+    periodo_upper = periodo_en_nombre.upper()
+    candidatos = [
+        e
+        for e in _entradas_descomprimidos(carpeta_descomprimidos)
+        if "Potencia" in e.carpeta_raiz
+        and e.sufijo in (".xlsb", ".xlsx")
+        and periodo_upper in e.nombre_upper
+        and fnmatch.fnmatchcase(e.nombre_upper, "ANEXO 02.B*POTENCIA*SIMPLIFICADO*")
+    ]
+
+    # Preferir carpeta que contenga el periodo correcto (ej: 2512 en nombre), no otros meses (2510)
     yymm = f"{year2}{str(mes).zfill(2)}"  # 2512 para dic 2025
-    for carpeta in sorted(carpeta_descomprimidos.iterdir(), reverse=True):
-        if not carpeta.is_dir() or "Potencia" not in carpeta.name:
-            continue
-        # Preferir carpeta que contenga el periodo correcto (ej: 2512 en nombre)
-        if yymm not in carpeta.name:
-            continue  # Evitar carpetas de otros meses (ej: 2510)
-        for nombre in nombres_posibles:
-            archivo = carpeta / nombre
-            if archivo.exists():
-                return archivo
-        for archivo in carpeta.rglob("Anexo 02.b*Potencia*Simplificado*"):
-            if archivo.suffix.lower() in (".xlsb", ".xlsx") and periodo_en_nombre in archivo.name.lower():
-                return archivo
+    del_periodo = sorted(
+        (e for e in candidatos if yymm in e.carpeta_raiz), key=lambda e: e.carpeta_raiz, reverse=True
+    )
+    if del_periodo:
+        return del_periodo[0].ruta
 
-    # Fallback: buscar cualquier anexo que coincida con el periodo en el nombre
-    for carpeta in carpeta_descomprimidos.iterdir():
-        if carpeta.is_dir() and "Potencia" in carpeta.name:
-            for nombre in nombres_posibles:
-                archivo = carpeta / nombre
-                if archivo.exists():
-                    return archivo
-            for archivo in carpeta.rglob("Anexo 02.b*Potencia*Simplificado*"):
-                if archivo.suffix.lower() in (".xlsb", ".xlsx") and periodo_en_nombre in archivo.name.lower():
-                    return archivo
+    # Fallback: cualquier anexo que coincida con el periodo en el nombre
+    return candidatos[0].ruta if candidatos else None
+
+
+_SUFIJOS_EXCEL = (".xlsx", ".xlsb", ".xlsm")
+
+
+# Abreviatura por número de mes (índice 0 vacío): meses_abrev ya es una tupla indexable
+_MES_ABREV = meses_abrev
+
+
+@functools.lru_cache(maxsize=None)
+def _nombres_sscc(anyo: int, mes: int) -> tuple:
+    """Nombres candidatos de Cuadros de Pago SSCC (PLABACOM puede usar distintas variantes)."""
+    yymm = f"{str(anyo)[-2:]}{str(mes).zfill(2)}"
+    mes_abrev = _MES_ABREV[mes]
+    anyo_2 = str(anyo)[-2:]
+    return (
+        f"1_CUADROS_PAGO_SSCC_{yymm}_def.xlsx",
+        f"1_CUADROS_PAGO_SSCC_{yymm}_def.xlsb",
+        f"1_CUADROS_PAGO_SSCC_{yymm}_def.xlsm",
+        f"EXCEL 1_CUADROS_PAGO_SSCC_{yymm}_def.xlsx",
+        f"EXCEL 1_CUADROS_PAGO_SSCC_{yymm}_def.xlsb",
+        f"EXCEL 1_CUADROS_PAGO_SSCC_{yymm}_def.xlsm",
+        f"1_CUADROS_PAGO_SSCC_{anyo_2}{mes_abrev}_def.xlsx",
+        f"1_CUADROS_PAGO_SSCC_{anyo_2}{mes_abrev}_def.xlsb",
+        f"1_CUADROS_PAGO_SSCC_{anyo_2}{mes_abrev}_def.xlsm",
+        f"Cuadros de Pago_SSCC_{mes_abrev}{anyo_2}_def.xlsx",
+        f"Cuadros de Pago_SSCC_{mes_abrev}{anyo_2}_def.xlsb",
+        f"Cuadros de Pago_SSCC_{yymm}.xlsx",
+        f"Cuadros de Pago_SSCC_{yymm}.xlsb",
+    )
 
+
+def _es_cuadro_pago_sscc(nombre_upper: str, sufijo: str, periodos: tuple) -> bool:
+    """
+    Excel de Cuadros de Pago SSCC del período: (PAGO o CUADROS) y SSCC en el nombre, más alguno
+    de los períodos (YYMM, MESYY, YYMES, en mayúsculas). Variantes: 1_CUADROS_PAGO_SSCC,
+    Cuadros de Pago_SSCC, Pago SSCC, etc.
+    """
+    return (
+        sufijo in _SUFIJOS_EXCEL
+        and "SSCC" in nombre_upper
+        and ("PAGO" in nombre_upper or "CUADROS" in nombre_upper)
+        and any(periodo in nombre_upper for periodo in periodos)
+    )
+
+
+def _buscar_cuadro_sscc_en(carpeta: Path, periodos: tuple, omitir=()) -> Optional[Path]:
+    """
+    Recorre carpeta (os.walk, sin stat por archivo) y devuelve el primer Cuadro de Pago SSCC
+    del período. omitir: subcarpetas de primer nivel que no se recorren (en minúsculas).
+    """
+    for raiz, dirs, nombres in os.walk(carpeta):
+        if raiz == str(carpeta):
+            dirs[:] = [d for d in dirs if d.lower() not in omitir]
+        dirs[:] = [d for d in dirs if not d.startswith(".")]
+        for nombre in nombres:
+            if _es_cuadro_pago_sscc(nombre.upper(), os.path.splitext(nombre)[1].lower(), periodos):
+                return Path(raiz) / nombre
     return None
 
 
+@_memoizar_hallazgos
 def encontrar_archivo_cuadros_pago_sscc(
     anyo: int,
     mes: int,
@@ -304,75 +530,89 @@ def encontrar_archivo_cuadros_pago_sscc(
         return None
 
     yymm = f"{str(anyo)[-2:]}{str(mes).zfill(2)}"
-    # Patrones de nombre (PLABACOM puede usar distintas variantes)
-    mes_abrev = meses_abrev.get(mes, "??")
+    mes_abrev = _MES_ABREV[mes]
     anyo_2 = str(anyo)[-2:]
-    nombres = [
-        f"1_CUADROS_PAGO_SSCC_{yymm}_def.xlsx",
-        f"1_CUADROS_PAGO_SSCC_{yymm}_def.xlsb",
-        f"1_CUADROS_PAGO_SSCC_{yymm}_def.xlsm",
-        f"EXCEL 1_CUADROS_PAGO_SSCC_{yymm}_def.xlsx",
-        f"EXCEL 1_CUADROS_PAGO_SSCC_{yymm}_def.xlsb",
-        f"EXCEL 1_CUADROS_PAGO_SSCC_{yymm}_def.xlsm",
-        f"1_CUADROS_PAGO_SSCC_{anyo_2}{mes_abrev}_def.xlsx",
-        f"1_CUADROS_PAGO_SSCC_{anyo_2}{mes_abrev}_def.xlsb",
-        f"1_CUADROS_PAGO_SSCC_{anyo_2}{mes_abrev}_def.xlsm",
-        f"Cuadros de Pago_SSCC_{mes_abrev}{anyo_2}_def.xlsx",
-        f"Cuadros de Pago_SSCC_{mes_abrev}{anyo_2}_def.xlsb",
-        f"Cuadros de Pago_SSCC_{yymm}.xlsx",
-        f"Cuadros de Pago_SSCC_{yymm}.xlsb",
-    ]
+    nombres = _nombres_sscc(anyo, mes)
+    # Período: 2512, DIC25 o 25DIC (comparación sin distinguir mayúsculas)
+    periodos = (yymm, f"{mes_abrev}{anyo_2}".upper(), f"{anyo_2}{mes_abrev}".upper())
 
     carpeta_base_path = Path(carpeta_base)
     carpeta_descomprimidos = carpeta_base_path / "descomprimidos"
 
-    # 1) Buscar en bd_data/sscc (carpeta manual) y en bd_data raíz
-    for carpeta_extra in [carpeta_base_path / "sscc", carpeta_base_path]:
+    # 1) Buscar en bd_data/sscc (carpeta manual) y en bd_data raíz. En la raíz no se recorren
+    # sscc (ya revisada) ni descomprimidos (se filtra abajo sobre el recorrido cacheado)
+    for carpeta_extra, omitir in (
+        (carpeta_base_path / "sscc", ()),
+        (carpeta_base_path, ("sscc", "descomprimidos")),
+    ):
         if carpeta_extra.exists():
             for nombre in nombres:
                 archivo = carpeta_extra / nombre
                 if archivo.exists():
                     return archivo
-            for archivo in carpeta_extra.rglob("*"):
-                if archivo.is_file() and archivo.suffix.lower() in (".xlsx", ".xlsb", ".xlsm"):
-                    if "CUADROS_PAGO_SSCC" in archivo.name.upper() and yymm in archivo.name:
-                        return archivo
+            archivo = _buscar_cuadro_sscc_en(carpeta_extra, periodos, omitir)
+            if archivo is not None:
+                return archivo
 
     if not carpeta_descomprimidos.exists():
         return None
 
-    # 2) Buscar por nombre exacto y por patrón en descomprimidos
+    archivo = _buscar_en_indice(carpeta_descomprimidos, nombres)
+    if archivo is not None:
+        return archivo
+
+    # 2) Buscar por patrón en descomprimidos (un solo recorrido cacheado, filtrado en memoria)
     # Prioridad: PLABACOM_..._SSCC_Balance_SSCC_... (ej: PLABACOM_2025_12_Diciembre_SSCC_Balance_SSCC_2025_dic_def)
-    for carpeta in carpeta_descomprimidos.iterdir():
-        if carpeta.is_dir() and "SSCC" in carpeta.name:
-            for nombre in nombres:
-                archivo = carpeta / nombre
-                if archivo.exists():
-                    return archivo
-            for archivo in carpeta.rglob("*"):
-                if archivo.is_file() and archivo.suffix.lower() in (".xlsx", ".xlsb", ".xlsm"):
-                    name_upper = archivo.name.upper()
-                    name_lower = archivo.name.lower()
-                    # Cuadros de Pago SSCC (variantes: 1_CUADROS_PAGO_SSCC, Cuadros de Pago_SSCC, etc.)
-                    tiene_sscc_pago = (
-                        ("PAGO" in name_upper and "SSCC" in name_upper)
-                        or ("CUADROS" in name_upper and "SSCC" in name_upper)
-                        or "cuadros_pago_sscc" in name_lower
-                    )
-                    # Período: 2512, dic25, dic, etc.
-                    tiene_periodo = (
-                        yymm in archivo.name
-                        or f"{mes_abrev}{anyo_2}" in name_lower
-                        or f"{anyo_2}{mes_abrev}" in name_lower
-                    )
-                    if tiene_sscc_pago and tiene_periodo:
-                        return archivo
+    entradas = _entradas_descomprimidos(carpeta_descomprimidos)
+    # Cuadros de Pago SSCC (variantes: 1_CUADROS_PAGO_SSCC, Cuadros de Pago_SSCC, etc.)
+    # con período 2512, dic25 o 25dic en el nombre
+    archivo = next(
+        (
+            e.ruta
+            for e in entradas
+            if "SSCC" in e.carpeta_raiz and _es_cuadro_pago_sscc(e.nombre_upper, e.sufijo, periodos)
+        ),
+        None,
+    )
+    if archivo is not None:
+        return archivo
 
     # Búsqueda amplia
-    for archivo in carpeta_descomprimidos.rglob("*"):
-        if archivo.is_file() and archivo.suffix.lower() in (".xlsx", ".xlsb", ".xlsm"):
-            if "CUADROS_PAGO_SSCC" in archivo.name.upper() and yymm in archivo.name:
-                return archivo
+    # Búsqueda amplia: nombre estándar CUADROS_PAGO_SSCC y período YYMM en cualquier orden
+    return next(
+        (
+            e.ruta
+            for e in entradas
+            if e.sufijo in _SUFIJOS_EXCEL and "CUADROS_PAGO_SSCC" in e.nombre_upper and yymm in e.nombre_upper
+        ),
+        None,
+    )
+
+
+# Acentos → vocal simple en una sola pasada (str.translate) para búsquedas de encabezados
+_TABLA_SIN_ACENTOS = str.maketrans("íóáéúñ", "ioaeun")
+# Encabezados de CPI_: la fila debe contener nemotecnico, deudor y monto (en cualquier orden)
+_RE_FILA_ENCABEZADO_CPI = re.compile(r"^(?=.*nemotecnico)(?=.*deudor)(?=.*monto)", re.IGNORECASE | re.DOTALL)
+_RE_COL_DEUDOR = re.compile(r"^(?=.*nemotecnico)(?=.*deudor)", re.IGNORECASE | re.DOTALL)
+
+
+def _es_encabezado_cpi(valores) -> bool:
+    """True si la fila contiene los encabezados Nemotecnico Deudor y Monto de la hoja CPI_."""
+    fila_str = " ".join(str(v) for v in valores if v is not None and pd.notna(v)).lower()
+    return _RE_FILA_ENCABEZADO_CPI.search(fila_str.translate(_TABLA_SIN_ACENTOS)) is not None
+
+
+def _buscar_fila_encabezado_cpi(ruta: Path, limite: int = 15) -> Optional[int]:
+    """
+    Índice (base 0) de la fila de encabezados de CPI_ leyendo solo las primeras filas
+    en streaming (openpyxl read_only / pyxlsb). None si no se encuentra o no se puede leer.
+    """
+    try:
+        for i, fila in enumerate(islice(_iter_sheet_rows(ruta, "CPI_"), limite)):
+            if _es_encabezado_cpi(fila):
+                return i
+    except Exception:
+        pass
     return None
 
 
@@ -402,22 +642,25 @@ def leer_total_ingresos_sscc(
         print("[WARNING] TOTAL INGRESOS POR SSCC: ingrese Empresa para filtrar por Nemotecnico Deudor")
         return None
 
+    # CPI_ tiene encabezados en fila 5 (antes hay metadata: Coordinador, Concepto, etc.).
+    # Se ubican leyendo solo las primeras filas en streaming y luego se carga desde ahí.
+    skiprows = _buscar_fila_encabezado_cpi(archivo) or 0
+    kw = {"sheet_name": "CPI_", "header": None, "engine": _motor_excel(archivo)}
     try:
-        # CPI_ tiene encabezados en fila 5 (antes hay metadata: Coordinador, Concepto, etc.)
-        kw = {"sheet_name": "CPI_", "header": None}
-        if archivo.suffix.lower() == ".xlsb":
-            kw["engine"] = "pyxlsb"
-        df_raw = pd.read_excel(archivo, **kw)
+        df_raw = pd.read_excel(archivo, skiprows=skiprows, **kw)
+        if skiprows and not (len(df_raw) and _es_encabezado_cpi(df_raw.iloc[0].values)):
+            # El motor contó las filas iniciales distinto: leer la hoja completa
+            df_raw = pd.read_excel(archivo, **kw)
     except Exception as e:
         print(f"[WARNING] Error leyendo CPI_: {e}")
         return None
 
-    # Buscar fila de encabezados (contiene "Nemotecnico Deudor" y "Monto")
+    # Buscar fila de encabezados (contiene "Nemotecnico Deudor" y "Monto").
+    # Un solo bloque numpy de 15x12 (las columnas útiles están antes de la 10) en vez de una Series por fila.
     fila_header = None
-    for i in range(min(15, len(df_raw))):
-        fila_str = " ".join(str(v) for v in df_raw.iloc[i].values if pd.notna(v)).lower()
-        fila_str = fila_str.replace("ó", "o").replace("í", "i")
-        if "nemotecnico" in fila_str and "deudor" in fila_str and "monto" in fila_str:
+    bloque = df_raw.iloc[:15, :12].to_numpy()
+    for i, valores in enumerate(bloque):
+        if _es_encabezado_cpi(valores):
             fila_header = i
             break
 
@@ -436,8 +679,8 @@ def leer_total_ingresos_sscc(
             continue
         if idx >= 10:  # Columnas 0-6 son datos; 7+ suele ser metadata o duplicado
             break
-        c_lower = str(val).lower().replace("ó", "o").replace("í", "i")
-        if "nemotecnico" in c_lower and "deudor" in c_lower and idx_deudor is None:
+        c_lower = str(val).lower().translate(_TABLA_SIN_ACENTOS)
+        if idx_deudor is None and _RE_COL_DEUDOR.search(c_lower):
             idx_deudor = idx
         elif "monto" in c_lower and "retencion" not in c_lower and idx_monto is None:
             idx_monto = idx
@@ -447,16 +690,12 @@ def leer_total_ingresos_sscc(
         return None
 
     # Usar iloc para evitar duplicados de nombres
-    def _norm_empresa(s):
-        return str(s).strip().upper().replace(" ", "_")
-
-    col_deudor_vals = df.iloc[:, idx_deudor].apply(lambda x: _norm_empresa(x))
+    col_deudor_vals = (
+        df.iloc[:, idx_deudor].astype(str).str.strip().str.upper().str.replace(" ", "_", regex=False)
+    )
     mask = col_deudor_vals == nombre_empresa_norm
     df_filtrado = df.loc[mask]
-    total = df_filtrado.iloc[:, idx_monto].apply(
-        lambda v: _parsear_valor_monetario(v) or 0
-    ).sum()
-    total = float(total)
+    total = float(_parsear_serie_monetaria(df_filtrado.iloc[:, idx_monto]).fillna(0).sum())
     if total > 0:
         total = -total
 
@@ -471,10 +710,7 @@ def _normalizar_texto(s: str) -> str:
     """Normaliza texto para búsqueda: minúsculas, sin acentos."""
     if not s or (isinstance(s, float) and pd.isna(s)):
         return ""
-    s = str(s).strip().lower()
-    for old, new in [("í", "i"), ("ó", "o"), ("á", "a"), ("é", "e"), ("ú", "u"), ("ñ", "n")]:
-        s = s.replace(old, new)
-    return s
+    return str(s).strip().lower().translate(_TABLA_SIN_ACENTOS)
 
 
 def _tiene_nombre_corto_empresa(n: str) -> bool:
@@ -593,6 +829,36 @@ def _encontrar_seccion_fisicos_contratos(df_raw: pd.DataFrame) -> Optional[pd.Da
     return None
 
 
+def _leer_contratos_raw_calamine(ruta: Path) -> Optional[pd.DataFrame]:
+    """
+    Lee la hoja Contratos con python-calamine (mismo recorte que la versión openpyxl).
+    Devuelve DataFrame con header=None (valores crudos), None si no se puede leer.
+    """
+    try:
+        from python_calamine import CalamineWorkbook
+
+        wb = CalamineWorkbook.from_path(str(ruta))
+        hoja = None
+        if "Contratos" in wb.sheet_names:
+            hoja = "Contratos"
+        else:
+            hoja = next((name for name in wb.sheet_names if "contrato" in name.lower()), None)
+        if hoja is None:
+            return None
+        filas = wb.get_sheet_by_name(hoja).to_python(skip_empty_area=False)[:200]
+        if not filas:
+            return None
+        # calamine devuelve "" en celdas vacías; openpyxl devuelve None
+        rows = [[None if v == "" else v for v in fila[:25]] for fila in filas]
+        max_cols = max(len(r) for r in rows)
+        for r in rows:
+            r.extend([None] * (max_cols - len(r)))
+        return pd.DataFrame(rows)
+    except Exception as e:
+        print(f"[WARNING] calamine leyendo Contratos: {e}")
+        return None
+
+
 def _leer_contratos_raw_openpyxl(ruta: Path) -> Optional[pd.DataFrame]:
     """
     Lee la hoja Contratos usando openpyxl para evitar problemas con .xlsm.
@@ -652,10 +918,14 @@ def leer_compra_venta_energia_gm_holdings(
         )
         return None
 
-    df_raw = _leer_contratos_raw_openpyxl(archivo)
+    df_raw = _leer_contratos_raw_calamine(archivo) if _EXCEL_ENGINE else None
+    if df_raw is None:
+        df_raw = _leer_contratos_raw_openpyxl(archivo)
     if df_raw is None:
         try:
-            df_raw = pd.read_excel(archivo, sheet_name="Contratos", header=None, engine="openpyxl")
+            df_raw = pd.read_excel(
+                archivo, sheet_name="Contratos", header=None, engine=_motor_excel(archivo, "openpyxl")
+            )
         except Exception as e:
             print(f"[WARNING] Error leyendo hoja Contratos: {e}")
             return None
@@ -665,46 +935,37 @@ def leer_compra_venta_energia_gm_holdings(
         print(f"[WARNING] No se encontró sección 'Resumen Contratos Generadores Físicos' en Contratos")
         return None
 
+    # Nombres de columna normalizados una sola vez (se reutilizan en todas las búsquedas)
+    cols = list(df.columns)
+    cols_lower = [str(c).strip().lower() for c in cols]
+
     # Buscar columna nombre_corto_empresa para filtrar
-    col_empresa = None
-    for c in df.columns:
-        if "nombre_corto" in str(c).lower() and "empresa" in str(c).lower():
-            col_empresa = c
-            break
+    col_empresa = next(
+        (c for c, cl in zip(cols, cols_lower) if "nombre_corto" in cl and "empresa" in cl), None
+    )
     if col_empresa is None:
         print(f"[WARNING] No se encontró columna nombre_corto_empresa en Resumen Contratos Generadores Físicos")
         return None
 
     # Buscar columna VENTA[CLP]
-    col_venta_clp = None
-    for c in df.columns:
-        c_lower = str(c).strip().lower()
-        if "venta" in c_lower and "clp" in c_lower:
-            col_venta_clp = c
-            break
+    col_venta_clp = next((c for c, cl in zip(cols, cols_lower) if "venta" in cl and "clp" in cl), None)
     if col_venta_clp is None:
         print(f"[WARNING] No se encontró columna VENTA[CLP] en Resumen Contratos Generadores Físicos")
         print(f"  Columnas: {list(df.columns)}")
         return None
 
-    df_guardar = df.copy()
+    # Filtros empresa/barra combinados en una sola máscara (sin copiar el DataFrame)
+    mask = pd.Series(True, index=df.index)
     if nombre_empresa:
-        df_guardar = df_guardar[
-            df_guardar[col_empresa].astype(str).str.strip().str.upper()
-            == nombre_empresa.strip().upper()
-        ]
+        emp_norm = df[col_empresa].astype(str).str.strip().str.upper()
+        mask &= emp_norm == nombre_empresa.strip().upper()
     if nombre_barra:
-        for c in df_guardar.columns:
-            if "barra" in str(c).lower():
-                df_guardar = df_guardar[
-                    df_guardar[c].astype(str).str.strip().str.upper()
-                    == nombre_barra.strip().upper()
-                ]
-                break
+        col_barra = next((c for c, cl in zip(cols, cols_lower) if "barra" in cl), None)
+        if col_barra is not None:
+            barra_norm = df[col_barra].astype(str).str.strip().str.upper()
+            mask &= barra_norm == nombre_barra.strip().upper()
 
-    total = df_guardar[col_venta_clp].apply(
-        lambda v: _parsear_valor_monetario(v) or 0
-    ).sum()
+    total = _parsear_serie_monetaria(df.loc[mask, col_venta_clp]).fillna(0).sum()
 
     # El valor en Excel suele ser negativo (venta/egreso); para el informe debe ser positivo
     total = abs(float(total))
@@ -717,6 +978,60 @@ def leer_compra_venta_energia_gm_holdings(
     return total
 
 
+# <sheet name="..."/> en xl/workbook.xml (con o sin prefijo de namespace)
+_RE_HOJA_WORKBOOK_XML = re.compile(rb'<(?:\w+:)?sheet\b[^>]*?\bname="([^"]*)"')
+
+
+def _nombres_hojas_xlsx(ruta: str) -> Optional[tuple]:
+    """
+    Nombres de hojas de un .xlsx/.xlsm leyendo solo xl/workbook.xml del zip.
+    Devuelve None si el archivo no tiene la estructura esperada (se usa otro lector).
+    """
+    try:
+        with zipfile.ZipFile(ruta) as z:
+            contenido = z.read("xl/workbook.xml")
+    except (KeyError, zipfile.BadZipFile, OSError):
+        return None
+    nombres = _RE_HOJA_WORKBOOK_XML.findall(contenido)
+    if not nombres:
+        return None
+    return tuple(html.unescape(n.decode("utf-8")) for n in nombres)
+
+
+@functools.lru_cache(maxsize=32)
+def _nombres_hojas_cacheado(ruta: str, mtime_ns: int) -> tuple:
+    sufijo = Path(ruta).suffix.lower()
+    if sufijo in (".xlsx", ".xlsm"):
+        nombres = _nombres_hojas_xlsx(ruta)
+        if nombres is not None:
+            return nombres
+    if _EXCEL_ENGINE:
+        from python_calamine import CalamineWorkbook
+
+        return tuple(CalamineWorkbook.from_path(ruta).sheet_names)
+    if sufijo == ".xlsb":
+        from pyxlsb import open_workbook
+
+        with open_workbook(ruta) as wb:
+            return tuple(wb.sheets)
+    if sufijo in (".xlsx", ".xlsm"):
+        wb = load_workbook(ruta, read_only=True, keep_links=False)
+        try:
+            return tuple(wb.sheetnames)
+        finally:
+            wb.close()
+    return tuple(pd.ExcelFile(ruta).sheet_names)
+
+
+def _nombres_hojas(ruta: Path) -> List[str]:
+    """
+    Nombres de hojas del libro sin parsear su contenido (xl/workbook.xml, calamine, openpyxl read_only o pyxlsb).
+    Cacheado por (ruta, mtime): el libro no cambia durante una ejecución.
+    """
+    ruta = Path(ruta)
+    return list(_nombres_hojas_cacheado(str(ruta), ruta.stat().st_mtime_ns))
+
+
 def _encontrar_hoja_por_patron(
     ruta: Path,
     patrones: List[str],
@@ -734,8 +1049,26 @@ def _encontrar_hoja_por_patron(
         anyo: Año
 
     Returns:
-        Nombre de la hoja encontrada, None si no hay coincidencia
+        Nombre de la hoja encontrada, None si no hay coincidencia.
+        El resultado se memoriza: los tres lectores del Anexo resuelven la misma hoja una sola vez.
     """
+    ruta = Path(ruta)
+    try:
+        mtime_ns = ruta.stat().st_mtime_ns
+    except OSError:
+        return None
+    return _encontrar_hoja_por_patron_cacheado(str(ruta), mtime_ns, tuple(patrones), mes, anyo)
+
+
+@functools.lru_cache(maxsize=64)
+def _encontrar_hoja_por_patron_cacheado(
+    ruta: str,
+    mtime_ns: int,
+    patrones: tuple,
+    mes: int,
+    anyo: int,
+) -> Optional[str]:
+    """Búsqueda de _encontrar_hoja_por_patron memorizada por (ruta, mtime, patrones, mes, año)."""
     mes_anexo = MESES_ANEXO_POTENCIA.get(mes, "Dic")
     year2 = str(anyo)[-2:]
     variantes_mes_anyo = [
@@ -746,17 +1079,7 @@ def _encontrar_hoja_por_patron(
         year2,
     ]
     try:
-        if ruta.suffix.lower() == ".xlsb":
-            try:
-                from pyxlsb import open_workbook
-                with open_workbook(str(ruta)) as wb:
-                    sheet_names = list(wb.sheets)
-            except ImportError:
-                return None
-        else:
-            xl = pd.ExcelFile(ruta)
-            sheet_names = xl.sheet_names
-        for nombre in sheet_names:
+        for nombre in _nombres_hojas(ruta):
             n_lower = str(nombre).lower()
             if not all(p.lower() in n_lower for p in patrones):
                 continue
@@ -768,6 +1091,27 @@ def _encontrar_hoja_por_patron(
     return None
 
 
+def _hoja_balance_potencia(archivo: Path, mes: int, anyo: int) -> str:
+    """
+    Hoja "01.BALANCE POTENCIA ..." del Anexo 02.b: primero con mes/año en el nombre; si no,
+    la única hoja del libro con los patrones (el archivo ya es del mes) y, en último caso,
+    el nombre estándar. Con varias candidatas sin mes no se elige ninguna.
+    """
+    patrones = ("01.BALANCE", "POTENCIA")
+    nombre_hoja = _encontrar_hoja_por_patron(archivo, patrones=patrones, mes=mes, anyo=anyo)
+    if nombre_hoja is not None:
+        return nombre_hoja
+    try:
+        hojas = _nombres_hojas(archivo)
+    except Exception:
+        hojas = []
+    patrones_lower = [p.lower() for p in patrones]
+    candidatas = [h for h in hojas if all(p in str(h).lower() for p in patrones_lower)]
+    if len(candidatas) == 1:
+        return candidatas[0]
+    return f"01.BALANCE POTENCIA {MESES_ANEXO_POTENCIA.get(mes, 'Dic')}-{str(anyo)[-2:]} def"
+
+
 def _debug_mostrar_contenido_hoja(
     ruta: Path,
     nombre_hoja: str,
@@ -777,37 +1121,125 @@ def _debug_mostrar_contenido_hoja(
     """Muestra contenido de la hoja para depurar cuando no se encuentra un concepto."""
     try:
         try:
-            df = pd.read_excel(ruta, sheet_name=nombre_hoja, header=None)
+            df = pd.read_excel(ruta, sheet_name=nombre_hoja, header=None, engine=_motor_excel(ruta))
         except ValueError:
-            xl = pd.ExcelFile(ruta)
-            hoja = next((s for s in xl.sheet_names if nombre_hoja.lower() in str(s).lower()), None)
+            hojas = _nombres_hojas(ruta)
+            hoja = next((s for s in hojas if nombre_hoja.lower() in str(s).lower()), None)
             if hoja is None:
-                print(f"  Hojas disponibles: {xl.sheet_names}")
+                logger.debug("Hojas disponibles: %s", hojas)
                 return
-            df = pd.read_excel(ruta, sheet_name=hoja, header=None)
-        print(f"[DEBUG] Contenido de hoja (primeras {max_filas} filas):")
-        for i, row in df.head(max_filas).iterrows():
-            vals = [str(v)[:25] for v in row.iloc[:max_cols].tolist()]
+            df = pd.read_excel(ruta, sheet_name=hoja, header=None, engine=_motor_excel(ruta))
+        logger.debug("Contenido de hoja (primeras %d filas):", max_filas)
+        for i, *row in df.head(max_filas).iloc[:, :max_cols].itertuples(name=None):
+            vals = [str(v)[:25] for v in row]
             txt = " | ".join(v for v in vals if v and v != "nan")
             if txt.strip():
-                print(f"  Fila {i}: {txt}")
+                logger.debug("  Fila %s: %s", i, txt)
         # Buscar celdas que contengan IT o INGRESOS
         celdas_relevantes = []
-        for i, row in df.head(50).iterrows():
+        for i, *row in df.head(50).itertuples(name=None):
             for j, v in enumerate(row):
                 if v and ("IT" in str(v).upper() or "INGRESOS" in str(v).upper()):
                     celdas_relevantes.append((i, j, str(v)[:50]))
         if celdas_relevantes:
-            print(f"  Celdas con 'IT' o 'INGRESOS': {celdas_relevantes[:15]}")
+            logger.debug("Celdas con 'IT' o 'INGRESOS': %s", celdas_relevantes[:15])
     except Exception as e:
-        print(f"[DEBUG] Error leyendo hoja para debug: {e}")
+        logger.debug("Error leyendo hoja para debug: %s", e)
         try:
-            xl = pd.ExcelFile(ruta)
-            print(f"  Hojas disponibles: {xl.sheet_names}")
+            logger.debug("Hojas disponibles: %s", _nombres_hojas(ruta))
         except Exception:
             pass
 
 
+def _resolver_hoja(nombres_hojas, nombre_hoja: Optional[str]) -> Optional[str]:
+    """
+    Devuelve el nombre exacto de la hoja; si no existe, la primera cuyo nombre la contenga
+    (insensible a mayúsculas). Si nombre_hoja es None, devuelve la primera hoja.
+    """
+    nombres_hojas = list(nombres_hojas)
+    if nombre_hoja is None:
+        return nombres_hojas[0] if nombres_hojas else None
+    if nombre_hoja in nombres_hojas:
+        return nombre_hoja
+    return next((s for s in nombres_hojas if nombre_hoja.lower() in str(s).lower()), None)
+
+
+def _iter_sheet_rows(ruta: Path, nombre_hoja: Optional[str]) -> Iterator[tuple]:
+    """
+    Itera las filas de una hoja como tuplas de valores, sin materializar la hoja completa.
+    .xlsb usa pyxlsb (omitiendo filas vacías); .xlsx/.xlsm usa openpyxl en modo read_only.
+
+    Raises:
+        ValueError: si la hoja no existe (ni por coincidencia parcial)
+    """
+    if ruta.suffix.lower() == ".xlsb":
+        from pyxlsb import open_workbook
+
+        with open_workbook(str(ruta)) as wb:
+            hoja = _resolver_hoja(wb.sheets, nombre_hoja)
+            if hoja is None:
+                raise ValueError(f"Hoja no encontrada: {nombre_hoja}")
+            with wb.get_sheet(hoja) as sheet:
+                # sparse=True: pyxlsb no genera las filas vacías intermedias
+                for row in sheet.rows(sparse=True):
+                    yield tuple(None if cell is None else cell.v for cell in row)
+        return
+
+    wb = load_workbook(str(ruta), read_only=True, data_only=True)
+    try:
+        hoja = _resolver_hoja(wb.sheetnames, nombre_hoja)
+        if hoja is None:
+            raise ValueError(f"Hoja no encontrada: {nombre_hoja}")
+        yield from wb[hoja].iter_rows(values_only=True)
+    finally:
+        wb.close()
+
+
+@functools.lru_cache(maxsize=8)
+def _filas_hoja_xlsb_cacheado(ruta: str, mtime_ns: int, hoja: str) -> tuple:
+    from pyxlsb import open_workbook
+
+    with open_workbook(ruta) as wb:
+        with wb.get_sheet(hoja) as sheet:
+            return tuple(tuple(cell.v for cell in row) for row in sheet.rows(sparse=True))
+
+
+def _filas_hoja_xlsb(ruta: Path, hoja: str) -> tuple:
+    """
+    Filas (tuplas de valores por posición de columna) de una hoja .xlsb ya resuelta.
+    Las filas completamente vacías se omiten (pyxlsb con sparse=True).
+    Abrir y parsear un .xlsb con pyxlsb es lento: se hace una vez por (archivo, mtime, hoja)
+    y las distintas lecturas del Anexo comparten el resultado.
+    """
+    return _filas_hoja_xlsb_cacheado(str(ruta), ruta.stat().st_mtime_ns, hoja)
+
+
+def _filas_hoja(ruta: Path, nombre_hoja: Optional[str]) -> Iterator[tuple]:
+    """
+    Como _iter_sheet_rows, pero las hojas .xlsb salen de la caché de _filas_hoja_xlsb.
+
+    Raises:
+        ValueError: si la hoja no existe (ni por coincidencia parcial)
+    """
+    if ruta.suffix.lower() != ".xlsb":
+        yield from _iter_sheet_rows(ruta, nombre_hoja)
+        return
+    hoja = _resolver_hoja(_nombres_hojas(ruta), nombre_hoja)
+    if hoja is None:
+        raise ValueError(f"Hoja no encontrada: {nombre_hoja}")
+    yield from _filas_hoja_xlsb(ruta, hoja)
+
+
+def _primer_valor(fila: tuple, indices: List[int]):
+    """Primer valor no vacío de la fila entre las columnas indicadas (encabezados duplicados)."""
+    for i in indices:
+        if i < len(fila):
+            v = fila[i]
+            if v is not None and not (isinstance(v, float) and pd.isna(v)):
+                return v
+    return None
+
+
 def _leer_valor_por_empresa_y_columna(
     ruta: Path,
     nombre_hoja: str,
@@ -821,24 +1253,18 @@ def _leer_valor_por_empresa_y_columna(
     Detecta dinámicamente la fila de encabezados (puede no ser la primera).
     """
     try:
-        kw = {"sheet_name": nombre_hoja, "header": None}
-        if ruta.suffix.lower() == ".xlsb":
-            kw["engine"] = "pyxlsb"
+        filas = _filas_hoja(ruta, nombre_hoja)
         try:
-            df_raw = pd.read_excel(ruta, **kw)
+            primeras = list(islice(filas, 20))
         except ValueError:
-            xl = pd.ExcelFile(ruta, engine="pyxlsb" if ruta.suffix.lower() == ".xlsb" else None)
-            hoja = next((s for s in xl.sheet_names if nombre_hoja.lower() in str(s).lower()), None)
-            if hoja is None:
-                print(f"[DEBUG] Hoja no encontrada para IT: {nombre_hoja}")
-                return None
-            df_raw = pd.read_excel(ruta, sheet_name=hoja, header=None, engine="pyxlsb" if ruta.suffix.lower() == ".xlsb" else None)
+            print(f"[DEBUG] Hoja no encontrada para IT: {nombre_hoja}")
+            return None
 
         # Buscar fila donde la PRIMERA celda sea "USUARIOS" o "EMPRESA" (evitar "Nota: Usuarios Pagan")
         header_row = None
         primeras_validas = ("USUARIOS", "EMPRESA")
-        for i in range(min(20, len(df_raw))):
-            first_cell = df_raw.iloc[i].iloc[0] if len(df_raw.columns) > 0 else None
+        for i, fila in enumerate(primeras):
+            first_cell = fila[0] if fila else None
             if first_cell is not None and not pd.isna(first_cell):
                 first_str = str(first_cell).strip().upper()
                 if first_str in primeras_validas or first_str.startswith("USUARIOS"):
@@ -846,22 +1272,22 @@ def _leer_valor_por_empresa_y_columna(
                     break
 
         if header_row is None:
-            for i in range(min(20, len(df_raw))):
-                for j in range(min(3, len(df_raw.columns))):
-                    cell = df_raw.iloc[i].iloc[j] if j < len(df_raw.iloc[i]) else None
-                    if cell is not None and str(cell).strip().upper() in primeras_validas:
-                        header_row = i
-                        break
-                if header_row is not None:
+            for i, fila in enumerate(primeras):
+                if any(
+                    cell is not None and str(cell).strip().upper() in primeras_validas
+                    for cell in fila[:3]
+                ):
+                    header_row = i
                     break
 
         if header_row is None:
             print("[DEBUG] No se encontró fila de encabezados con USUARIOS/Empresa")
             return None
 
-        df = df_raw.iloc[header_row:].copy()
-        df.columns = [str(c).strip() if c is not None and not (isinstance(c, float) and pd.isna(c)) else "" for c in df.iloc[0].tolist()]
-        df = df.iloc[1:].reset_index(drop=True)
+        columnas = [
+            str(c).strip() if c is not None and not (isinstance(c, float) and pd.isna(c)) else ""
+            for c in primeras[header_row]
+        ]
 
         emp_norm = str(nombre_empresa).strip().replace(" ", "_").upper()
         if not emp_norm:
@@ -869,54 +1295,51 @@ def _leer_valor_por_empresa_y_columna(
 
         # Filtrar por columna Usuarios (prioridad: "Usuarios" exacto, luego usuario/empresa/nombre)
         col_empresa = None
-        for c in df.columns:
-            c_lower = str(c).strip().lower()
-            if c_lower == "usuarios":
+        for c in columnas:
+            if c.lower() == "usuarios":
                 col_empresa = c
                 break
         if col_empresa is None:
-            for c in df.columns:
-                if "usuario" in str(c).lower() or "empresa" in str(c).lower():
+            for c in columnas:
+                if "usuario" in c.lower() or "empresa" in c.lower():
                     col_empresa = c
                     break
         if col_empresa is None:
-            col_empresa = df.columns[0]
+            col_empresa = columnas[0]
 
         # Para IT Potencia: la hoja tiene dos bloques (Total y Total general).
         # El valor correcto suele estar en "Total" del primer bloque, NO en "Total general".
         col_target = None
         # Primero: buscar columna exacta "Total" (sin "general")
-        for idx, c in enumerate(df.columns):
-            c_str = str(c).strip().lower() if c else ""
-            if c_str == "total" and "general" not in c_str:
+        for c in columnas:
+            if c.lower() == "total":
                 col_target = c
                 break
         if col_target is None:
             # Fallback: primera columna que contiene "total" pero NO "general"
-            for idx, c in enumerate(df.columns):
-                c_str = str(c).strip().lower() if c else ""
+            for c in columnas:
+                c_str = c.lower()
                 if c_str and "total" in c_str and "general" not in c_str:
                     col_target = c
                     break
         if col_target is None:
             # Último recurso: Total general
-            for idx in range(len(df.columns) - 1, -1, -1):
-                c = df.columns[idx]
-                c_str = str(c).strip().lower() if c else ""
-                if c_str and "total" in c_str:
+            for c in reversed(columnas):
+                if "total" in c.lower():
                     col_target = c
                     break
         if col_target is None:
-            print(f"[DEBUG] No se encontró columna '{col_valor}'. Primeras: {list(df.columns)[:5]}... últimas: {list(df.columns)[-3:]}")
+            print(f"[DEBUG] No se encontró columna '{col_valor}'. Primeras: {columnas[:5]}... últimas: {columnas[-3:]}")
             return None
 
+        idx_empresa = [i for i, c in enumerate(columnas) if c == col_empresa]
+        idx_target = [i for i, c in enumerate(columnas) if c == col_target]
+
         total = 0.0
         found_any = False
-        for idx, row in df.iterrows():
-            celda = row.get(col_empresa)
-            if isinstance(celda, pd.Series):
-                celda = celda.dropna().iloc[0] if len(celda.dropna()) > 0 else None
-            if celda is None or (isinstance(celda, float) and pd.isna(celda)):
+        for fila in chain(primeras[header_row + 1 :], filas):
+            celda = _primer_valor(fila, idx_empresa)
+            if celda is None:
                 continue
             celda_norm = str(celda).strip().replace(" ", "_").upper()
             if (
@@ -925,10 +1348,7 @@ def _leer_valor_por_empresa_y_columna(
                 or emp_norm.startswith(celda_norm)
                 or celda_norm.startswith(emp_norm)
             ):
-                val = row.get(col_target)
-                if isinstance(val, pd.Series):
-                    val = val.dropna().iloc[0] if len(val.dropna()) > 0 else None
-                parsed = _parsear_valor_monetario(val)
+                parsed = _parsear_valor_monetario(_primer_valor(fila, idx_target))
                 if parsed is not None:
                     total += parsed
                     found_any = True
@@ -936,13 +1356,13 @@ def _leer_valor_por_empresa_y_columna(
                         print(f"  [DEBUG IT] Fila '{celda}' -> col '{col_target}' = {parsed:,.2f}")
 
         if debug and found_any:
-            print(f"  [DEBUG IT] Columnas: {list(df.columns)}")
+            print(f"  [DEBUG IT] Columnas: {columnas}")
             print(f"  [DEBUG IT] Col usada: {col_target}, Total sumado: {total:,.2f}")
 
         if found_any:
             return total
         print(f"[DEBUG] No se encontró fila para '{nombre_empresa}' en col '{col_empresa}'. "
-              f"Columnas: {list(df.columns)[:8]}...")
+              f"Columnas: {columnas[:8]}...")
         return None
     except Exception as e:
         print(f"[DEBUG] Error leyendo por empresa/columna: {e}")
@@ -953,7 +1373,7 @@ def _leer_valor_por_columna(
     ruta: Path,
     texto_upper: str,
     nombre_hoja: Optional[str],
-    excluir_upper: List[str],
+    excluir_re: Optional[re.Pattern],
     col_valor_lower: str,
 ) -> Optional[float]:
     """
@@ -961,51 +1381,99 @@ def _leer_valor_por_columna(
     Usado cuando el valor está en una columna específica (ej: "Total general").
     """
     try:
-        if nombre_hoja:
-            try:
-                df = pd.read_excel(ruta, sheet_name=nombre_hoja, header=0)
-            except ValueError:
-                # Hoja no encontrada, buscar por coincidencia parcial
-                xl = pd.ExcelFile(ruta)
-                hoja_encontrada = None
-                for s in xl.sheet_names:
-                    if nombre_hoja.lower() in str(s).lower():
-                        hoja_encontrada = s
-                        break
-                if hoja_encontrada is None:
-                    return None
-                df = pd.read_excel(ruta, sheet_name=hoja_encontrada, header=0)
-        else:
-            df = pd.read_excel(ruta, sheet_name=0, header=0)
+        filas = _filas_hoja(ruta, nombre_hoja)
+        try:
+            # La primera fila no vacía es el encabezado (equivalente a header=0 en pandas)
+            encabezados = next(
+                (f for f in filas if any(v is not None and v != "" for v in f)), None
+            )
+        except ValueError:
+            return None
+        if encabezados is None:
+            return None
 
         # Buscar columna que contenga el nombre (ej: "total general")
         col_target = None
-        for c in df.columns:
-            if col_valor_lower in str(c).strip().lower():
-                col_target = c
+        for idx, c in enumerate(encabezados):
+            if c is not None and col_valor_lower in str(c).strip().lower():
+                col_target = idx
                 break
         if col_target is None:
             print(f"[WARNING] No se encontró columna '{col_valor_lower}' en la hoja")
             return None
+        nombre_col = str(encabezados[col_target]).strip()
 
         # Buscar fila con texto_concepto (excluyendo filas con excluir)
-        for idx, row in df.iterrows():
-            row_str = " ".join(str(v).upper() for v in row.dropna().astype(str))
+        for fila in filas:
+            row_str = " ".join(
+                str(v).upper() for v in fila
+                if v is not None and not (isinstance(v, float) and pd.isna(v))
+            )
             if texto_upper in row_str:
-                if excluir_upper and any(ex in row_str for ex in excluir_upper):
+                if excluir_re is not None and excluir_re.search(row_str):
                     continue
-                val = row.get(col_target)
+                val = fila[col_target] if col_target < len(fila) else None
                 parsed = _parsear_valor_monetario(val)
                 if parsed is not None:
-                    print(f"[INFO] Valor encontrado en columna '{col_target}': {parsed:,.2f}")
+                    print(f"[INFO] Valor encontrado en columna '{nombre_col}': {parsed:,.2f}")
                     return parsed
-        print(f"[WARNING] No se encontró fila con el concepto en columna '{col_target}'")
+        print(f"[WARNING] No se encontró fila con el concepto en columna '{nombre_col}'")
         return None
     except Exception as e:
         print(f"[WARNING] Error leyendo por columna: {e}")
         return None
 
 
+def _unir_filas_mayusculas(valores: np.ndarray) -> np.ndarray:
+    """
+    Texto en mayúsculas de cada fila: celdas no vacías unidas por un espacio (equivalente a
+    " ".join(str(v).upper() for v in fila.dropna())), calculado columna a columna con np.char.
+    """
+    if valores.size == 0:
+        return np.full(valores.shape[0], "", dtype=str)
+    textos = np.char.upper(np.where(pd.isna(valores), "", valores).astype(str))
+    unidas = textos[:, 0]
+    for j in range(1, textos.shape[1]):
+        col = textos[:, j]
+        con_separador = np.char.add(np.char.add(unidas, " "), col)
+        unidas = np.where(col == "", unidas, np.where(unidas == "", col, con_separador))
+    return unidas
+
+
+def _hojas_como_arreglos(ruta: Path, nombre_hoja: Optional[str] = None) -> Dict[str, np.ndarray]:
+    """
+    Valores crudos de una hoja (o de todas si nombre_hoja es None) como matrices numpy de objetos,
+    equivalentes a pd.read_excel(header=None).to_numpy(): celdas vacías = NaN.
+
+    Con python-calamine se leen las celdas directamente, sin construir un DataFrame intermedio.
+
+    Raises:
+        Exception: si el archivo o la hoja no se pueden leer
+    """
+    if not _EXCEL_ENGINE:
+        if nombre_hoja:
+            df = pd.read_excel(ruta, sheet_name=nombre_hoja, header=None, engine=_motor_excel(ruta))
+            return {nombre_hoja: df.to_numpy(dtype=object)}
+        dfs = pd.read_excel(ruta, sheet_name=None, header=None, engine=_motor_excel(ruta))
+        return {nombre: df.to_numpy(dtype=object) for nombre, df in dfs.items()}
+
+    from python_calamine import CalamineWorkbook
+
+    wb = CalamineWorkbook.from_path(str(ruta))
+    if nombre_hoja and nombre_hoja not in wb.sheet_names:
+        raise ValueError(f"Hoja no encontrada: {nombre_hoja}")
+    resultado = {}
+    for nombre in [nombre_hoja] if nombre_hoja else wb.sheet_names:
+        filas = wb.get_sheet_by_name(nombre).to_python(skip_empty_area=False)
+        ancho = max((len(f) for f in filas), default=0)
+        valores = np.full((len(filas), ancho), np.nan, dtype=object)
+        for i, fila in enumerate(filas):
+            valores[i, : len(fila)] = fila
+        valores[valores == ""] = np.nan
+        resultado[nombre] = valores
+    return resultado
+
+
 def leer_valor_concepto_anexo_xlsb(
     ruta_anexo: Path,
     texto_concepto: str,
@@ -1038,115 +1506,120 @@ def leer_valor_concepto_anexo_xlsb(
     excluir_upper = (
         [e.upper() for e in excluir_si_contiene] if excluir_si_contiene else []
     )
+    # Todas las exclusiones en una sola regex: una pasada por fila en vez de un `in` por cadena
+    excluir_re = re.compile("|".join(map(re.escape, excluir_upper))) if excluir_upper else None
     col_valor_lower = columna_valor.strip().lower() if columna_valor else None
 
     # Si se especifica columna_valor, leer por encabezados (pandas o pyxlsb)
     if col_valor_lower:
         return _leer_valor_por_columna(
-            ruta, texto_upper, nombre_hoja, excluir_upper, col_valor_lower
+            ruta, texto_upper, nombre_hoja, excluir_re, col_valor_lower
         )
 
     if ruta.suffix.lower() == ".xlsb":
         try:
-            from pyxlsb import open_workbook
+            hojas = _nombres_hojas(ruta)
         except ImportError:
             print("[WARNING] pyxlsb no instalado. Ejecute: pip install pyxlsb")
             return None
 
-        with open_workbook(str(ruta)) as wb:
-            # Si se especifica hoja, buscar solo ahí; si no, recorrer todas
-            if nombre_hoja:
-                hojas_a_revisar = [nombre_hoja] if nombre_hoja in wb.sheets else []
-            else:
-                hojas_a_revisar = list(wb.sheets)
-            if nombre_hoja and not hojas_a_revisar:
-                # Buscar coincidencia aproximada (insensible a mayúsculas)
-                for s in wb.sheets:
-                    if nombre_hoja.lower() in str(s).lower():
-                        hojas_a_revisar = [s]
-                        break
+        # Si se especifica hoja, buscar solo ahí; si no, recorrer todas
+        if nombre_hoja:
+            hojas_a_revisar = [nombre_hoja] if nombre_hoja in hojas else []
+        else:
+            hojas_a_revisar = list(hojas)
+        if nombre_hoja and not hojas_a_revisar:
+            # Buscar coincidencia aproximada (insensible a mayúsculas)
+            for s in hojas:
+                if nombre_hoja.lower() in str(s).lower():
+                    hojas_a_revisar = [s]
+                    break
 
-            for sheet_name in hojas_a_revisar:
-                if sheet_name not in wb.sheets:
-                    continue
-                with wb.get_sheet(sheet_name) as sheet:
-                    for row in sheet.rows():
-                        # Construir dict col -> valor por si las celdas son sparse
-                        row_by_col = {}
-                        for cell in row:
-                            if cell is not None:
-                                c = getattr(cell, "c", len(row_by_col))
-                                row_by_col[c] = getattr(cell, "v", cell)
-
-                        for col_idx, val in row_by_col.items():
-                            valor_str = str(val).strip().upper()
-                            if texto_upper in valor_str:
-                                if excluir_si_contiene:
-                                    if any(
-                                        ex.upper() in valor_str
-                                        for ex in excluir_si_contiene
-                                    ):
-                                        break  # omitir fila, siguiente fila
-                                # Buscar valor numérico en columnas siguientes de la misma fila
-                                cols_orden = sorted(row_by_col.keys())
-                                for c in cols_orden:
-                                    if c > col_idx:
-                                        v = row_by_col[c]
-                                        try:
-                                            return float(v)
-                                        except (TypeError, ValueError):
-                                            pass
-                                return None
+        for sheet_name in hojas_a_revisar:
+            for fila in _filas_hoja_xlsb(ruta, sheet_name):
+                for col_idx, val in enumerate(fila):
+                    if val is None:
+                        continue
+                    valor_str = str(val).strip().upper()
+                    if texto_upper in valor_str:
+                        if excluir_re is not None and excluir_re.search(valor_str):
+                            break  # omitir fila, siguiente fila
+                        # Buscar valor numérico en columnas siguientes de la misma fila
+                        for v in fila[col_idx + 1 :]:
+                            try:
+                                return float(v)
+                            except (TypeError, ValueError):
+                                pass
+                        return None
         return None
 
-    # Para .xlsx usar pandas/openpyxl
+    # Para .xlsx: matriz de valores por hoja (calamine directo o pandas/openpyxl)
     try:
-        if nombre_hoja:
-            df_dict = {nombre_hoja: pd.read_excel(ruta, sheet_name=nombre_hoja, header=None)}
-        else:
-            df_dict = pd.read_excel(ruta, sheet_name=None, header=None)
+        hojas_valores = _hojas_como_arreglos(ruta, nombre_hoja)
     except Exception:
         return None
 
-    excluir_upper = (
-        [e.upper() for e in excluir_si_contiene] if excluir_si_contiene else []
-    )
-
-    for _sheet_name, df in df_dict.items():
-        for _, row in df.iterrows():
-            row_str = " ".join(str(v).upper() for v in row.dropna().astype(str))
-            if texto_upper in row_str:
-                if excluir_upper and any(ex in row_str for ex in excluir_upper):
+    for valores in hojas_valores.values():
+        filas_str = _unir_filas_mayusculas(valores)
+        coincide = np.char.find(filas_str, texto_upper) >= 0
+        for ex in excluir_upper:
+            coincide &= np.char.find(filas_str, ex) < 0
+        # Solo las filas coincidentes pasan al recorrido por celda en Python
+        for i in np.flatnonzero(coincide):
+            row = valores[i]
+            for v in row:
+                try:
+                    return float(v)
+                except (TypeError, ValueError):
                     continue
-                for v in row:
-                    try:
-                        return float(v)
-                    except (TypeError, ValueError):
-                        continue
-                # Buscar primer número en la fila
-                for v in row:
-                    if isinstance(v, (int, float)) and not pd.isna(v):
-                        return float(v)
-                    try:
-                        return float(v)
-                    except (TypeError, ValueError):
-                        pass
+            # Buscar primer número en la fila
+            for v in row:
+                if isinstance(v, (int, float)) and not pd.isna(v):
+                    return float(v)
+                try:
+                    return float(v)
+                except (TypeError, ValueError):
+                    pass
     return None
 
 
+# Formato monetario chileno → float en una sola pasada: quita puntos de miles y la coma pasa a punto
+_TABLA_MONETARIA = str.maketrans({".": "", ",": "."})
+
+
 def _parsear_valor_monetario(val) -> Optional[float]:
     """Convierte valor con formato 46.709.214 (punto como miles) a float."""
     if val is None:
         return None
     if isinstance(val, (int, float)) and not (isinstance(val, bool)):
         return float(val)
-    s = str(val).strip().replace(".", "").replace(",", ".")
+    s = str(val).strip().translate(_TABLA_MONETARIA)
     try:
         return float(s)
     except ValueError:
         return None
 
 
+def _parsear_serie_monetaria(serie: pd.Series) -> pd.Series:
+    """
+    Versión vectorizada de _parsear_valor_monetario para una columna completa.
+    Los números se conservan; los textos con formato 46.709.214 se convierten.
+    Valores no convertibles quedan como NaN.
+    """
+    if pd.api.types.is_numeric_dtype(serie):
+        return pd.to_numeric(serie, errors="coerce").astype(float)
+    valores = serie.astype(object)
+    # Solo las celdas de texto usan el formato con punto de miles: pd.to_numeric("46.709")
+    # daría 46.709 en vez de 46709, así que el camino rápido se limita a celdas no-texto.
+    es_texto = valores.map(type).eq(str)
+    if not es_texto.any():
+        return pd.to_numeric(valores, errors="coerce").astype(float)
+    numeros = pd.to_numeric(valores.where(~es_texto), errors="coerce").astype(float)
+    textos = valores[es_texto].str.strip().str.translate(_TABLA_MONETARIA)
+    numeros.loc[es_texto] = pd.to_numeric(textos, errors="coerce")
+    return numeros
+
+
 def _leer_total_ingresos_potencia_firme_bdef_detalle(
     ruta: Path,
     nombre_empresa: str,
@@ -1182,21 +1655,18 @@ def _leer_total_ingresos_potencia_firme_bdef_detalle(
     if not nombre_empresa_norm:
         return None
 
-    # .xlsm y .xlsx requieren engine='openpyxl' explícito para evitar fallos
-    use_openpyxl = ruta.suffix.lower() in (".xlsm", ".xlsx")
-    read_kw = {"sheet_name": nombre_hoja, "header": None}
-    if use_openpyxl:
-        read_kw["engine"] = "openpyxl"
+    # .xlsm y .xlsx requieren engine explícito (calamine u openpyxl) para evitar fallos
+    motor_defecto = "openpyxl" if ruta.suffix.lower() in (".xlsm", ".xlsx") else None
+    read_kw = {"sheet_name": nombre_hoja, "header": None, "engine": _motor_excel(ruta, motor_defecto)}
 
     try:
         df = pd.read_excel(ruta, **read_kw)
     except Exception as e1:
         # Buscar hoja Balance2 por variantes (Balance 2, balance2, etc.)
         try:
-            xl_kw = {"engine": "openpyxl"} if use_openpyxl else {}
-            xl = pd.ExcelFile(ruta, **xl_kw)
+            hojas = _nombres_hojas(ruta)
             hoja_encontrada = None
-            for sh in xl.sheet_names:
+            for sh in hojas:
                 sh_lower = str(sh).lower()
                 if "balance" in sh_lower and "2" in sh_lower:
                     hoja_encontrada = sh
@@ -1210,7 +1680,7 @@ def _leer_total_ingresos_potencia_firme_bdef_detalle(
             else:
                 print(
                     f"[WARNING] BDef Detalle: no se encontró hoja Balance2 en {ruta.name}. "
-                    f"Hojas: {xl.sheet_names[:8]}"
+                    f"Hojas: {hojas[:8]}"
                 )
                 return None
         except Exception as e2:
@@ -1361,31 +1831,31 @@ def _leer_total_ingresos_potencia_firme_bdef_detalle(
     # Leer datos: filas debajo del encabezado, filtrar por empresa y concepto, sumar Pago PSUF
     # En Excel con estructura pivot/grupo, Empresa puede estar solo en la primera fila del grupo;
     # las filas siguientes (DP, Eólica) tienen celda Empresa vacía. Usar "forward fill".
-    total = 0.0
-    filas_encontradas = 0
     fila_inicio = (fila_header + 1) if fila_header is not None else 1
-    ultima_empresa = None
-    for idx in range(fila_inicio, len(df)):
-        row = df.iloc[idx]
-        emp_val = row.iloc[col_empresa] if col_empresa < len(row) else None
-        emp_str = str(emp_val).strip() if emp_val is not None and not (isinstance(emp_val, float) and pd.isna(emp_val)) else ""
-        if emp_str:
-            ultima_empresa = emp_str
-        # Si Empresa está vacía, heredar de la fila anterior (estructura pivot)
-        empresa_para_filtrar = ultima_empresa if ultima_empresa else emp_str
-        if not empresa_para_filtrar or _norm_empresa(empresa_para_filtrar) != nombre_empresa_norm:
-            continue
-        # Filtrar por Concepto si está configurado (ej: solo "Eólica")
-        if conceptos_aceptados and col_concepto is not None:
-            concepto_val = row.iloc[col_concepto] if col_concepto < len(row) else None
-            concepto_norm = _normalizar_comparacion(concepto_val) if concepto_val is not None else ""
-            if concepto_norm not in conceptos_aceptados:
-                continue
-        filas_encontradas += 1
-        psuf_val = row.iloc[col_pago_psuf] if col_pago_psuf < len(row) else None
-        parsed = _parsear_valor_monetario(psuf_val)
-        if parsed is not None:
-            total += parsed
+    datos = df.iloc[fila_inicio:]
+    n_cols = df.shape[1]
+
+    # Si Empresa está vacía, heredar de la fila anterior (estructura pivot): ffill de textos no vacíos
+    emp_col = datos.iloc[:, col_empresa]
+    emp_txt = emp_col.astype(str).str.strip()
+    empresa_ff = emp_txt.where(emp_col.notna() & (emp_txt != "")).ffill()
+    empresa_norm = (
+        empresa_ff.str.upper().str.replace(" ", "_", regex=False).str.replace("-", "_", regex=False)
+    )
+    mask = (empresa_norm == nombre_empresa_norm).fillna(False).astype(bool)
+
+    # Filtrar por Concepto si está configurado (ej: solo "Eólica"); solo se normalizan filas de la empresa
+    if conceptos_aceptados and col_concepto is not None:
+        if col_concepto < n_cols:
+            concepto_norm = datos.iloc[:, col_concepto][mask].map(_normalizar_comparacion)
+            mask.loc[mask] = concepto_norm.isin(conceptos_aceptados).to_numpy()
+        else:
+            mask.loc[mask] = "" in conceptos_aceptados
+
+    filas_encontradas = int(mask.sum())
+    total = 0.0
+    if filas_encontradas and col_pago_psuf < n_cols:
+        total = float(_parsear_serie_monetaria(datos.iloc[:, col_pago_psuf][mask]).fillna(0).sum())
 
     if filas_encontradas == 0:
         # Debug: mostrar muestras de datos para diagnosticar estructura
@@ -1456,59 +1926,65 @@ def leer_total_ingresos_potencia_firme_anexo(
 
     if ruta.suffix.lower() == ".xlsb":
         try:
-            from pyxlsb import open_workbook
+            hojas = _nombres_hojas(ruta)
         except ImportError:
             return None
 
-        with open_workbook(str(ruta)) as wb:
-            if nombre_hoja not in wb.sheets:
-                for s in wb.sheets:
-                    if nombre_hoja.lower() in str(s).lower():
-                        nombre_hoja = s
-                        break
-                else:
-                    return None
-
-            with wb.get_sheet(nombre_hoja) as sheet:
-                # Col B=Empresa (índice 1), Col D=TOTAL (índice 3)
-                # pyxlsb usa columnas 0-based en Cell
-                for row in sheet.rows():
-                    row_by_col = {}
-                    for cell in row:
-                        if cell is not None:
-                            c = getattr(cell, "c", -1)
-                            row_by_col[c] = getattr(cell, "v", cell)
-
-                    # Columna B (índice 1) = Empresa
-                    emp_val = row_by_col.get(1) or row_by_col.get(0)
-                    if emp_val is None:
-                        continue
-                    if str(emp_val).strip().upper() != nombre_empresa_upper:
-                        continue
-
-                    # Columna D (índice 3) = TOTAL; fallback C (índice 2) = Potencia SEN
-                    total_val = row_by_col.get(3) or row_by_col.get(2)
-                    if total_val is not None:
-                        parsed = _parsear_valor_monetario(total_val)
-                        if parsed is not None:
-                            return parsed
+        if nombre_hoja not in hojas:
+            for s in hojas:
+                if nombre_hoja.lower() in str(s).lower():
+                    nombre_hoja = s
+                    break
+            else:
                 return None
 
-    # Fallback xlsx con pandas
+        # Col B=Empresa (índice 1), Col D=TOTAL (índice 3); pyxlsb usa columnas 0-based.
+        # Filtro barato primero: filas sin texto en B/A se descartan sin construir cadenas, y
+        # la comparación completa (strip/upper) solo corre si la celda contiene el nombre.
+        # Solo interesan las columnas A-D: se toma una vista fija de 4 celdas por fila.
+        for fila in _filas_hoja_xlsb(ruta, nombre_hoja):
+            cols = fila[:4]
+            if len(cols) < 4:
+                cols += (None,) * (4 - len(cols))
+            col_a, col_b, col_c, col_d = cols
+            # Columna B (índice 1) = Empresa
+            emp_val = col_b or col_a
+            if emp_val is None:
+                continue
+            emp_str = emp_val if isinstance(emp_val, str) else str(emp_val)
+            if emp_str.isascii() and len(emp_str) < len(nombre_empresa_upper):
+                continue
+            if emp_str.strip().upper() != nombre_empresa_upper:
+                continue
+
+            # Columna D (índice 3) = TOTAL; fallback C (índice 2) = Potencia SEN
+            total_val = col_d or col_c
+            if total_val is not None:
+                parsed = _parsear_valor_monetario(total_val)
+                if parsed is not None:
+                    return parsed
+        return None
+
+    # Fallback xlsx con pandas: solo se materializan Empresa (B=1), Potencia SEN (C=2) y TOTAL (D=3)
     try:
-        df = pd.read_excel(ruta, sheet_name=nombre_hoja, header=None)
+        df = pd.read_excel(
+            ruta,
+            sheet_name=nombre_hoja,
+            header=None,
+            usecols=lambda c: c in (1, 2, 3),
+            dtype={1: "string"},
+            engine=_motor_excel(ruta),
+        )
     except Exception:
         return None
-    # Buscar columna Empresa (B=1) y TOTAL (D=3) - pandas usa 0-based
-    for _, row in df.iterrows():
-        emp_cell = row.iloc[1] if len(row) > 1 else None
-        if emp_cell is None:
-            continue
-        if str(emp_cell).strip().upper() != nombre_empresa_upper:
-            continue
-        total_cell = row.iloc[3] if len(row) > 3 else row.iloc[2]
-        return _parsear_valor_monetario(total_cell)
-    return None
+    if 1 not in df.columns or 2 not in df.columns:
+        return None
+
+    coincide = (df[1].str.strip().str.upper() == nombre_empresa_upper).fillna(False)
+    if not coincide.any():
+        return None
+    col_total = 3 if 3 in df.columns else 2
+    return _parsear_valor_monetario(df.loc[coincide, col_total].iloc[0])
 
 
 def leer_total_ingresos_potencia_firme(
@@ -1579,11 +2055,7 @@ def leer_total_ingresos_potencia_firme(
         print(f"[WARNING] No se encontró Anexo 02.b Potencia para {mes}/{anyo}")
         return None
 
-    nombre_hoja = _encontrar_hoja_por_patron(
-        archivo, patrones=["01.BALANCE", "POTENCIA"], mes=mes, anyo=anyo
-    )
-    if nombre_hoja is None:
-        nombre_hoja = f"01.BALANCE POTENCIA {MESES_ANEXO_POTENCIA.get(mes, 'Dic')}-{str(anyo)[-2:]} def"
+    nombre_hoja = _hoja_balance_potencia(archivo, mes, anyo)
 
     if nombre_empresa and nombre_empresa.strip():
         valor = leer_total_ingresos_potencia_firme_anexo(
@@ -1637,8 +2109,7 @@ def leer_ingresos_por_it(
     )
     if nombre_hoja is None:
         try:
-            xl = pd.ExcelFile(archivo)
-            hojas = xl.sheet_names
+            hojas = _nombres_hojas(archivo)
             print(f"[WARNING] No se encontró hoja 02.IT POTENCIA para {mes}/{anyo}")
             print(f"  Hojas en archivo: {hojas[:10]}{'...' if len(hojas) > 10 else ''}")
         except Exception:
@@ -1685,7 +2156,8 @@ def leer_ingresos_por_it(
             return valor
 
     print(f"[WARNING] No se encontró INGRESOS POR IT POTENCIA en hoja {nombre_hoja}")
-    _debug_mostrar_contenido_hoja(archivo, nombre_hoja)
+    if logger.isEnabledFor(logging.DEBUG):
+        _debug_mostrar_contenido_hoja(archivo, nombre_hoja)
     return None
 
 
@@ -1708,11 +2180,7 @@ def leer_ingresos_por_potencia(
         print(f"[WARNING] No se encontró Anexo 02.b Potencia para leer INGRESOS POR POTENCIA {mes}/{anyo}")
         return None
 
-    nombre_hoja = _encontrar_hoja_por_patron(
-        archivo, patrones=["01.BALANCE", "POTENCIA"], mes=mes, anyo=anyo
-    )
-    if nombre_hoja is None:
-        nombre_hoja = f"01.BALANCE POTENCIA {MESES_ANEXO_POTENCIA.get(mes, 'Dic')}-{str(anyo)[-2:]} def"
+    nombre_hoja = _hoja_balance_potencia(archivo, mes, anyo)
 
     # Filtrar por Empresa y columna TOTAL (misma estructura que TOTAL INGRESOS POTENCIA FIRME)
     if not nombre_empresa.strip():
@@ -1772,10 +2240,11 @@ def leer_excel_pandas(ruta_archivo: Union[str, Path], hoja: Optional[str] = None
     if not ruta_archivo.exists():
         raise FileNotFoundError(f"El archivo no existe: {ruta_archivo}")
 
+    motor = _motor_excel(ruta_archivo)
     if hoja:
-        df = pd.read_excel(ruta_archivo, sheet_name=hoja, header=header)
+        df = pd.read_excel(ruta_archivo, sheet_name=hoja, header=header, engine=motor)
     else:
-        df = pd.read_excel(ruta_archivo, header=header)
+        df = pd.read_excel(ruta_archivo, header=header, engine=motor)
 
     return df
 
@@ -1794,12 +2263,99 @@ def obtener_hojas_excel(ruta_archivo: Union[str, Path]) -> List[str]:
     if not ruta_archivo.exists():
         raise FileNotFoundError(f"El archivo no existe: {ruta_archivo}")
 
-    # Usar openpyxl para obtener las hojas (mejor para .xlsm)
-    wb = openpyxl.load_workbook(ruta_archivo, read_only=True, data_only=True)
-    hojas = wb.sheetnames
-    wb.close()
+    return _nombres_hojas(ruta_archivo)
+
+
+# Libros openpyxl abiertos en modo lectura, por (ruta, mtime); se cierran al salir de la caché
+_LIBROS_ABIERTOS: "OrderedDict[tuple, openpyxl.Workbook]" = OrderedDict()
+_MAX_LIBROS_ABIERTOS = 4
+
+
+def _libro_lectura(ruta: Path):
+    """
+    Libro openpyxl (read_only, data_only) compartido entre lecturas del mismo archivo.
+    Abrirlo parsea sharedStrings y styles; se hace una vez por (ruta, mtime).
+    No cerrar el libro devuelto: se libera con limpiar_caches_excel().
+    """
+    clave = (str(ruta), ruta.stat().st_mtime_ns)
+    wb = _LIBROS_ABIERTOS.get(clave)
+    if wb is not None:
+        _LIBROS_ABIERTOS.move_to_end(clave)
+        return wb
+    wb = openpyxl.load_workbook(ruta, read_only=True, data_only=True)
+    _LIBROS_ABIERTOS[clave] = wb
+    while len(_LIBROS_ABIERTOS) > _MAX_LIBROS_ABIERTOS:
+        _LIBROS_ABIERTOS.popitem(last=False)[1].close()
+    return wb
+
+
+def _cerrar_libros_de(ruta: Path) -> None:
+    """Cierra y quita de _LIBROS_ABIERTOS los libros de ruta (cualquier mtime)."""
+    ruta = str(ruta)
+    for clave in [c for c in _LIBROS_ABIERTOS if c[0] == ruta]:
+        _LIBROS_ABIERTOS.pop(clave).close()
+
+
+def _precargar_balance_potencia(archivo: Optional[Path], mes: int, anyo: int) -> None:
+    """
+    Parsea una sola vez la hoja 01.BALANCE POTENCIA del Anexo (.xlsb) y la deja en la caché de
+    _filas_hoja_xlsb para los dos lectores que la usan.
+    """
+    if archivo is None or archivo.suffix.lower() != ".xlsb":
+        return
+    try:
+        hoja = _resolver_hoja(_nombres_hojas(archivo), _hoja_balance_potencia(archivo, mes, anyo))
+        if hoja is not None:
+            _filas_hoja_xlsb(archivo, hoja)
+    except Exception:
+        pass  # cada lector informa su propio error
+
+
+def leer_resumen_potencia(
+    anyo: int,
+    mes: int,
+    nombre_empresa: str = "",
+    carpeta_base: str = "bd_data",
+    concepto_filtro: Optional[Union[List[str], str]] = None,
+) -> Dict[str, Optional[float]]:
+    """
+    Lee los tres conceptos de potencia de un mes:
+    TOTAL INGRESOS POR POTENCIA FIRME CLP, INGRESOS POR IT POTENCIA e INGRESOS POR POTENCIA.
+
+    Antes se resuelve el Anexo una vez (los lectores reutilizan la búsqueda memorizada) y se
+    parsea la hoja 01.BALANCE POTENCIA que comparten dos de ellos. Las lecturas van en orden:
+    pyxlsb es Python puro y la hoja ya está en caché, así que en paralelo no se ganaba casi nada
+    y los mensajes de cada concepto salían intercalados.
 
-    return hojas
+    Returns:
+        Dict concepto -> valor (None si no se encontró)
+    """
+    archivo_anexo = encontrar_archivo_anexo_potencia(anyo, mes, carpeta_base)
+    _precargar_balance_potencia(archivo_anexo, mes, anyo)
+
+    return {
+        "TOTAL INGRESOS POR POTENCIA FIRME CLP": leer_total_ingresos_potencia_firme(
+            anyo, mes,
+            nombre_empresa=nombre_empresa,
+            carpeta_base=carpeta_base,
+            concepto_filtro=concepto_filtro,
+        ),
+        "INGRESOS POR IT POTENCIA": leer_ingresos_por_it(
+            anyo, mes, nombre_empresa=nombre_empresa, carpeta_base=carpeta_base
+        ),
+        "INGRESOS POR POTENCIA": leer_ingresos_por_potencia(
+            anyo, mes, nombre_empresa=nombre_empresa, carpeta_base=carpeta_base
+        ),
+    }
+
+
+def limpiar_caches_excel() -> None:
+    """Cierra los libros abiertos en caché y descarta las hojas/nombres de hojas memorizados."""
+    while _LIBROS_ABIERTOS:
+        _LIBROS_ABIERTOS.popitem()[1].close()
+    _nombres_hojas_cacheado.cache_clear()
+    _filas_hoja_xlsb_cacheado.cache_clear()
+    _encontrar_hoja_por_patron_cacheado.cache_clear()
 
 
 def leer_celda_excel(ruta_archivo: Union[str, Path], hoja: str, celda: str):
@@ -1818,12 +2374,8 @@ def leer_celda_excel(ruta_archivo: Union[str, Path], hoja: str, celda: str):
     if not ruta_archivo.exists():
         raise FileNotFoundError(f"El archivo no existe: {ruta_archivo}")
 
-    wb = openpyxl.load_workbook(ruta_archivo, read_only=True, data_only=True)
-    ws = wb[hoja]
-    valor = ws[celda].value
-    wb.close()
-
-    return valor
+    ws = _libro_lectura(ruta_archivo)[hoja]
+    return ws[celda].value
 
 
 def leer_rango_excel(ruta_archivo: Union[str, Path], hoja: str, rango: str) -> pd.DataFrame:
@@ -1842,22 +2394,153 @@ def leer_rango_excel(ruta_archivo: Union[str, Path], hoja: str, rango: str) -> p
     if not ruta_archivo.exists():
         raise FileNotFoundError(f"El archivo no existe: {ruta_archivo}")
 
-    wb = openpyxl.load_workbook(ruta_archivo, read_only=True, data_only=True)
-    ws = wb[hoja]
+    ws = _libro_lectura(ruta_archivo)[hoja]
 
     # Leer el rango
     datos = []
     for fila in ws[rango]:
         datos.append([celda.value for celda in fila])
 
-    wb.close()
-
     # Convertir a DataFrame
     df = pd.DataFrame(datos)
 
     return df
 
 
+def _reducir_flotantes_sin_perdida(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Pasa a float32 las columnas float64 cuyos valores caben exactos en 32 bits.
+    Se omiten 'monetario' y columnas tipo id: los montos en CLP superan 2**24 y perderían pesos.
+    """
+    for col in df.select_dtypes("float64").columns:
+        nombre = str(col).lower()
+        if nombre == "monetario" or nombre == "id" or nombre.startswith("id_") or nombre.endswith("_id"):
+            continue
+        valores = df[col].to_numpy()
+        reducidos = valores.astype(np.float32)
+        if np.array_equal(reducidos.astype(np.float64), valores, equal_nan=True):
+            df[col] = reducidos
+    return df
+
+
+def _mascara_igual_texto(serie: pd.Series, valor: str) -> np.ndarray:
+    """Máscara booleana (insensible a mayúsculas) de las celdas iguales a valor; los nulos no coinciden."""
+    return (serie.astype("string").str.lower() == valor.lower()).fillna(False).to_numpy(dtype=bool)
+
+
+def _anchos_columnas(df: pd.DataFrame, maximo: int = 50) -> List[int]:
+    """
+    Ancho de cada columna (texto más largo entre encabezado y valores + 2, tope maximo).
+    Se calcula sobre el DataFrame, sin recorrer las celdas ya escritas; los nulos no cuentan
+    porque se escriben como celdas vacías.
+    """
+    largos_encabezado = df.columns.astype(str).str.len().to_numpy(dtype=np.int64)
+    if len(df):
+        largos_valores = (
+            df.apply(lambda serie: serie.dropna().astype(str).str.len().max())
+            .fillna(0)
+            .to_numpy(dtype=np.int64)
+        )
+    else:
+        largos_valores = np.zeros(len(largos_encabezado), dtype=np.int64)
+    return np.minimum(np.maximum(largos_encabezado, largos_valores) + 2, maximo).tolist()
+
+
+def _agrupar_monetario_por_barra(df: pd.DataFrame, columna_barra, columna_monetario) -> pd.DataFrame:
+    """Tabla Barra / Monetario con la suma de monetario por barra (caso sin filtros)."""
+    print("  Agrupando por barra y sumando valores monetarios")
+    agrupado = df.groupby(columna_barra)[columna_monetario].sum().reset_index()
+    agrupado.columns = ["Barra", "Monetario"]
+    return agrupado
+
+
+def _total_monetario(serie: pd.Series) -> float:
+    """Suma de una columna monetaria ignorando nulos (y textos no numéricos) en una sola pasada."""
+    if pd.api.types.is_float_dtype(serie.dtype):
+        return float(np.nansum(serie.to_numpy(dtype=np.float64, na_value=np.nan)))
+    valores = pd.to_numeric(serie, errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+    return float(np.nansum(valores))
+
+
+def _filas_para_excel(df: pd.DataFrame) -> Iterator[tuple]:
+    """Filas del DataFrame como tuplas para ws.append; los nulos (NaN/NaT) quedan como celdas vacías."""
+    return df.astype(object).where(df.notna(), None).itertuples(index=False, name=None)
+
+
+def _escribir_tabla_xlsxwriter(ruta: Path, nombre_hoja: str, df: pd.DataFrame) -> None:
+    """Igual que _escribir_tabla_libro_nuevo, escribiendo con xlsxwriter fila a fila (constant_memory)."""
+    import xlsxwriter
+
+    encabezados = list(df.columns)
+    print(
+        "  Guardando "
+        f"{len(encabezados)} columnas: "
+        f"{', '.join([str(col) for col in encabezados[:15]])}..."
+    )
+    wb = xlsxwriter.Workbook(str(ruta), {"constant_memory": True, "nan_inf_to_errors": True})
+    try:
+        ws = wb.add_worksheet(nombre_hoja)
+        for j, ancho in enumerate(_anchos_columnas(df)):
+            ws.set_column(j, j, ancho)
+
+        formato_encabezado = wb.add_format({"bold": True, "bg_color": "#366092", "font_color": "#FFFFFF"})
+        formato_fecha = wb.add_format({"num_format": "yyyy-mm-dd h:mm:ss"})
+        ws.write_row(0, 0, encabezados, formato_encabezado)
+
+        print(f"  Escribiendo {len(df)} filas con todas las columnas...")
+        for i, fila in enumerate(_filas_para_excel(df), start=1):
+            for j, valor in enumerate(fila):
+                if valor is None:
+                    continue
+                if isinstance(valor, (datetime, date)):
+                    ws.write_datetime(i, j, valor, formato_fecha)
+                else:
+                    ws.write(i, j, valor)
+    finally:
+        wb.close()
+
+
+def _escribir_tabla_libro_nuevo(ruta: Path, nombre_hoja: str, df: pd.DataFrame) -> None:
+    """
+    Crea un libro nuevo con df en la hoja nombre_hoja. Usa xlsxwriter (constant_memory) si
+    está instalado y, si no, openpyxl en modo write_only: en ambos casos las filas se
+    escriben en streaming y no quedan objetos Cell en memoria.
+    """
+    if _HAY_XLSXWRITER:
+        _escribir_tabla_xlsxwriter(ruta, nombre_hoja, df)
+        return
+
+    from openpyxl.cell import WriteOnlyCell
+
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet(nombre_hoja)
+
+    # En write_only los anchos deben fijarse antes de la primera fila
+    for idx, ancho in enumerate(_anchos_columnas(df), 1):
+        ws.column_dimensions[get_column_letter(idx)].width = ancho
+
+    encabezados = list(df.columns)
+    print(
+        "  Guardando "
+        f"{len(encabezados)} columnas: "
+        f"{', '.join([str(col) for col in encabezados[:15]])}..."
+    )
+    fila_encabezados = []
+    for col in encabezados:
+        celda = WriteOnlyCell(ws, value=col)
+        celda.fill = _HEADER_FILL
+        celda.font = _HEADER_FONT
+        fila_encabezados.append(celda)
+    ws.append(fila_encabezados)
+
+    print(f"  Escribiendo {len(df)} filas con todas las columnas...")
+    for r in _filas_para_excel(df):
+        ws.append(r)
+
+    wb.save(ruta)
+    wb.close()
+
+
 class LectorBalance:
     """
     Clase para leer y acceder a datos del archivo Balance de PLABACOM.
@@ -1888,6 +2571,23 @@ class LectorBalance:
 
         self._hojas = None
         self._wb = None
+        self._xl = None
+
+    def _libro_pandas(self) -> pd.ExcelFile:
+        """pd.ExcelFile del Balance, abierto una sola vez y compartido por todas las lecturas de hojas."""
+        if self._xl is None:
+            self._xl = pd.ExcelFile(self.ruta_archivo, engine=_motor_excel(self.ruta_archivo))
+        return self._xl
+
+    def cerrar(self) -> None:
+        """
+        Libera el archivo Balance abierto por leer_hoja / leer_balance_valorizado y los libros
+        en caché que dejaron abiertos leer_celda / leer_rango (en Windows bloquean el archivo).
+        """
+        if self._xl is not None:
+            self._xl.close()
+            self._xl = None
+        _cerrar_libros_de(self.ruta_archivo)
 
     def obtener_hojas(self) -> List[str]:
         """Obtiene la lista de hojas disponibles."""
@@ -1906,7 +2606,7 @@ class LectorBalance:
         Returns:
             DataFrame con los datos de la hoja
         """
-        return leer_excel_pandas(self.ruta_archivo, hoja=nombre_hoja, header=header)
+        return self._libro_pandas().parse(sheet_name=nombre_hoja, header=header)
 
     def leer_celda(self, hoja: str, celda: str):
         """
@@ -1945,23 +2645,22 @@ class LectorBalance:
         Returns:
             Número de fila que contiene los encabezados, None si no se encuentra
         """
-        # Leer las primeras filas sin encabezados para buscar manualmente
-        df_temp = leer_excel_pandas(self.ruta_archivo, hoja=nombre_hoja, header=None)
-
-        # Buscar en las primeras filas
-        for fila_idx in range(min(max_filas, len(df_temp))):
-            fila = df_temp.iloc[fila_idx]
-            # Convertir la fila a strings y buscar 'barra' y 'monetario' (insensible a mayúsculas)
-            valores_fila = [str(val).lower() if val is not None else "" for val in fila.values]
+        # Leer solo las primeras filas sin encabezados para buscar manualmente
+        df_temp = self._libro_pandas().parse(sheet_name=nombre_hoja, header=None, nrows=max_filas)
+        if df_temp.empty:
+            return None
 
-            tiene_barra = any("barra" in str(val).lower() for val in valores_fila)
-            tiene_monetario = any("monetario" in str(val).lower() for val in valores_fila)
+        # Buscar 'barra' y 'monetario' (insensible a mayúsculas): cada fila se une en un solo
+        # texto en mayúsculas y se hacen dos búsquedas por fila en vez de dos por celda
+        filas = _unir_filas_mayusculas(df_temp.to_numpy(dtype=object))
+        ambos = (np.char.find(filas, "BARRA") >= 0) & (np.char.find(filas, "MONETARIO") >= 0)
 
-            if tiene_barra and tiene_monetario:
-                print(f"[OK] Encabezados detectados en la fila {fila_idx}")
-                return fila_idx
+        fila_idx = int(np.argmax(ambos))
+        if not ambos[fila_idx]:
+            return None
 
-        return None
+        print(f"[OK] Encabezados detectados en la fila {fila_idx}")
+        return fila_idx
 
     def leer_balance_valorizado(self, header: Optional[int] = None) -> pd.DataFrame:
         """
@@ -2023,7 +2722,15 @@ class LectorBalance:
             print("[WARNING] No se encontró la columna 'monetario' en los encabezados")
             print(f"  Columnas disponibles: {', '.join([str(col) for col in df.columns[:10]])}...")
 
-        return df
+        return _reducir_flotantes_sin_perdida(df)
+
+    @staticmethod
+    def _mapa_columnas(df: pd.DataFrame) -> Dict[str, object]:
+        """Columnas del DataFrame indexadas por nombre en minúsculas (gana la primera si se repite)."""
+        mapa: Dict[str, object] = {}
+        for col in df.columns:
+            mapa.setdefault(str(col).lower(), col)
+        return mapa
 
     def obtener_columna(self, df: pd.DataFrame, nombre_columna: str, mostrar_todos: bool = True) -> pd.Series:
         """
@@ -2038,11 +2745,7 @@ class LectorBalance:
             Serie con los valores de la columna
         """
         # Buscar la columna (insensible a mayúsculas)
-        columna_encontrada = None
-        for col in df.columns:
-            if str(col).lower() == nombre_columna.lower():
-                columna_encontrada = col
-                break
+        columna_encontrada = self._mapa_columnas(df).get(nombre_columna.lower())
 
         if columna_encontrada is None:
             print(f"[ERROR] La columna '{nombre_columna}' no se encontró")
@@ -2055,8 +2758,8 @@ class LectorBalance:
         if mostrar_todos:
             print(f"\nTodos los elementos de la columna '{columna_encontrada}':")
             print("=" * 60)
-            for idx, valor in enumerate(serie, start=1):
-                print(f"{idx:4d}. {valor}")
+            if len(serie):
+                print("\n".join(f"{idx:4d}. {valor}" for idx, valor in enumerate(serie.to_numpy(), start=1)))
             print("=" * 60)
             print(f"\nTotal de elementos: {len(serie)}")
             print(f"Valores no nulos: {serie.notna().sum()}")
@@ -2078,12 +2781,9 @@ class LectorBalance:
         Returns:
             DataFrame filtrado con los registros de esa barra
         """
-        # Buscar la columna "barra" (insensible a mayúsculas)
-        columna_barra = None
-        for col in df.columns:
-            if str(col).lower() == "barra":
-                columna_barra = col
-                break
+        # Buscar las columnas "barra" y "monetario" (insensible a mayúsculas)
+        mapa_columnas = self._mapa_columnas(df)
+        columna_barra = mapa_columnas.get("barra")
 
         if columna_barra is None:
             print("[ERROR] La columna 'barra' no se encontró en el DataFrame")
@@ -2102,19 +2802,14 @@ class LectorBalance:
             print(f"  Algunas barras disponibles: {', '.join([str(b) for b in barras_unicas])}...")
             return df_filtrado
 
-        # Buscar la columna "monetario"
-        columna_monetario = None
-        for col in df.columns:
-            if str(col).lower() == "monetario":
-                columna_monetario = col
-                break
+        columna_monetario = mapa_columnas.get("monetario")
 
         if columna_monetario:
             print(f"\nValores monetarios para la barra '{nombre_barra}':")
             print("=" * 60)
             valores_monetarios = df_filtrado[columna_monetario]
-            for idx, (index_row, valor) in enumerate(valores_monetarios.items(), start=1):
-                print(f"{idx:4d}. {valor}")
+            # Una sola escritura a stdout en vez de un print por fila.
+            print("\n".join(f"{idx:4d}. {valor}" for idx, valor in enumerate(valores_monetarios.to_numpy(), start=1)))
             print("=" * 60)
 
             # Estadísticas
@@ -2166,18 +2861,10 @@ class LectorBalance:
             print(f"  Hoja: {nombre_hoja}")
 
             # Buscar columnas necesarias
-            columna_barra = None
-            columna_monetario = None
-            columna_empresa = None
-
-            for col in df_balance.columns:
-                col_lower = str(col).lower()
-                if col_lower == "barra":
-                    columna_barra = col
-                elif col_lower == "monetario":
-                    columna_monetario = col
-                elif col_lower == "nombre_corto_empresa" or col_lower == "nombre corto empresa":
-                    columna_empresa = col
+            mapa_columnas = self._mapa_columnas(df_balance)
+            columna_barra = mapa_columnas.get("barra")
+            columna_monetario = mapa_columnas.get("monetario")
+            columna_empresa = mapa_columnas.get("nombre_corto_empresa", mapa_columnas.get("nombre corto empresa"))
 
             if not columna_barra or not columna_monetario:
                 print("[ERROR] No se encontraron las columnas 'barra' o 'monetario'")
@@ -2185,8 +2872,9 @@ class LectorBalance:
 
             # Preparar datos
             if nombre_barra or nombre_empresa:
-                # Filtrar por barra y/o empresa - guardar TODAS las columnas de las filas filtradas
-                df_guardar = df_balance.copy()
+                # Filtrar por barra y/o empresa - guardar TODAS las columnas de las filas filtradas.
+                # Se combina una sola máscara y se indexa al final: sin copiar el DataFrame completo.
+                mascara = np.ones(len(df_balance), dtype=bool)
 
                 # Aplicar filtro de empresa si se especifica
                 if nombre_empresa:
@@ -2197,19 +2885,17 @@ class LectorBalance:
                         )
                         return False
 
-                    df_guardar = df_guardar[
-                        df_guardar[columna_empresa].astype(str).str.lower() == nombre_empresa.lower()
-                    ]
+                    mascara &= _mascara_igual_texto(df_balance[columna_empresa], nombre_empresa)
                     print(f"  Filtrando por empresa: {nombre_empresa} (columna: {columna_empresa})")
-                    print(f"  Filas después de filtrar por empresa: {len(df_guardar)}")
+                    print(f"  Filas después de filtrar por empresa: {int(mascara.sum())}")
 
                 # Aplicar filtro de barra si se especifica
                 if nombre_barra:
-                    df_guardar = df_guardar[
-                        df_guardar[columna_barra].astype(str).str.lower() == nombre_barra.lower()
-                    ]
+                    mascara &= _mascara_igual_texto(df_balance[columna_barra], nombre_barra)
                     print(f"  Filtrando por barra: {nombre_barra}")
 
+                df_guardar = df_balance.loc[mascara]
+
                 print(f"  Filas encontradas después de todos los filtros: {len(df_guardar)}")
                 print(f"  Columnas a guardar: {len(df_guardar.columns)}")
                 print(f"  Columnas: {', '.join([str(col) for col in df_guardar.columns[:15]])}...")
@@ -2219,97 +2905,87 @@ class LectorBalance:
                     print(f"  Empresa: {nombre_empresa if nombre_empresa else 'Todas'}")
                     print(f"  Barra: {nombre_barra if nombre_barra else 'Todas'}")
             else:
-                # Agrupar por barra y sumar valores monetarios
-                df_guardar = df_balance.groupby(columna_barra)[columna_monetario].sum().reset_index()
-                df_guardar.columns = ["Barra", "Monetario"]
-                print("  Agrupando por barra y sumando valores monetarios")
-
-            # Cargar o crear el archivo Excel
-            if ruta_plantilla.exists():
-                wb = load_workbook(ruta_plantilla)
-            else:
-                wb = openpyxl.Workbook()
-                # Eliminar la hoja por defecto si existe
-                if "Sheet" in wb.sheetnames:
-                    wb.remove(wb["Sheet"])
-
-            # Si la plantilla ya tiene una hoja "Resultado", escribir solo los
-            # totales en la celda correspondiente al mes, sin destruir el diseño.
-            if "Resultado" in wb.sheetnames:
-                ws_resultado = wb["Resultado"]
-                try:
-                    self._escribir_resumen_en_hoja_resultado(
-                        ws_resultado,
-                        df_guardar,
-                        nombre_mes,
-                        self.anyo,
-                        columna_monetario,
-                    )
-                    wb.save(ruta_plantilla)
-                    wb.close()
-                    print("[OK] Datos de resumen escritos en hoja 'Resultado' existente")
-                    return True
-                except Exception as e:
-                    print(
-                        "[ERROR] No se pudo escribir en hoja 'Resultado' existente: "
-                        f"{e}"
-                    )
-                    wb.close()
-                    return False
-
-            # Si no hay una hoja 'Resultado', usar el comportamiento estándar:
-            # crear/actualizar la hoja y volcar la tabla completa.
-            if nombre_hoja in wb.sheetnames:
-                ws = wb[nombre_hoja]
-                # Limpiar la hoja existente
-                ws.delete_rows(1, ws.max_row)
-                print(f"  Hoja '{nombre_hoja}' ya existe, actualizando...")
-            else:
-                ws = wb.create_sheet(nombre_hoja)
+                # Sin filtros la tabla es la suma por barra. Se agrupa solo si hay que volcarla:
+                # la hoja 'Resultado' de una plantilla existente solo usa el total.
+                df_guardar = None
+
+            # Plantilla nueva: libro write_only, las filas se escriben en streaming sin
+            # mantener un objeto Cell por celda en memoria.
+            if not ruta_plantilla.exists():
+                if df_guardar is None:
+                    df_guardar = _agrupar_monetario_por_barra(df_balance, columna_barra, columna_monetario)
                 print(f"  Creando nueva hoja '{nombre_hoja}'")
+                _escribir_tabla_libro_nuevo(ruta_plantilla, nombre_hoja, df_guardar)
+            else:
+                wb = load_workbook(ruta_plantilla)
 
-            # Escribir encabezados
-            encabezados = list(df_guardar.columns)
-            print(
-                "  Guardando "
-                f"{len(encabezados)} columnas: "
-                f"{', '.join([str(col) for col in encabezados[:15]])}..."
-            )
-            ws.append(encabezados)
-
-            # Formatear encabezados
-            from openpyxl.styles import Font, PatternFill
-
-            header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-            header_font = Font(bold=True, color="FFFFFF")
-
-            for cell in ws[1]:
-                cell.fill = header_fill
-                cell.font = header_font
-
-            # Escribir datos - asegurar que se escriban todas las filas y columnas
-            print(f"  Escribiendo {len(df_guardar)} filas con todas las columnas...")
-            for idx, r in enumerate(dataframe_to_rows(df_guardar, index=False, header=False), 1):
-                ws.append(r)
-                if idx % 100 == 0:
-                    print(f"    Procesadas {idx} filas...")
-
-            # Ajustar ancho de columnas
-            for column in ws.columns:
-                max_length = 0
-                column_letter = column[0].column_letter
-                for cell in column:
+                # Si la plantilla ya tiene una hoja "Resultado", escribir solo los
+                # totales en la celda correspondiente al mes, sin destruir el diseño.
+                if "Resultado" in wb.sheetnames:
+                    ws_resultado = wb["Resultado"]
                     try:
-                        if len(str(cell.value)) > max_length:
-                            max_length = len(str(cell.value))
-                    except Exception:
-                        pass
-                adjusted_width = min(max_length + 2, 50)
-                ws.column_dimensions[column_letter].width = adjusted_width
-
-            # Guardar el archivo
-            wb.save(ruta_plantilla)
-            wb.close()
+                        if df_guardar is None:
+                            # Mismo total que sumar la tabla agrupada (groupby descarta barras nulas)
+                            serie_monetario = df_balance.loc[df_balance[columna_barra].notna(), columna_monetario]
+                        else:
+                            serie_monetario = df_guardar[columna_monetario]
+                        self._escribir_resumen_en_hoja_resultado(
+                            ws_resultado,
+                            _total_monetario(serie_monetario),
+                            nombre_mes,
+                            self.anyo,
+                        )
+                        wb.save(ruta_plantilla)
+                        wb.close()
+                        print("[OK] Datos de resumen escritos en hoja 'Resultado' existente")
+                        return True
+                    except Exception as e:
+                        print(
+                            "[ERROR] No se pudo escribir en hoja 'Resultado' existente: "
+                            f"{e}"
+                        )
+                        wb.close()
+                        return False
+
+                # Si no hay una hoja 'Resultado', usar el comportamiento estándar:
+                # crear/actualizar la hoja y volcar la tabla completa.
+                if df_guardar is None:
+                    df_guardar = _agrupar_monetario_por_barra(df_balance, columna_barra, columna_monetario)
+                if nombre_hoja in wb.sheetnames:
+                    ws = wb[nombre_hoja]
+                    # Limpiar la hoja existente
+                    ws.delete_rows(1, ws.max_row)
+                    print(f"  Hoja '{nombre_hoja}' ya existe, actualizando...")
+                else:
+                    ws = wb.create_sheet(nombre_hoja)
+                    print(f"  Creando nueva hoja '{nombre_hoja}'")
+
+                # Escribir encabezados
+                encabezados = list(df_guardar.columns)
+                print(
+                    "  Guardando "
+                    f"{len(encabezados)} columnas: "
+                    f"{', '.join([str(col) for col in encabezados[:15]])}..."
+                )
+                ws.append(encabezados)
+
+                # Formatear encabezados
+                for cell in ws[1]:
+                    cell.fill = _HEADER_FILL
+                    cell.font = _HEADER_FONT
+
+                # Escribir datos - asegurar que se escriban todas las filas y columnas
+                print(f"  Escribiendo {len(df_guardar)} filas con todas las columnas...")
+                for r in _filas_para_excel(df_guardar):
+                    ws.append(r)
+
+                # Ajustar ancho de columnas (calculado desde el DataFrame, sin recorrer celdas)
+                for idx, ancho in enumerate(_anchos_columnas(df_guardar), 1):
+                    ws.column_dimensions[get_column_letter(idx)].width = ancho
+
+                # Guardar el archivo
+                wb.save(ruta_plantilla)
+                wb.close()
 
             print("[OK] Datos guardados exitosamente")
             print(f"  Total de filas escritas: {len(df_guardar)}")
@@ -2339,64 +3015,52 @@ class LectorBalance:
     def _escribir_resumen_en_hoja_resultado(
         self,
         ws,
-        df_guardar: pd.DataFrame,
+        total_monetario: float,
         nombre_mes: str,
         anyo: int,
-        columna_monetario,
     ) -> None:
         """
-        Escribe el total monetario del DataFrame en la hoja 'Resultado' de una
-        plantilla existente, en la intersección:
+        Escribe total_monetario en la hoja 'Resultado' de una plantilla existente,
+        en la intersección:
         - Fila del concepto "TOTAL INGRESOS POR POTENCIA FIRME CLP"
         - Columna del mes/año correspondiente (por ejemplo, 'ene-25').
         """
-        # Calcular total monetario del DataFrame filtrado/agrupado
-        total_monetario = (
-            df_guardar[columna_monetario].dropna().astype(float).sum()
-        )
         print(f"  Total monetario a escribir en plantilla: {total_monetario:,.2f}")
 
         # Construir encabezado de mes esperado (ej: 'ene-25')
-        meses_abrev = {
-            1: "ene",
-            2: "feb",
-            3: "mar",
-            4: "abr",
-            5: "may",
-            6: "jun",
-            7: "jul",
-            8: "ago",
-            9: "sep",
-            10: "oct",
-            11: "nov",
-            12: "dic",
-        }
-        encabezado_mes = f"{meses_abrev[self.mes]}-{str(anyo)[-2:]}"
+        encabezado_mes = f"{_MES_ABREV[self.mes]}-{str(anyo)[-2:]}"
         print(f"  Buscando columna de mes con encabezado: '{encabezado_mes}'")
 
-        # 1) Encontrar columna del mes en las primeras filas (típicamente fila de encabezados)
+        # 1) Encontrar columna del mes en las primeras filas (típicamente fila de encabezados).
+        # Se leen solo los valores (sin objetos Cell) y el texto se compara en bloque con np.char.
         col_mes_idx = None
         fila_encabezados_max = 15
-        for fila in ws.iter_rows(min_row=1, max_row=fila_encabezados_max):
-            for cell in fila:
-                raw = cell.value
-                # Encabezado como fecha real (p.ej. 01-12-2025)
+        valores_encabezado = np.array(
+            list(ws.iter_rows(min_row=1, max_row=fila_encabezados_max, values_only=True)),
+            dtype=object,
+        )
+        if valores_encabezado.ndim == 2 and valores_encabezado.size:
+            # Encabezado como fecha real (p.ej. 01-12-2025): solo esas celdas se revisan en Python
+            es_fecha = np.zeros(valores_encabezado.shape, dtype=bool)
+            es_mes = np.zeros(valores_encabezado.shape, dtype=bool)
+            for (r, c), raw in np.ndenumerate(valores_encabezado):
                 if isinstance(raw, (datetime, date)):
-                    if raw.year == anyo and raw.month == self.mes:
-                        col_mes_idx = cell.column
-                        print(f"  Columna de mes (fecha) encontrada en {cell.coordinate}: {raw}")
-                        break
-                # Encabezado como texto
+                    es_fecha[r, c] = True
+                    es_mes[r, c] = raw.year == anyo and raw.month == self.mes
+            # Encabezado como texto: coincidencia flexible, empieza con el texto del mes
+            # (por si hay sufijos como ' CLP')
+            textos = np.char.lower(np.char.strip(valores_encabezado.astype(str)))
+            es_mes |= ~es_fecha & np.char.startswith(textos, encabezado_mes.lower())
+
+            if es_mes.any():
+                r, c = np.unravel_index(int(np.argmax(es_mes)), es_mes.shape)
+                raw = valores_encabezado[r, c]
+                col_mes_idx = int(c) + 1
+                coordenada = f"{get_column_letter(col_mes_idx)}{int(r) + 1}"
+                if isinstance(raw, (datetime, date)):
+                    print(f"  Columna de mes (fecha) encontrada en {coordenada}: {raw}")
                 else:
-                    valor = str(raw).strip()
-                    valor_norm = valor.lower()
-                    # Coincidencia flexible: empieza con el texto del mes (por si hay sufijos como ' CLP')
-                    if valor_norm.startswith(encabezado_mes.lower()):
-                        col_mes_idx = cell.column
-                        print(f"  Columna de mes (texto) encontrada en {cell.coordinate}: {valor}")
-                        break
-            if col_mes_idx is not None:
-                break
+                    print(f"  Columna de mes (texto) encontrada en {coordenada}: {str(raw).strip()}")
 
         if col_mes_idx is None:
             # Si no existe la columna, crear una nueva al final de la fila de encabezados
@@ -2404,12 +3068,11 @@ class LectorBalance:
                 f"  No se encontró columna para el mes '{encabezado_mes}'. "
                 "Se creará una nueva columna de mes."
             )
-            # Buscar la primera fila de encabezados no vacía
+            # Buscar la primera fila de encabezados no vacía (al menos una celda con valor)
             encabezado_row = None
-            for fila in ws.iter_rows(min_row=1, max_row=fila_encabezados_max):
-                # Considerar fila encabezado si tiene al menos una celda no vacía
-                if any(c.value not in (None, "") for c in fila):
-                    encabezado_row = fila[0].row
+            for r, fila in enumerate(valores_encabezado, start=1):
+                if any(v is not None and v != "" for v in fila):
+                    encabezado_row = r
                     break
 
             if encabezado_row is None:
@@ -2428,19 +3091,54 @@ class LectorBalance:
         # 2) Encontrar fila del concepto "TOTAL INGRESOS POR POTENCIA FIRME CLP"
         texto_concepto = "TOTAL INGRESOS POR POTENCIA FIRME CLP"
         fila_concepto_idx = None
-        fila_busqueda_max = ws.max_row
-
-        for row in ws.iter_rows(min_row=1, max_row=fila_busqueda_max):
-            for cell in row:
-                valor = str(cell.value).strip().upper() if cell.value is not None else ""
-                # Coincidencia flexible: que contenga el texto del concepto
-                if texto_concepto in valor:
-                    fila_concepto_idx = cell.row
-                    print(f"  Fila de concepto encontrada en {cell.coordinate}")
+
+        # Las columnas A-D se leen en streaming hasta una racha de filas vacías: los conceptos
+        # están arriba y ws.max_row puede ser enorme en plantillas con formato arrastrado.
+        filas_vacias_max = 50
+        filas_ad = []
+        vacias = 0
+        for fila in ws.iter_rows(min_row=1, max_col=4, values_only=True):
+            filas_ad.append(fila)
+            if any(v is not None and v != "" for v in fila):
+                vacias = 0
+            else:
+                vacias += 1
+                if vacias > filas_vacias_max:
                     break
-            if fila_concepto_idx is not None:
+
+        # Primero solo las columnas B, A, C, D (donde las plantillas ponen los conceptos, mismo
+        # orden que plantilla_cliente), cada una con una búsqueda vectorizada sobre la columna.
+        columnas_concepto = list(zip(*filas_ad))
+        for col in (2, 1, 3, 4):
+            if col > len(columnas_concepto):
+                continue
+            textos = pd.Series(columnas_concepto[col - 1], dtype=object).dropna().astype(str).str.upper()
+            hits = textos.index[textos.str.contains(texto_concepto, regex=False).to_numpy(dtype=bool)]
+            if len(hits):
+                fila_concepto_idx = int(hits[0]) + 1
+                print(f"  Fila de concepto encontrada en {get_column_letter(col)}{fila_concepto_idx}")
                 break
 
+        # Si no está en A-D, buscar en la hoja completa con una pasada vectorizada. La racha de
+        # vacías solo vale para A-D: un concepto en E o más allá puede estar debajo de ella
+        valores = None
+        if fila_concepto_idx is None:
+            valores = np.array(
+                [
+                    ["" if v is None else str(v) for v in fila]
+                    for fila in ws.iter_rows(min_row=1, max_row=ws.max_row, values_only=True)
+                ],
+                dtype=object,
+            )
+        if valores is not None and valores.ndim == 2 and valores.size:
+            coincidencias = np.char.find(np.char.upper(valores.astype(str)), texto_concepto) >= 0
+            filas_con_concepto = coincidencias.any(axis=1)
+            if filas_con_concepto.any():
+                fila_idx = int(np.argmax(filas_con_concepto))
+                col_idx = int(np.argmax(coincidencias[fila_idx]))
+                fila_concepto_idx = fila_idx + 1
+                print(f"  Fila de concepto encontrada en {get_column_letter(col_idx + 1)}{fila_concepto_idx}")
+
         if fila_concepto_idx is None:
             raise ValueError(
                 f"No se encontró la fila con el concepto '{texto_concepto}' en la hoja Resultado"
@@ -2456,6 +3154,11 @@ class LectorBalance:
 
 
 if __name__ == "__main__":
+    import sys
+
+    # Mensajes de los buscadores por consola con el mismo prefijo [NIVEL] que los print
+    logging.basicConfig(level=logging.INFO, format="[%(levelname)s] %(message)s", stream=sys.stdout)
+
     # Ejemplo de uso básico
     try:
         lector = LectorBalance(2025, 12)
@@ -11,10 +11,12 @@ import time
 from copy import copy
 from datetime import datetime, date
 from pathlib import Path
-from typing import List, Tuple, Union
+from typing import List, Optional, Tuple, Union
 
 # Constante Excel: pegar solo formatos (evita copiar fechas/valores indeseados)
 XL_PASTE_FORMATS = -4122
+# Constante Excel: cálculo manual (xlCalculationManual)
+XL_CALCULATION_MANUAL = -4135
 
 # Variantes de nombres que pueden aparecer en plantillas de clientes.
 # ATENCIÓN: INGRESOS POR POTENCIA, INGRESOS POR IT POTENCIA y TOTAL INGRESOS POR POTENCIA FIRME CLP
@@ -46,6 +48,126 @@ EXCLUIR_AL_BUSCAR = {
 }
 
 
+# Abreviatura por número de mes (índice 0 vacío)
+_MESES_ABREV = ("", "ene", "feb", "mar", "abr", "may", "jun", "jul", "ago", "sep", "oct", "nov", "dic")
+# Encabezado de columna de mes en texto (ej: "dic-25", "Dic 2025")
+_PATRON_MES = re.compile(r"^(ene|feb|mar|abr|may|jun|jul|ago|sep|oct|nov|dic)[\s\-]*\d{2,4}$", re.I)
+
+
+def _valores_rango_com(ws, fila_fin: int, col_fin: int, fila_ini: int = 1, col_ini: int = 1) -> List[tuple]:
+    """
+    Valores de un rango de la hoja en una sola llamada COM (Range.Value), como lista de filas.
+    Leer celda a celda con ws.Cells(r, c).Value es un viaje de ida y vuelta a Excel por celda.
+    """
+    valores = ws.Range(ws.Cells(fila_ini, col_ini), ws.Cells(fila_fin, col_fin)).Value
+    if not isinstance(valores, tuple):
+        # Rango de una sola celda: COM devuelve el valor directamente
+        return [(valores,)]
+    return [fila if isinstance(fila, tuple) else (fila,) for fila in valores]
+
+
+def _columna_mes_en_bloque(bloque: List[tuple], anyo: int, mes: int) -> Optional[int]:
+    """Columna (1-based) cuyo encabezado corresponde a mes/anyo: fecha o texto 'dic-25' / 'dic-2025'."""
+    encabezado_mes_2 = f"{_MESES_ABREV[mes]}-{str(anyo)[-2:]}"
+    encabezado_mes_4 = f"{_MESES_ABREV[mes]}-{anyo}"
+    for fila in bloque:
+        for c, raw in enumerate(fila, start=1):
+            if raw is None:
+                continue
+            if isinstance(raw, (datetime, date)):
+                if raw.year == anyo and raw.month == mes:
+                    return c
+            else:
+                valor = str(raw).strip().replace(" ", "").lower()
+                if valor.startswith(encabezado_mes_2) or valor.startswith(encabezado_mes_4):
+                    return c
+    return None
+
+
+def _columnas_mes_en_fila(fila: tuple) -> List[int]:
+    """Columnas (1-based) de una fila de encabezados que ya son de algún mes (fecha o texto tipo 'dic-25')."""
+    columnas = []
+    for c, raw in enumerate(fila, start=1):
+        if raw is None:
+            continue
+        if isinstance(raw, (datetime, date)):
+            columnas.append(c)
+        elif raw and _PATRON_MES.match(str(raw).strip().replace(" ", "")):
+            columnas.append(c)
+    return columnas
+
+
+def _columna_insercion_sin_meses(bloque_ab: List[tuple]) -> int:
+    """
+    Columna donde crear la del mes cuando la plantilla no tiene ninguna: a la derecha de la
+    primera celda A/B que diga "TOTAL INGRESOS" (por defecto, la B).
+    """
+    for fila in bloque_ab:
+        for col_candidate in (1, 2):
+            raw = fila[col_candidate - 1]
+            if raw and "TOTAL INGRESOS" in str(raw).upper():
+                return col_candidate + 1
+    return 2
+
+
+def _fila_concepto_en_bloque(bloque: List[tuple], texto_concepto: str) -> Optional[int]:
+    """
+    Fila (1-based) del concepto en un bloque con las columnas A-D de la hoja.
+    Prueba el texto y sus variantes, buscando en las columnas B, A, C, D en ese orden.
+    """
+    textos_a_buscar = [texto_concepto] + VARIANTES_CONCEPTOS.get(texto_concepto, [])
+    excluir = [ex.upper() for ex in EXCLUIR_AL_BUSCAR.get(texto_concepto, [])]
+
+    for texto_buscar in textos_a_buscar:
+        texto_upper = texto_buscar.upper()
+        for col_concepto in (2, 1, 3, 4):  # B, A, C, D
+            for r, fila in enumerate(bloque, start=1):
+                raw = fila[col_concepto - 1]
+                if raw is None:
+                    continue
+                val = str(raw).strip().upper()
+                if texto_upper in val and not any(ex in val for ex in excluir):
+                    return r
+    return None
+
+
+def _suspender_excel(excel) -> Optional[int]:
+    """
+    Desactiva repintado, eventos, alertas y recálculo mientras se modifica la plantilla.
+    Devuelve el modo de cálculo previo (None si no se pudo cambiar). Llamar con un libro
+    abierto: Excel no permite cambiar Calculation sin libros.
+    """
+    excel.ScreenUpdating = False
+    excel.EnableEvents = False
+    excel.DisplayAlerts = False
+    try:
+        calculo_previo = excel.Calculation
+        excel.Calculation = XL_CALCULATION_MANUAL
+        return calculo_previo
+    except Exception:
+        return None
+
+
+def _restaurar_calculo(excel, calculo_previo: Optional[int]) -> None:
+    """Vuelve al modo de cálculo previo (antes de guardar, para no dejar la plantilla en manual)."""
+    if calculo_previo is None:
+        return
+    try:
+        excel.Calculation = calculo_previo
+    except Exception:
+        pass
+
+
+def _restaurar_excel(excel, calculo_previo: Optional[int]) -> None:
+    """Deshace _suspender_excel; cada ajuste por separado para que un fallo no impida el Quit."""
+    _restaurar_calculo(excel, calculo_previo)
+    for atributo in ("ScreenUpdating", "EnableEvents", "DisplayAlerts"):
+        try:
+            setattr(excel, atributo, True)
+        except Exception:
+            pass
+
+
 def _ruta_local_para_excel(ruta: Path) -> Tuple[Path, bool]:
     """
     Retorna (ruta_a_usar, usar_temp).
@@ -94,9 +216,11 @@ def _escribir_con_win32(
     excel = win32.DispatchEx("Excel.Application")
     excel.Visible = False
     excel.DisplayAlerts = False  # Evitar diálogos de Excel que pueden bloquear
+    calculo_previo = None
 
     try:
         wb = excel.Workbooks.Open(ruta_abrir)
+        calculo_previo = _suspender_excel(excel)
         ws_resultado = None
         for sh in wb.Worksheets:
             if str(sh.Name).strip().lower() == "resultado":
@@ -112,63 +236,33 @@ def _escribir_con_win32(
         max_row = max(used_range.Rows.Count, 50) + 20
         max_col = max(used_range.Columns.Count, 30)
 
-        meses_abrev = {
-            1: "ene", 2: "feb", 3: "mar", 4: "abr", 5: "may", 6: "jun",
-            7: "jul", 8: "ago", 9: "sep", 10: "oct", 11: "nov", 12: "dic",
-        }
-        encabezado_mes_2 = f"{meses_abrev[mes]}-{str(anyo)[-2:]}"
-        encabezado_mes_4 = f"{meses_abrev[mes]}-{anyo}"
-
-        col_mes = None
         fila_encabezados_max = min(15, max_row)
 
-        for r in range(1, fila_encabezados_max + 1):
-            for c in range(1, max_col + 1):
-                raw = ws.Cells(r, c).Value
-                if raw is None:
-                    continue
-                if isinstance(raw, (datetime, date)):
-                    if raw.year == anyo and raw.month == mes:
-                        col_mes = c
-                        break
-                else:
-                    valor = str(raw).strip().replace(" ", "").lower()
-                    if valor.startswith(encabezado_mes_2.lower()) or valor.startswith(encabezado_mes_4.lower()):
-                        col_mes = c
-                        break
-            if col_mes is not None:
-                break
+        # Zona de encabezados en una sola lectura COM
+        bloque_encabezados = _valores_rango_com(ws, fila_encabezados_max, max_col)
+        col_mes = _columna_mes_en_bloque(bloque_encabezados, anyo, mes)
 
         if col_mes is None:
-            encabezado_row = None
-            for r in range(1, fila_encabezados_max + 1):
-                if any(ws.Cells(r, c).Value is not None for c in range(1, max_col + 1)):
-                    encabezado_row = r
-                    break
+            encabezado_row = next(
+                (r for r, fila in enumerate(bloque_encabezados, start=1) if any(v is not None for v in fila)),
+                None,
+            )
             if encabezado_row is None:
                 excel.Quit()
                 raise RuntimeError("No pude determinar la fila de encabezados.")
 
-            patron_mes = re.compile(
-                r"^(ene|feb|mar|abr|may|jun|jul|ago|sep|oct|nov|dic)[\s\-]*\d{2,4}$",
-                re.I,
-            )
-            columnas_mes = []
-            for c in range(1, max_col + 1):
-                raw = ws.Cells(encabezado_row, c).Value
-                if raw is None:
-                    continue
-                if isinstance(raw, (datetime, date)):
-                    columnas_mes.append(c)
-                elif raw and patron_mes.match(str(raw).strip().replace(" ", "")):
-                    columnas_mes.append(c)
+            # La fila de encabezados ya está en el bloque leído: sin más llamadas COM
+            columnas_mes = _columnas_mes_en_fila(bloque_encabezados[encabezado_row - 1])
 
             if columnas_mes:
                 base_col = max(columnas_mes)
                 new_col = base_col + 1
                 ws.Columns(new_col).Insert(Shift=0)
-                ws.Columns(base_col).Copy()
-                ws.Columns(new_col).PasteSpecial(Paste=XL_PASTE_FORMATS)
+                # Copiar formatos solo del rango usado: la columna completa son 1.048.576 filas
+                rng_origen = ws.Range(ws.Cells(1, base_col), ws.Cells(max_row, base_col))
+                rng_dest = ws.Range(ws.Cells(1, new_col), ws.Cells(max_row, new_col))
+                rng_origen.Copy()
+                rng_dest.PasteSpecial(Paste=XL_PASTE_FORMATS)
                 excel.CutCopyMode = False
                 header_cell = ws.Cells(encabezado_row, new_col)
                 header_cell.Value = datetime(anyo, mes, 1)
@@ -179,17 +273,7 @@ def _escribir_con_win32(
                 except Exception:
                     pass
             else:
-                col_donde_insertar = 2
-                for r in range(1, min(max_row + 1, 100)):
-                    for col_candidate in (1, 2):
-                        raw = ws.Cells(r, col_candidate).Value
-                        if raw and "TOTAL INGRESOS" in str(raw).upper():
-                            col_donde_insertar = col_candidate + 1
-                            break
-                    else:
-                        continue
-                    break
-                new_col = col_donde_insertar
+                new_col = _columna_insercion_sin_meses(_valores_rango_com(ws, min(max_row, 99), 2))
                 ws.Columns(new_col).Insert(Shift=0)
                 header_cell = ws.Cells(encabezado_row, new_col)
                 header_cell.Value = datetime(anyo, mes, 1)
@@ -197,31 +281,8 @@ def _escribir_con_win32(
 
             col_mes = new_col
 
-        fila_concepto = None
-        textos_a_buscar = [texto_concepto] + VARIANTES_CONCEPTOS.get(texto_concepto, [])
-        excluir = EXCLUIR_AL_BUSCAR.get(texto_concepto, [])
-
-        def _celda_valida(val: str) -> bool:
-            val_upper = val.upper()
-            if any(ex.upper() in val_upper for ex in excluir):
-                return False
-            return True
-
-        for texto_buscar in textos_a_buscar:
-            texto_upper = texto_buscar.upper()
-            for col_concepto in (2, 1, 3, 4):  # B, A, C, D
-                for r in range(1, max_row + 1):
-                    raw = ws.Cells(r, col_concepto).Value
-                    if raw is None:
-                        continue
-                    val = str(raw).strip().upper()
-                    if texto_upper in val and _celda_valida(val):
-                        fila_concepto = r
-                        break
-                if fila_concepto is not None:
-                    break
-            if fila_concepto is not None:
-                break
+        # Columnas A-D en una sola lectura COM (después de insertar la columna del mes)
+        fila_concepto = _fila_concepto_en_bloque(_valores_rango_com(ws, max_row, 4), texto_concepto)
 
         if fila_concepto is None:
             wb.Close(SaveChanges=False)
@@ -232,15 +293,17 @@ def _escribir_con_win32(
             )
 
         ws.Cells(fila_concepto, col_mes).Value = float(total_monetario)
+        # El modo de cálculo se guarda en el libro: restaurarlo antes de guardar
+        _restaurar_calculo(excel, calculo_previo)
         wb.Save()
-        wb.Close(SaveChanges=True)
+        wb.Close(SaveChanges=False)  # ya guardado: evitar una segunda escritura
 
         # Si trabajamos en temp, copiar el resultado de vuelta al destino original
         if usar_temp:
             shutil.copy2(ruta_trabajo, ruta.resolve())
     finally:
+        _restaurar_excel(excel, calculo_previo)
         excel.Quit()
-        excel.DisplayAlerts = True
 
 
 def _escribir_con_openpyxl(
@@ -254,12 +317,6 @@ def _escribir_con_openpyxl(
     from openpyxl import load_workbook
     from openpyxl.worksheet.worksheet import Worksheet
 
-    MESES_ABREV = {
-        1: "ene", 2: "feb", 3: "mar", 4: "abr", 5: "may", 6: "jun",
-        7: "jul", 8: "ago", 9: "sep", 10: "oct", 11: "nov", 12: "dic",
-    }
-    _PATRON_MES = re.compile(r"^(ene|feb|mar|abr|may|jun|jul|ago|sep|oct|nov|dic)[\s\-]*\d{2,4}$", re.I)
-
     def _copiar_estilo(origen, destino):
         if hasattr(origen, "font") and origen.font:
             destino.font = copy(origen.font)
@@ -275,8 +332,8 @@ def _escribir_con_openpyxl(
     def _es_mes(raw, ay, mo):
         if isinstance(raw, (datetime, date)):
             return raw.year == ay and raw.month == mo
-        enc2 = f"{MESES_ABREV[mo]}-{str(ay)[-2:]}"
-        enc4 = f"{MESES_ABREV[mo]}-{ay}"
+        enc2 = f"{_MESES_ABREV[mo]}-{str(ay)[-2:]}"
+        enc4 = f"{_MESES_ABREV[mo]}-{ay}"
         val = str(raw).strip().replace(" ", "").lower()
         return val.startswith(enc2.lower()) or val.startswith(enc4.lower())
 
@@ -412,10 +469,12 @@ def _escribir_todos_con_win32(
     excel.Visible = False
     excel.DisplayAlerts = False
     excel.ScreenUpdating = False
+    calculo_previo = None
 
     try:
         # UpdateLinks=0 evita que Excel modifique enlaces; reduce corrupción de dibujos
         wb = excel.Workbooks.Open(ruta_abrir, UpdateLinks=XL_UPDATE_LINKS_NEVER)
+        calculo_previo = _suspender_excel(excel)
         ws_resultado = None
         for sh in wb.Worksheets:
             if str(sh.Name).strip().lower() == "resultado":
@@ -429,54 +488,22 @@ def _escribir_todos_con_win32(
         used_range = ws.UsedRange
         max_row = max(used_range.Rows.Count, 50) + 20
         max_col = max(used_range.Columns.Count, 30)
-        meses_abrev = {
-            1: "ene", 2: "feb", 3: "mar", 4: "abr", 5: "may", 6: "jun",
-            7: "jul", 8: "ago", 9: "sep", 10: "oct", 11: "nov", 12: "dic",
-        }
-        encabezado_mes_2 = f"{meses_abrev[mes]}-{str(anyo)[-2:]}"
-        encabezado_mes_4 = f"{meses_abrev[mes]}-{anyo}"
-        col_mes = None
         fila_encabezados_max = min(15, max_row)
 
-        for r in range(1, fila_encabezados_max + 1):
-            for c in range(1, max_col + 1):
-                raw = ws.Cells(r, c).Value
-                if raw is None:
-                    continue
-                if isinstance(raw, (datetime, date)):
-                    if raw.year == anyo and raw.month == mes:
-                        col_mes = c
-                        break
-                else:
-                    valor = str(raw).strip().replace(" ", "").lower()
-                    if valor.startswith(encabezado_mes_2.lower()) or valor.startswith(encabezado_mes_4.lower()):
-                        col_mes = c
-                        break
-            if col_mes is not None:
-                break
+        # Zona de encabezados en una sola lectura COM
+        bloque_encabezados = _valores_rango_com(ws, fila_encabezados_max, max_col)
+        col_mes = _columna_mes_en_bloque(bloque_encabezados, anyo, mes)
 
         if col_mes is None:
-            encabezado_row = None
-            for r in range(1, fila_encabezados_max + 1):
-                if any(ws.Cells(r, c).Value is not None for c in range(1, max_col + 1)):
-                    encabezado_row = r
-                    break
+            encabezado_row = next(
+                (r for r, fila in enumerate(bloque_encabezados, start=1) if any(v is not None for v in fila)),
+                None,
+            )
             if encabezado_row is None:
                 excel.Quit()
                 raise RuntimeError("No pude determinar la fila de encabezados.")
-            patron_mes = re.compile(
-                r"^(ene|feb|mar|abr|may|jun|jul|ago|sep|oct|nov|dic)[\s\-]*\d{2,4}$",
-                re.I,
-            )
-            columnas_mes = []
-            for c in range(1, max_col + 1):
-                raw = ws.Cells(encabezado_row, c).Value
-                if raw is None:
-                    continue
-                if isinstance(raw, (datetime, date)):
-                    columnas_mes.append(c)
-                elif raw and patron_mes.match(str(raw).strip().replace(" ", "")):
-                    columnas_mes.append(c)
+            # La fila de encabezados ya está en el bloque leído: sin más llamadas COM
+            columnas_mes = _columnas_mes_en_fila(bloque_encabezados[encabezado_row - 1])
             if columnas_mes:
                 base_col = max(columnas_mes)
                 new_col = base_col + 1
@@ -497,49 +524,18 @@ def _escribir_todos_con_win32(
                 except Exception:
                     pass
             else:
-                col_donde_insertar = 2
-                for r in range(1, min(max_row + 1, 100)):
-                    for col_candidate in (1, 2):
-                        raw = ws.Cells(r, col_candidate).Value
-                        if raw and "TOTAL INGRESOS" in str(raw).upper():
-                            col_donde_insertar = col_candidate + 1
-                            break
-                    else:
-                        continue
-                    break
-                new_col = col_donde_insertar
+                new_col = _columna_insercion_sin_meses(_valores_rango_com(ws, min(max_row, 99), 2))
                 ws.Columns(new_col).Insert(Shift=0)
                 header_cell = ws.Cells(encabezado_row, new_col)
                 header_cell.Value = datetime(anyo, mes, 1)
                 header_cell.NumberFormat = "mmm-yy"
             col_mes = new_col
 
+        # Columnas A-D leídas una sola vez para todos los conceptos: lo que se escribe después
+        # son números en col_mes, que nunca coinciden con el texto de un concepto.
+        bloque_conceptos = _valores_rango_com(ws, max_row, 4)
         for texto_concepto, total_monetario in pares_concepto_valor:
-            fila_concepto = None
-            textos_a_buscar = [texto_concepto] + VARIANTES_CONCEPTOS.get(texto_concepto, [])
-            excluir = EXCLUIR_AL_BUSCAR.get(texto_concepto, [])
-
-            def _celda_valida(val: str) -> bool:
-                val_upper = val.upper()
-                if any(ex.upper() in val_upper for ex in excluir):
-                    return False
-                return True
-
-            for texto_buscar in textos_a_buscar:
-                texto_upper = texto_buscar.upper()
-                for col_concepto in (2, 1, 3, 4):
-                    for r in range(1, max_row + 1):
-                        raw = ws.Cells(r, col_concepto).Value
-                        if raw is None:
-                            continue
-                        val = str(raw).strip().upper()
-                        if texto_upper in val and _celda_valida(val):
-                            fila_concepto = r
-                            break
-                    if fila_concepto is not None:
-                        break
-                if fila_concepto is not None:
-                    break
+            fila_concepto = _fila_concepto_en_bloque(bloque_conceptos, texto_concepto)
 
             if fila_concepto is None:
                 wb.Close(SaveChanges=False)
@@ -551,12 +547,13 @@ def _escribir_todos_con_win32(
 
             ws.Cells(fila_concepto, col_mes).Value = float(total_monetario)
 
+        # El modo de cálculo se guarda en el libro: restaurarlo antes de guardar
+        _restaurar_calculo(excel, calculo_previo)
         wb.Save()
-        wb.Close(SaveChanges=True)
+        wb.Close(SaveChanges=False)  # ya guardado: evitar una segunda escritura
     finally:
+        _restaurar_excel(excel, calculo_previo)
         try:
-            excel.ScreenUpdating = True
-            excel.DisplayAlerts = True
             excel.Quit()
         except Exception:
             pass
@@ -2,13 +2,33 @@
 Script de diagnóstico para inspeccionar la estructura del archivo BDef Detalle.
 Ejecutar: python debug_bdef.py
 """
+import logging
+import re
 import sys
 from pathlib import Path
 
 # Añadir el directorio del proyecto
 sys.path.insert(0, str(Path(__file__).resolve().parent))
 
-import pandas as pd
+from openpyxl import load_workbook
+
+MAX_FILAS_LISTADO = 10
+# Búsqueda amplia: una sola expresión compilada en vez de unir la fila y probar cada texto
+_RE_BUSQUEDA_AMPLIA = re.compile(r"VIENTOS|RENAICO|E[OÓ]LICA", re.IGNORECASE)
+
+
+def _texto(val, largo=None) -> str:
+    """Convierte un valor de celda a texto para imprimir (None -> '')."""
+    if val is None:
+        return ""
+    texto = str(val)
+    return texto[:largo] if largo else texto
+
+
+def _celda(row: tuple, c: int):
+    """Valor de la columna c (base 0) o None si la fila es más corta."""
+    return row[c] if c < len(row) else None
+
 
 def main():
     from core.leer_excel import encontrar_archivo_bdef_detalle
@@ -21,56 +41,77 @@ def main():
     print(f"Archivo: {ruta}")
     print("=" * 60)
 
+    wb = None
     try:
-        xl = pd.ExcelFile(ruta, engine="openpyxl")
-        print(f"Hojas: {xl.sheet_names}")
+        # read_only: lectura en streaming, sin cargar la hoja completa en memoria
+        wb = load_workbook(ruta, read_only=True, data_only=True)
+        print(f"Hojas: {wb.sheetnames}")
         print()
 
-        for nombre_hoja in xl.sheet_names:
+        for nombre_hoja in wb.sheetnames:
             if "balance" in nombre_hoja.lower() or "2" in nombre_hoja:
+                ws = wb[nombre_hoja]
                 print(f"\n--- Hoja: {nombre_hoja} ---")
-                df = pd.read_excel(ruta, sheet_name=nombre_hoja, header=None, engine="openpyxl")
-                print(f"Filas: {len(df)}, Columnas: {len(df.columns)}")
+                print(f"Filas: {ws.max_row}, Columnas: {ws.max_column}")
                 print()
 
-                # Buscar Empresa, Concepto, Pago PSUF
-                for r in range(min(20, len(df))):
-                    row = df.iloc[r]
-                    for c, val in enumerate(row):
-                        if val is None or (isinstance(val, float) and pd.isna(val)):
-                            continue
-                        v = str(val).strip().lower()
-                        if v in ("empresa", "concepto") or ("pago" in v and "psuf" in v):
-                            print(f"  Fila {r+1} Col {c}: '{val}'")
+                # Un solo recorrido de la hoja; cada sección se imprime al final
+                encabezados = []
+                primeras_filas = []
+                filas_renaico = []
+                filas_amplias = []
+                for r, row in enumerate(ws.iter_rows(values_only=True), 1):
+                    # Buscar Empresa, Concepto, Pago PSUF
+                    if r <= 20:
+                        for c, val in enumerate(row):
+                            if val is None:
+                                continue
+                            v = str(val).strip().lower()
+                            if v in ("empresa", "concepto") or ("pago" in v and "psuf" in v):
+                                encabezados.append(f"  Fila {r} Col {c}: '{val}'")
+
+                    if 12 <= r <= 16:
+                        vals = [_texto(v, 18) for v in row[16:23]]
+                        primeras_filas.append(f"  Fila Excel {r}: {vals}")
+
+                    # Buscar VIENTOS_DE_RENAICO en columna 16 (Empresa)
+                    if len(filas_renaico) < MAX_FILAS_LISTADO and len(row) > 16:
+                        emp = _texto(row[16]).strip()
+                        if "VIENTOS" in emp.upper() and "RENAICO" in emp.upper():
+                            con = _texto(_celda(row, 17), 15)
+                            psuf = _texto(_celda(row, 19))
+                            filas_renaico.append(
+                                f"  Fila {r}: Empresa='{emp}' Concepto='{con}' PagoPSUF(19)={psuf}"
+                            )
+
+                    if len(filas_amplias) <= MAX_FILAS_LISTADO:
+                        if any(isinstance(v, str) and _RE_BUSQUEDA_AMPLIA.search(v) for v in row):
+                            vals = [_texto(v, 25) for v in row[:6]]
+                            filas_amplias.append(f"  Fila {r}: {vals}")
+
+                    if (
+                        r > 20
+                        and len(filas_renaico) >= MAX_FILAS_LISTADO
+                        and len(filas_amplias) > MAX_FILAS_LISTADO
+                    ):
+                        break
+
+                for linea in encabezados:
+                    print(linea)
 
                 print("\nPrimeras 5 filas - columnas 16-22 (bloque Empresa/Concepto):")
-                for r in range(11, min(16, len(df))):
-                    row = df.iloc[r]
-                    vals = [str(row.iloc[c])[:18] if c < len(row) else "" for c in range(16, min(23, len(row)))]
-                    print(f"  Fila Excel {r+1}: {vals}")
+                for linea in primeras_filas:
+                    print(linea)
 
-                # Buscar VIENTOS_DE_RENAICO en columna 16 (Empresa)
                 print("\nFilas con VIENTOS_DE_RENAICO en col Empresa (16):")
-                for r in range(len(df)):
-                    row = df.iloc[r]
-                    if len(row) > 16:
-                        emp = str(row.iloc[16]).strip() if row.iloc[16] is not None else ""
-                        if "VIENTOS" in emp.upper() and "RENAICO" in emp.upper():
-                            con = str(row.iloc[17])[:15] if len(row) > 17 else ""
-                            psuf = row.iloc[19] if len(row) > 19 else ""
-                            print(f"  Fila {r+1}: Empresa='{emp}' Concepto='{con}' PagoPSUF(19)={psuf}")
+                for linea in filas_renaico:
+                    print(linea)
+
                 print("\nFilas que contienen 'VIENTOS' o 'RENAICO' o 'Eólica' (búsqueda amplia):")
-                count = 0
-                for r in range(len(df)):
-                    row = df.iloc[r]
-                    row_str = " ".join(str(v) for v in row if v is not None)
-                    if "VIENTOS" in row_str.upper() or "RENAICO" in row_str.upper() or "EÓLICA" in row_str.upper() or "EOLICA" in row_str.upper():
-                        vals = [str(row.iloc[c])[:25] if c < len(row) else "" for c in range(min(6, len(row)))]
-                        print(f"  Fila {r+1}: {vals}")
-                        count += 1
-                        if count >= 10:
-                            print("  ...")
-                            break
+                for linea in filas_amplias[:MAX_FILAS_LISTADO]:
+                    print(linea)
+                if len(filas_amplias) > MAX_FILAS_LISTADO:
+                    print("  ...")
 
                 break  # Solo primera hoja Balance
 
@@ -78,6 +119,11 @@ def main():
         print(f"ERROR: {e}")
         import traceback
         traceback.print_exc()
+    finally:
+        if wb is not None:
+            wb.close()
 
 if __name__ == "__main__":
+    # Mensajes de los buscadores de core.leer_excel con el mismo prefijo [NIVEL] que los print
+    logging.basicConfig(level=logging.INFO, format="[%(levelname)s] %(message)s", stream=sys.stdout)
     main()
@@ -12,7 +12,7 @@ if sys.platform == "win32":
     base = "Win32GUI"  # Sin ventana de consola
 
 build_exe_options = {
-    "packages": ["tkinter", "openpyxl", "pandas", "requests", "tqdm", "pyxlsb", "win32com", "pythoncom", "pywintypes", "core", "app"],
+    "packages": ["tkinter", "openpyxl", "pandas", "requests", "tqdm", "pyxlsb", "python_calamine", "xlsxwriter", "win32com", "pythoncom", "pywintypes", "core", "app"],
     "excludes": [],
     "include_files": [],
     "build_exe": "build/Generador_Informe_Electrico",  # Carpeta de salida fija